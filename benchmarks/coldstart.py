@@ -0,0 +1,118 @@
+"""Cold-start benchmark: import times and time to first render per app mode.
+
+Every measurement runs in a fresh interpreter, so nothing is warm except the
+OS page cache and matplotlib's on-disk font cache (pass ``--clear-mpl-cache``
+to drop that too). Results are printed and optionally written as JSON.
+
+    python benchmarks/coldstart.py --repeat 5 --out coldstart.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.environment import versions
+
+APP = os.path.join(ROOT, "opennestool2.py")
+IMPORT_TARGETS = ["numpy", "pandas", "matplotlib.pyplot", "streamlit", "openness", "openness.charts"]
+MODES = {"A": "A) Questionnaire (1–5)", "B": "B) 2-Axis Matrix (1–3)"}
+
+_IMPORT_SNIPPET = """
+import time
+t = time.perf_counter()
+import {module}
+print(time.perf_counter() - t)
+"""
+
+_APP_SNIPPET = """
+import json, logging, time
+logging.disable(logging.WARNING)
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300)
+at.session_state["mode"] = {mode_label!r}
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+assert not at.exception, at.exception
+out = {{"streamlit_import_s": t1 - t0, "first_run_s": t2 - t1}}
+if {mode!r} == "B":
+    at.button[0].click().run()
+    assert not at.exception, at.exception
+    out["first_compute_s"] = time.perf_counter() - t2
+print(json.dumps(out))
+"""
+
+
+def _run(code, env):
+    t = time.perf_counter()
+    res = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t
+    if res.returncode != 0:
+        raise RuntimeError(res.stderr.strip().splitlines()[-1] if res.stderr.strip() else "subprocess failed")
+    return res.stdout.strip().splitlines()[-1], wall
+
+
+def _summary(values):
+    return {"median": statistics.median(values), "min": min(values), "max": max(values), "n": len(values)}
+
+
+def bench(repeat=3, clear_mpl_cache=False, modes=tuple(MODES)):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    results = {"imports": {}, "app": {}}
+
+    for module in IMPORT_TARGETS:
+        runs = []
+        for _ in range(repeat):
+            if clear_mpl_cache:
+                env["MPLCONFIGDIR"] = tempfile.mkdtemp(prefix="mpl-cold-")
+            out, _ = _run(_IMPORT_SNIPPET.format(module=module), env)
+            runs.append(float(out))
+        results["imports"][module] = _summary(runs)
+
+    for mode in modes:
+        samples = {}
+        for _ in range(repeat):
+            if clear_mpl_cache:
+                env["MPLCONFIGDIR"] = tempfile.mkdtemp(prefix="mpl-cold-")
+            out, wall = _run(_APP_SNIPPET.format(app=APP, mode=mode, mode_label=MODES[mode]), env)
+            for k, v in dict(json.loads(out), process_wall_s=wall).items():
+                samples.setdefault(k, []).append(v)
+        results["app"][mode] = {k: _summary(v) for k, v in samples.items()}
+    return results
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    p.add_argument("--clear-mpl-cache", action="store_true", help="Use a fresh MPLCONFIGDIR per run (first-boot container).")
+    p.add_argument("--out", default=None, help="Write results as JSON to this path.")
+    args = p.parse_args(argv)
+
+    results = bench(args.repeat, args.clear_mpl_cache, tuple(args.modes))
+    report = {"benchmark": "coldstart", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "versions": versions(), "repeat": args.repeat, "clear_mpl_cache": args.clear_mpl_cache, **results}
+
+    print(f"{'import':<24}{'median s':>10}")
+    for module, s in report["imports"].items():
+        print(f"{module:<24}{s['median']:>10.3f}")
+    for mode, metrics in report["app"].items():
+        print(f"\nMode {mode}")
+        for k, s in metrics.items():
+            print(f"  {k:<22}{s['median']:>10.3f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""Interpreter and library versions recorded in every benchmark report."""
+import platform
+
+
+def versions():
+    out = {"python": platform.python_version(), "platform": platform.platform()}
+    for name in ("numpy", "pandas", "matplotlib", "streamlit", "PIL"):
+        try:
+            out[name] = __import__(name).__version__
+        except Exception:
+            out[name] = None
+    return out
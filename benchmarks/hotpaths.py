@@ -0,0 +1,301 @@
+"""Hot-path benchmark: scoring (Mode A and B), charts, matrix labels, recommendations and CSV export.
+
+Runs offline on synthetic responses at several respondent counts and writes
+JSON, so two runs (e.g. before and after a pandas or matplotlib upgrade) can
+be compared with ``--baseline``.
+
+    python benchmarks/hotpaths.py --sizes 1 1000 100000 --out hotpaths.json
+    python benchmarks/hotpaths.py --baseline hotpaths.json
+
+Charts are rendered one per respondent (overlays: 200 per chart), so they
+are timed per call rather than per size; matrix labels are timed on ``min(size, --max-points)`` points.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+
+from benchmarks.environment import versions
+from openness.registry import EMBEDDED
+
+SIZES = (1, 1_000, 100_000)
+BENCHES = ("scoring.groupby", "scoring.vectorized", "scoring.archive", "scoring.matrix", "recommendations.loop",
+           "recommendations.table", "recommendations.frame", "recommendations.cards", "export.csv", "labels.annotate",
+           "projects.bootstrap", "sensitivity.sweep", "pipeline.rethreshold")
+CHARTS = ("chart.polar_bar.savefig", "chart.radar.savefig", "chart.polar_bar.template", "chart.radar.template",
+          "chart.polar_bar.svg", "chart.radar.svg", "chart.polar_bar.svg_png", "chart.radar.svg_png",
+          "chart.polar_bar.overlay200", "chart.radar.overlay200")
+
+# =============================================================================
+# Synthetic inputs
+# =============================================================================
+def synth_responses(n, rng, missing=0.05, instrument=EMBEDDED):
+    """``(n, n_variables)`` Likert answers 1–5 with a share of unanswered (NaN) items."""
+    n_var = len(instrument.variables)
+    scores = rng.integers(1, 6, size=(n, n_var)).astype(float)
+    scores[rng.random((n, n_var)) < missing] = np.nan
+    return scores
+
+def synth_positions(k, rng):
+    """Mode B matrix positions on the 0.5 answer grid, so many points coincide."""
+    xy = rng.integers(2, 7, size=(k, 2)) / 2.0
+    return {f"P{i}": (float(x), float(y)) for i, (x, y) in enumerate(xy)}
+
+def synth_matrix_answers(n, rng):
+    """Mode B answer table (option text per column), as uploaded from the field."""
+    import pandas as pd
+    from openness.matrix import CODEBOOK
+    return pd.DataFrame({col: np.array(opts, dtype=object)[rng.integers(0, len(opts), n)]
+                         for col, opts in zip(CODEBOOK.columns, CODEBOOK.options)})
+
+def synth_dimensions_frame(rng, instrument=EMBEDDED):
+    from openness import dimensions_frame, score_responses
+    means, classes = score_responses(synth_responses(1, rng, instrument=instrument), indicator=instrument.indicator)
+    return dimensions_frame(means[0], classes[0], instrument.dimensions, instrument.n_variables)
+
+# =============================================================================
+# Benchmarks: each factory does its setup and returns the callable to time
+# =============================================================================
+def _long_scores(scores, instrument=EMBEDDED):
+    import pandas as pd
+    n, n_var = scores.shape
+    dims = np.array(instrument.dimensions, dtype=object)[instrument.var_dim]
+    return pd.DataFrame({"Respondent": np.repeat(np.arange(n), n_var),
+                         "Dimension": np.tile(dims, n), "Score": scores.ravel()})
+
+def bench_scoring_groupby(scores, rng):
+    """The app's original path: long table -> groupby mean -> classify_openness per row."""
+    from openness import classify_openness
+    long = _long_scores(scores)
+    def run():
+        means = long.groupby(["Respondent", "Dimension"], sort=False)["Score"].mean().round(3)
+        return means.apply(lambda x: classify_openness(x, 2.5, 3.5))
+    return run
+
+def bench_scoring_vectorized(scores, rng):
+    from openness import score_responses
+    return lambda: score_responses(scores, 2.5, 3.5)
+
+def bench_scoring_archive(scores, rng):
+    """Open a memory-mapped ``.opn`` archive and score it chunk by chunk."""
+    import atexit, shutil, tempfile
+    from openness.columnar import ArchiveWriter, encode_answers, open_archive
+    tmp = tempfile.mkdtemp(prefix="openness-bench-")
+    atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+    path = os.path.join(tmp, "responses.opn")
+    with ArchiveWriter(path) as writer:
+        writer.append(np.arange(len(scores)), encode_answers(scores))
+    return lambda: open_archive(path).dimension_means()
+
+def bench_scoring_matrix(scores, rng):
+    from openness.matrix import chunk_tables
+    answers = synth_matrix_answers(len(scores), rng)
+    ids = np.arange(len(scores))
+    return lambda: chunk_tables(ids, answers)
+
+def _dimension_rows(scores):
+    from openness import score_responses
+    means, classes = score_responses(scores, 2.5, 3.5)
+    dims = np.tile(np.array(EMBEDDED.dimensions, dtype=object), len(scores))
+    return dims, classes.ravel()
+
+def bench_recommendations_loop(scores, rng):
+    from openness import get_recommendation
+    dims, classes = _dimension_rows(scores)
+    return lambda: [get_recommendation(d, c) for d, c in zip(dims, classes)]
+
+def bench_recommendations_table(scores, rng):
+    from openness.scoring import classify_array, dimension_means
+    codes = classify_array(dimension_means(scores), 2.5, 3.5)
+    dim_idx = np.broadcast_to(np.arange(codes.shape[1]), codes.shape)
+    return lambda: EMBEDDED.rec_table[dim_idx, codes]
+
+def bench_recommendations_frame(scores, rng):
+    """Portfolio-sized ``recommendations_frame``: one row per respondent × dimension."""
+    import pandas as pd
+    from openness import recommendations_frame
+    dims, classes = _dimension_rows(scores)
+    long = pd.DataFrame({"Dimension": dims, "Classification": classes})
+    return lambda: recommendations_frame(long, EMBEDDED.recommendations)
+
+def bench_recommendations_cards(scores, rng):
+    dims, classes = _dimension_rows(scores)
+    return lambda: "".join(EMBEDDED.recommendations.cards(dims, classes))
+
+def bench_export_csv(scores, rng):
+    from openness.batch import chunk_tables
+    ids = np.arange(len(scores))
+    def run():
+        for df in chunk_tables(ids, scores).values():
+            df.to_csv(io.StringIO(), index=False)
+    return run
+
+def bench_projects_bootstrap(scores, rng, per_project=6):
+    """Respondents pooled into projects of ``per_project``, 1000 resamples each."""
+    from openness.projects import score_project_responses
+    projects = np.arange(len(scores)) // per_project
+    return lambda: score_project_responses(scores, projects, seed=0)
+
+def bench_sensitivity_sweep(scores, rng):
+    """Every (low_max, med_max) pair on a 0.05 grid over 1–5, one project per respondent."""
+    from openness.scoring import dimension_means
+    from openness.sensitivity import sweep, threshold_values
+    means, grid = dimension_means(scores), threshold_values(1.0, 5.0, 0.05)
+    return lambda: sweep(means, grid, grid)
+
+def bench_pipeline_rethreshold(scores, rng):
+    """One Mode A rerun after a threshold change: reclassify and rebuild downstream tables only."""
+    from openness.pipeline import mode_a_pipeline
+    p = mode_a_pipeline(lambda df, chart_type, px, backend: None)
+    answers = dict(zip(EMBEDDED.variables, scores[0].tolist()))
+    p.set_inputs(instrument=EMBEDDED, answers=answers, low_max=1.0, med_max=5.0,
+                 chart_type="Polar Bar", chart_px=560, chart_backend="template")
+    flip = iter(np.resize([5.0, 1.0], 1_000_000))   # every dimension Low / Medium in turn
+    def run():
+        p.set_inputs(low_max=next(flip))
+        for name in ("variables_df", "chart", "cards"):
+            p.get(name)
+    return run
+
+def bench_labels_annotate(scores, rng, max_points=1_000):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from openness.charts import annotate_clustered_points
+    positions = synth_positions(min(len(scores), max_points), rng)
+    def run():
+        fig = Figure(figsize=(7, 6))
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.set_xlim(0.8, 3.2); ax.set_ylim(0.8, 3.2)
+        annotate_clustered_points(ax, positions, r_points=18)
+        canvas.draw()
+    return run
+
+def bench_chart(name, rng):
+    from openness.charts import fig_to_png, plot_polar_bar, plot_radar, render_chart_png, render_chart_svg, render_overlay_png
+    df = synth_dimensions_frame(rng)
+    chart_type = "Polar Bar" if ".polar_bar." in name else "Radar"
+    if name.endswith(".overlay200"):   # 200 assessments, median + band
+        from openness import dimension_means
+        values = dimension_means(synth_responses(200, rng))
+        return lambda: render_overlay_png(EMBEDDED.dimensions, values, chart_type=chart_type)
+    if name.endswith(".template"):
+        return lambda: render_chart_png(df, chart_type, 560, cache=None, backend="template")
+    if name.endswith(".svg"):
+        return lambda: render_chart_svg(df, chart_type, 560)
+    if name.endswith(".svg_png"):
+        return lambda: render_chart_png(df, chart_type, 560, cache=None, backend="svg")
+    plot = plot_polar_bar if chart_type == "Polar Bar" else plot_radar
+    return lambda: fig_to_png(plot(df, size_px=560))
+
+SIZED = {
+    "scoring.groupby": bench_scoring_groupby,
+    "scoring.vectorized": bench_scoring_vectorized,
+    "scoring.archive": bench_scoring_archive,
+    "scoring.matrix": bench_scoring_matrix,
+    "recommendations.loop": bench_recommendations_loop,
+    "recommendations.table": bench_recommendations_table,
+    "recommendations.frame": bench_recommendations_frame,
+    "recommendations.cards": bench_recommendations_cards,
+    "export.csv": bench_export_csv,
+    "labels.annotate": bench_labels_annotate,
+    "projects.bootstrap": bench_projects_bootstrap,
+    "sensitivity.sweep": bench_sensitivity_sweep,
+    "pipeline.rethreshold": bench_pipeline_rethreshold,
+}
+
+# =============================================================================
+# Runner
+# =============================================================================
+def _time(fn, repeat, budget_s):
+    """Warm once, then time up to ``repeat`` calls (at least one) within ``budget_s``."""
+    fn()
+    runs, spent = [], 0.0
+    while len(runs) < repeat and (not runs or spent < budget_s):
+        t = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t)
+        spent += runs[-1]
+    return {"median": statistics.median(runs), "min": min(runs), "max": max(runs), "n": len(runs)}
+
+def bench(sizes=SIZES, benches=BENCHES + CHARTS, repeat=5, budget_s=10.0, max_points=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    results = {"sizes": {}, "per_call": {}}
+    for n in sizes:
+        scores = synth_responses(n, rng)
+        row = results["sizes"][str(n)] = {}
+        for name in benches:
+            if name not in SIZED:
+                continue
+            kwargs = {"max_points": max_points} if name == "labels.annotate" else {}
+            row[name] = _time(SIZED[name](scores, rng, **kwargs), repeat, budget_s)
+            if name == "labels.annotate":
+                row[name]["n_points"] = min(n, max_points)
+    for name in benches:
+        if name in CHARTS:
+            results["per_call"][name] = _time(bench_chart(name, rng), repeat, budget_s)
+    return results
+
+def compare(report, baseline):
+    """``[(key, baseline_s, current_s, ratio)]`` for every benchmark present in both."""
+    pairs = [(f"{name}@{n}", baseline["sizes"].get(n, {}).get(name), s)
+             for n, row in report["sizes"].items() for name, s in row.items()]
+    pairs += [(name, baseline["per_call"].get(name), s) for name, s in report["per_call"].items()]
+    out = []
+    for key, old, new in pairs:
+        if old:
+            out.append((key, old["median"], new["median"], new["median"] / old["median"] if old["median"] else float("inf")))
+    return out
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="Respondent counts.")
+    p.add_argument("--bench", nargs="+", choices=list(BENCHES + CHARTS), default=list(BENCHES + CHARTS))
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--budget", type=float, default=10.0, help="Stop repeating a benchmark after this many seconds.")
+    p.add_argument("--max-points", type=int, default=1_000, help="Cap on matrix points for labels.annotate.")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default=None, help="Write results as JSON to this path.")
+    p.add_argument("--baseline", default=None, help="Earlier JSON results to compare against.")
+    p.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression.")
+    args = p.parse_args(argv)
+
+    results = bench(tuple(args.sizes), tuple(args.bench), args.repeat, args.budget, args.max_points, args.seed)
+    report = {"benchmark": "hotpaths", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "versions": versions(), "repeat": args.repeat, "seed": args.seed, **results}
+
+    for n, row in report["sizes"].items():
+        print(f"\n{n} respondent(s)")
+        for name, s in row.items():
+            print(f"  {name:<26}{s['median']:>12.6f} s")
+    if report["per_call"]:
+        print("\nper chart")
+        for name, s in report["per_call"].items():
+            print(f"  {name:<26}{s['median']:>12.6f} s")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        print(f"\nvs {args.baseline}")
+        for key, old, new, ratio in compare(report, baseline):
+            flag = "  REGRESSION" if ratio > args.threshold else ""
+            status = 1 if flag else status
+            print(f"  {key:<34}{old:>10.4f} -> {new:>10.4f}  x{ratio:.2f}{flag}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
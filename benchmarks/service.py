@@ -0,0 +1,122 @@
+"""Load test for ``python -m openness serve``: requests/s and latency percentiles.
+
+Starts the service in a child process (or targets ``--url``), then keeps
+``--concurrency`` keep-alive connections busy for ``--seconds`` with
+synthetic Mode A (or B) requests.
+
+    python benchmarks/service.py --concurrency 64 --seconds 10
+    python benchmarks/service.py --mode B --chart-every 50 --out service.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from benchmarks.environment import versions
+
+def synth_bodies(mode, n, rng, chart_every=0):
+    """``n`` JSON bodies; every ``chart_every``-th one asks for a chart."""
+    from openness.matrix import CODEBOOK
+    from openness.registry import EMBEDDED
+    bodies = []
+    for i in range(n):
+        if mode == "A":
+            req = {"answers": {v: int(s) for v, s in zip(EMBEDDED.variables, rng.integers(1, 6, len(EMBEDDED.variables)))}}
+        else:
+            req = {"answers": {c: opts[k] for c, opts, k in
+                               zip(CODEBOOK.columns, CODEBOOK.options, (rng.integers(0, len(o)) for o in CODEBOOK.options))}}
+        if chart_every and i % chart_every == 0:
+            req["chart"] = True
+        bodies.append(json.dumps(req).encode())
+    return bodies
+
+async def _client(host, port, path, bodies, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            body = bodies[i % len(bodies)]; i += 1
+            t = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t)
+            status = int(head.split(b" ", 2)[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def load(host, port, mode, concurrency, seconds, bodies):
+    latencies, statuses = [], {}
+    path = "/score/a" if mode == "A" else "/score/b"
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, path, bodies[k::concurrency] or bodies, t0 + seconds, latencies, statuses)
+                           for k in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [latencies[0]] * 99
+    return {"requests": len(latencies), "seconds": round(elapsed, 3), "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(q[49] * 1e3, 2), "p90_ms": round(q[89] * 1e3, 2), "p99_ms": round(q[98] * 1e3, 2),
+            "statuses": {str(k): v for k, v in statuses.items()}}
+
+def _wait_listening(host, port, timeout=60.0):
+    import socket
+    t = time.time()
+    while time.time() - t < timeout:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Service did not start on {host}:{port}")
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--mode", choices=("A", "B"), default="A")
+    p.add_argument("--concurrency", type=int, default=64, help="Open keep-alive connections.")
+    p.add_argument("--seconds", type=float, default=10.0)
+    p.add_argument("--chart-every", type=int, default=0, help="Ask for a chart on every Nth request (0: never).")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8799)
+    p.add_argument("--external", action="store_true", help="Use a service already listening on --host/--port.")
+    p.add_argument("--workers", type=int, default=None, help="Chart workers for the spawned service.")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default=None, help="Write results as JSON to this path.")
+    args = p.parse_args(argv)
+
+    bodies = synth_bodies(args.mode, 2_000, np.random.default_rng(args.seed), args.chart_every)
+    proc = None
+    if not args.external:
+        cmd = [sys.executable, "-m", "openness", "serve", "--host", args.host, "--port", str(args.port)]
+        if args.workers:
+            cmd += ["--workers", str(args.workers)]
+        proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        _wait_listening(args.host, args.port)
+        result = asyncio.run(load(args.host, args.port, args.mode, args.concurrency, args.seconds, bodies))
+    finally:
+        if proc is not None:
+            proc.terminate(); proc.wait()
+
+    report = {"benchmark": "service", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "versions": versions(),
+              "mode": args.mode, "concurrency": args.concurrency, "chart_every": args.chart_every, **result}
+    print(f"{result['requests']} requests in {result['seconds']}s: {result['rps']} req/s, "
+          f"p50 {result['p50_ms']} ms, p90 {result['p90_ms']} ms, p99 {result['p99_ms']} ms  {result['statuses']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""Openness Assessment core: instruments, scoring and recommendations (no Streamlit)."""
+from .instrument import APERTO_ITEMS, APERTO_COLS
+from .recommendations import RECS, RecTable, compile_recs, get_recommendation, recommendations_frame
+from .scoring import (
+    CLASSES, DIMENSIONS, VARIABLES, INDICATOR,
+    classify_openness, preserve_order, build_indicator,
+    classify_array, dimension_means, score_responses,
+    variables_frame, dimensions_frame,
+)
+from .registry import Instrument, InstrumentRegistry, REGISTRY, EMBEDDED, load_instrument
+from .matrix import CODEBOOK, MATRIX_DIMENSIONS, Codebook, band_array, compile_codebook, interpret_band
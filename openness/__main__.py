@@ -0,0 +1,220 @@
+"""Command-line entry point: ``python -m openness <command> ...``."""
+import argparse
+import sys
+import time
+
+
+def _cmd_score(args):
+    from .batch import score_file
+    from .registry import EMBEDDED, load_instrument
+    instrument = load_instrument(args.grid) if args.grid else EMBEDDED
+    t0 = time.perf_counter()
+    paths, n_rows = score_file(
+        args.input, args.out, fmt=args.format, chunk_size=args.chunk_size,
+        low_max=args.low, med_max=args.med, id_column=args.id_column,
+        tables=args.tables, sheet=args.sheet, prefix=args.prefix, instrument=instrument,
+    )
+    print(f"Scored {n_rows} respondents in {time.perf_counter() - t0:.2f}s")
+    for table, path in paths.items():
+        print(f"  {table:<16} {path}")
+
+
+def _cmd_score_matrix(args):
+    from .matrix import score_matrix_file
+    t0 = time.perf_counter()
+    paths, n_rows = score_matrix_file(
+        args.input, args.out, fmt=args.format, chunk_size=args.chunk_size, id_column=args.id_column,
+        tables=args.tables, sheet=args.sheet, prefix=args.prefix,
+    )
+    print(f"Scored {n_rows} matrix questionnaires in {time.perf_counter() - t0:.2f}s")
+    for table, path in paths.items():
+        print(f"  {table:<16} {path}")
+
+
+def _cmd_archive(args):
+    import os
+    from .columnar import archive_matrix, archive_responses
+    from .registry import EMBEDDED, load_instrument
+    t0 = time.perf_counter()
+    if args.mode == "A":
+        instrument = load_instrument(args.grid) if args.grid else EMBEDDED
+        path, n_rows = archive_responses(args.input, args.out, id_column=args.id_column, chunk_size=args.chunk_size,
+                                         sheet=args.sheet, instrument=instrument)
+    else:
+        path, n_rows = archive_matrix(args.input, args.out, id_column=args.id_column, chunk_size=args.chunk_size,
+                                      sheet=args.sheet)
+    print(f"Archived {n_rows} Mode {args.mode} responses in {time.perf_counter() - t0:.2f}s")
+    print(f"  {'archive':<16} {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+def _cmd_score_projects(args):
+    from .projects import score_projects_file
+    from .registry import EMBEDDED, load_instrument
+    instrument = load_instrument(args.grid) if args.grid else EMBEDDED
+    t0 = time.perf_counter()
+    path, n_projects, n_rows = score_projects_file(
+        args.input, args.out, fmt=args.format, project_column=args.project_column, low_max=args.low, med_max=args.med,
+        n_resamples=args.resamples, level=args.level, seed=args.seed, chunk_size=args.chunk_size, sheet=args.sheet,
+        instrument=instrument,
+    )
+    print(f"Pooled {n_rows} respondents into {n_projects} projects in {time.perf_counter() - t0:.2f}s")
+    print(f"  {'projects':<16} {path}")
+
+
+def _cmd_sensitivity(args):
+    from .sensitivity import sensitivity_file
+    t0 = time.perf_counter()
+    path, n_projects = sensitivity_file(
+        args.input, args.out, id_column=args.id_column, low_range=args.low_range, med_range=args.med_range,
+        low_max=args.low, med_max=args.med, heatmap=args.heatmap, size_px=args.size,
+    )
+    print(f"Swept cutoffs over {n_projects} projects in {time.perf_counter() - t0:.2f}s")
+    print(f"  {'sensitivity':<16} {path}")
+    if args.heatmap:
+        print(f"  {'heatmap':<16} {args.heatmap}")
+
+
+def _cmd_report(args):
+    from .reports import build_reports, iter_projects, read_dimension_scores
+    t0 = time.perf_counter()
+    projects = iter_projects(read_dimension_scores(args.input), args.id_column)
+    n = build_reports(projects, args.out, fmt=args.format, chart_type=args.chart,
+                      size_px=args.size, workers=args.workers, backend=args.renderer)
+    print(f"Wrote {n} project reports to {args.out} in {time.perf_counter() - t0:.2f}s")
+
+
+def _cmd_warmup(args):
+    from .charts import prewarm
+    t0 = time.perf_counter()
+    prewarm(size_px=args.size)
+    print(f"matplotlib font cache and chart templates ready in {time.perf_counter() - t0:.2f}s")
+
+
+def _cmd_serve(args):
+    import asyncio
+    from .registry import REGISTRY
+    from .service import serve
+    if args.grids:
+        REGISTRY.scan(args.grids)
+    ready = lambda server: print(f"Openness scoring service on http://{args.host}:{args.port} "
+                                 f"(instruments: {', '.join(REGISTRY.names())})", flush=True)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_batch=args.max_batch,
+                          batch_wait_ms=args.batch_wait_ms, ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def build_parser():
+    from .batch import FORMATS, TABLES
+    from .reports import REPORT_FORMATS
+    from .charts import CHART_BACKENDS, CHART_TYPES
+    from .matrix import MATRIX_TABLES
+    parser = argparse.ArgumentParser(prog="python -m openness", description="Openness Assessment batch tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("score", help="Score a Mode A response file (one row per respondent, columns ON1…OM2).")
+    p.add_argument("input", help="CSV or XLSX file of responses, or a Mode A .opn archive.")
+    p.add_argument("-o", "--out", default="openness_out", help="Output directory (default: %(default)s).")
+    p.add_argument("-f", "--format", choices=FORMATS, default="csv")
+    p.add_argument("--chunk-size", type=int, default=10_000, help="Rows per chunk (default: %(default)s).")
+    p.add_argument("--low", type=float, default=2.5, help="Low if mean < LOW (default: %(default)s).")
+    p.add_argument("--med", type=float, default=3.5, help="Medium if mean ≤ MED (default: %(default)s).")
+    p.add_argument("--id-column", default=None, help="Column holding the respondent id (default: row number).")
+    p.add_argument("--sheet", default=None, help="Worksheet name for XLSX input (default: first sheet).")
+    p.add_argument("--tables", nargs="+", choices=TABLES, default=list(TABLES))
+    p.add_argument("--prefix", default="openness", help="Output file name prefix (default: %(default)s).")
+    p.add_argument("--grid", default=None, help="APERTO grid .xlsx to score against (default: embedded grid).")
+    p.set_defaults(func=_cmd_score)
+
+    p = sub.add_parser("score-matrix", help="Score a Mode B answer file (columns Engagement_Q1…Research_Structure).")
+    p.add_argument("input", help="CSV or XLSX file; answers as option text or values (1–3); or a Mode B .opn archive.")
+    p.add_argument("-o", "--out", default="openness_out", help="Output directory (default: %(default)s).")
+    p.add_argument("-f", "--format", choices=FORMATS, default="csv")
+    p.add_argument("--chunk-size", type=int, default=10_000, help="Rows per chunk (default: %(default)s).")
+    p.add_argument("--id-column", default=None, help="Column holding the respondent id (default: row number).")
+    p.add_argument("--sheet", default=None, help="Worksheet name for XLSX input (default: first sheet).")
+    p.add_argument("--tables", nargs="+", choices=MATRIX_TABLES, default=list(MATRIX_TABLES))
+    p.add_argument("--prefix", default="openness", help="Output file name prefix (default: %(default)s).")
+    p.set_defaults(func=_cmd_score_matrix)
+
+    p = sub.add_parser("archive", help="Pack a response file into a compact, memory-mapped .opn archive.")
+    p.add_argument("input", help="CSV or XLSX response file (Mode A) or answer file (Mode B).")
+    p.add_argument("-o", "--out", default="openness_responses.opn", help="Output archive (default: %(default)s).")
+    p.add_argument("--mode", choices=("A", "B"), default="A", help="Questionnaire of the input (default: %(default)s).")
+    p.add_argument("--id-column", default=None, help="Column holding the respondent id (default: row number).")
+    p.add_argument("--chunk-size", type=int, default=10_000, help="Rows per chunk (default: %(default)s).")
+    p.add_argument("--sheet", default=None, help="Worksheet name for XLSX input (default: first sheet).")
+    p.add_argument("--grid", default=None, help="APERTO grid .xlsx of a Mode A input (default: embedded grid).")
+    p.set_defaults(func=_cmd_archive)
+
+    p = sub.add_parser("score-projects", help="Pool Mode A respondents per project, with bootstrap intervals and spread.")
+    p.add_argument("input", help="CSV or XLSX file of responses with a project column.")
+    p.add_argument("-o", "--out", default="openness_projects.csv", help="Output file (default: %(default)s).")
+    p.add_argument("-f", "--format", choices=FORMATS, default=None, help="Default: from the output extension.")
+    p.add_argument("--project-column", default="Project", help="Column naming each response's project (default: %(default)s).")
+    p.add_argument("--resamples", type=int, default=1000, help="Bootstrap resamples (default: %(default)s).")
+    p.add_argument("--level", type=float, default=0.95, help="Interval coverage (default: %(default)s).")
+    p.add_argument("--seed", type=int, default=None, help="Random seed for reproducible intervals.")
+    p.add_argument("--low", type=float, default=2.5, help="Low if mean < LOW (default: %(default)s).")
+    p.add_argument("--med", type=float, default=3.5, help="Medium if mean ≤ MED (default: %(default)s).")
+    p.add_argument("--chunk-size", type=int, default=10_000, help="Rows per chunk (default: %(default)s).")
+    p.add_argument("--sheet", default=None, help="Worksheet name for XLSX input (default: first sheet).")
+    p.add_argument("--grid", default=None, help="APERTO grid .xlsx to score against (default: embedded grid).")
+    p.set_defaults(func=_cmd_score_projects)
+
+    p = sub.add_parser("sensitivity", help="Count projects changing class over a grid of Low/Medium cutoffs.")
+    p.add_argument("input", help="Dimension scores (CSV/Parquet/XLSX), e.g. openness_dimensions.csv from 'score'.")
+    p.add_argument("-o", "--out", default="openness_sensitivity.csv", help="Output table (default: %(default)s).")
+    p.add_argument("--id-column", default="Respondent", help="Project id column (default: %(default)s).")
+    p.add_argument("--low-range", nargs=3, type=float, default=[1.5, 3.5, 0.1], metavar=("START", "STOP", "STEP"),
+                   help="Low cutoffs to sweep, inclusive (default: 1.5 3.5 0.1).")
+    p.add_argument("--med-range", nargs=3, type=float, default=[2.5, 4.5, 0.1], metavar=("START", "STOP", "STEP"),
+                   help="Medium cutoffs to sweep, inclusive (default: 2.5 4.5 0.1).")
+    p.add_argument("--low", type=float, default=2.5, help="Baseline: Low if mean < LOW (default: %(default)s).")
+    p.add_argument("--med", type=float, default=3.5, help="Baseline: Medium if mean ≤ MED (default: %(default)s).")
+    p.add_argument("--heatmap", default=None, help="Also write the heatmaps to this PNG.")
+    p.add_argument("--size", type=int, default=960, help="Heatmap width in px (default: %(default)s).")
+    p.set_defaults(func=_cmd_sensitivity)
+
+    p = sub.add_parser("report", help="Render a chart + recommendations per project into a ZIP or multi-page PDF.")
+    p.add_argument("input", help="Dimension scores (CSV/Parquet/XLSX), e.g. openness_dimensions.csv from 'score' "
+                                 "or a 'score-projects' table (drawn with intervals).")
+    p.add_argument("-o", "--out", required=True, help="Output .zip or .pdf file.")
+    p.add_argument("-f", "--format", choices=REPORT_FORMATS, default=None, help="Default: from the output extension.")
+    p.add_argument("--id-column", default="Respondent", help="Project id column (default: %(default)s).")
+    p.add_argument("--chart", choices=CHART_TYPES, default="Polar Bar")
+    p.add_argument("--size", type=int, default=560, help="Chart width in px (default: %(default)s).")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    p.add_argument("--renderer", choices=CHART_BACKENDS, default="template",
+                   help="Chart renderer; 'svg' writes vector charts into ZIPs (default: %(default)s).")
+    p.set_defaults(func=_cmd_report)
+
+    p = sub.add_parser("serve", help="Local HTTP scoring service (POST /score/a, /score/b; GET /health).")
+    p.add_argument("--host", default="127.0.0.1", help="Bind address (default: %(default)s).")
+    p.add_argument("--port", type=int, default=8765, help="Port (default: %(default)s).")
+    p.add_argument("--workers", type=int, default=None, help="Chart worker processes (default: CPU count).")
+    p.add_argument("--max-batch", type=int, default=256, help="Requests scored per batch at most (default: %(default)s).")
+    p.add_argument("--batch-wait-ms", type=float, default=2.0,
+                   help="How long a request may wait for others to batch with (default: %(default)s).")
+    p.add_argument("--grids", default=None, help="Directory of APERTO grid .xlsx files to register as instruments.")
+    p.set_defaults(func=_cmd_serve)
+
+    p = sub.add_parser("warmup", help="Build matplotlib's font cache (e.g. during a container image build).")
+    p.add_argument("--size", type=int, default=560, help="Chart width in px to pre-build (default: %(default)s).")
+    p.set_defaults(func=_cmd_warmup)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except (ValueError, RuntimeError, FileNotFoundError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
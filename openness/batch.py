@@ -0,0 +1,186 @@
+"""Chunked batch scoring of Mode A response files (CSV/XLSX -> CSV/Parquet/XLSX).
+
+Files are read ``chunk_size`` rows at a time and every output table is
+appended per chunk, so memory stays flat regardless of input size.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .registry import EMBEDDED
+from .scoring import CLASSES, answer_scores, classify_array, dimension_means
+
+TABLES = ("variables", "dimensions", "recommendations")
+FORMATS = ("csv", "parquet", "xlsx")
+XLSX_MAX_ROWS = 1_048_576   # Excel sheet limit, header included
+SCALE_MIN, SCALE_MAX = 1, 5
+
+# =============================================================================
+# Readers (yield DataFrame chunks)
+# =============================================================================
+def iter_csv(path, chunk_size, usecols=None):
+    yield from pd.read_csv(path, chunksize=chunk_size, usecols=usecols)
+
+def iter_xlsx(path, chunk_size, usecols=None, sheet=None):
+    from openpyxl import load_workbook   # only needed for spreadsheets
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        keep = [i for i, h in enumerate(header) if usecols is None or h in usecols]
+        cols = [header[i] for i in keep]
+        buf = []
+        for row in rows:
+            buf.append([row[i] if i < len(row) else None for i in keep])
+            if len(buf) >= chunk_size:
+                yield pd.DataFrame(buf, columns=cols); buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=cols)
+    finally:
+        wb.close()
+
+def iter_responses(path, chunk_size=10_000, id_column=None, sheet=None, instrument=EMBEDDED):
+    """Yield ``(ids, scores)`` chunks; ``scores`` is ``(rows, n_variables)`` float.
+
+    Non-numeric or out-of-range (1–5) answers become NaN, i.e. unanswered.
+    An archive (``.opn``) yields ``uint8`` views of its memory map instead,
+    with its own ids.
+    """
+    from .columnar import is_archive, open_archive
+    if is_archive(path):
+        yield from open_archive(path).iter_responses(chunk_size, instrument)
+        return
+    variables = instrument.variables
+    usecols = set(variables) | ({id_column} if id_column else set())
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        chunks = iter_xlsx(path, chunk_size, usecols, sheet)
+    else:
+        chunks = iter_csv(path, chunk_size, lambda c: str(c).strip() in usecols)
+    offset = 0
+    for chunk in chunks:
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        if id_column and id_column not in chunk.columns:
+            raise ValueError(f"Id column {id_column!r} not found.")
+        missing = [v for v in variables if v not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing variable columns: {', '.join(missing)}")
+        scores = chunk[variables].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        scores[(scores < SCALE_MIN) | (scores > SCALE_MAX)] = np.nan
+        if id_column:
+            ids = chunk[id_column].to_numpy()
+        else:
+            ids = np.arange(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield ids, scores
+
+# =============================================================================
+# Per-chunk tables (long format, one row per respondent × variable/dimension)
+# =============================================================================
+def chunk_tables(ids, scores, low_max=2.5, med_max=3.5, instrument=EMBEDDED):
+    inst = instrument
+    n, n_var, n_dim = len(ids), len(inst.variables), len(inst.dimensions)
+    means = dimension_means(scores, inst.indicator)
+    codes = classify_array(means, low_max, med_max)
+    dim_names = np.array(inst.dimensions, dtype=object)
+    dim_idx = np.tile(np.arange(n_dim), n)
+
+    variables = pd.DataFrame({
+        "Respondent": np.repeat(ids, n_var),
+        "Variable": np.tile(np.array(inst.variables, dtype=object), n),
+        "Dimension": np.tile(dim_names[inst.var_dim], n),
+        "Score": answer_scores(scores).ravel(),
+    })
+    dimensions = pd.DataFrame({
+        "Respondent": np.repeat(ids, n_dim),
+        "Dimension": dim_names[dim_idx],
+        "MeanScore": means.ravel(),
+        "n_Variables": np.tile(inst.n_variables, n),
+        "Classification": CLASSES[codes.ravel()],
+    })
+    recommendations = dimensions[["Respondent", "Dimension", "Classification"]].assign(
+        Recommendation=inst.rec_table[dim_idx, codes.ravel()]
+    )
+    return {"variables": variables, "dimensions": dimensions, "recommendations": recommendations}
+
+# =============================================================================
+# Appending writers
+# =============================================================================
+class _CsvSink:
+    def __init__(self, path):
+        self.fh = open(path, "w", newline="", encoding="utf-8"); self.header = True
+    def write(self, df):
+        df.to_csv(self.fh, index=False, header=self.header); self.header = False
+    def close(self):
+        self.fh.close()
+
+class _ParquetSink:
+    def __init__(self, path):   # path or binary file object
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow).") from e
+        self.pa, self.pq, self.path, self.writer = pa, pq, path, None
+    def write(self, df):
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+class _XlsxSink:
+    """openpyxl write-only workbook: rows go to a temp file, not memory.
+
+    A table longer than one sheet continues on ``<sheet>_2``, ``<sheet>_3`` …
+    """
+    def __init__(self, path, sheet="data"):   # path or binary file object
+        from openpyxl import Workbook
+        self.path, self.sheet = path, sheet
+        self.wb = Workbook(write_only=True)
+        self.ws, self.rows, self.n_sheets, self.columns = None, 0, 0, None
+    def _new_sheet(self):
+        self.n_sheets += 1
+        self.ws = self.wb.create_sheet(self.sheet if self.n_sheets == 1 else f"{self.sheet}_{self.n_sheets}")
+        self.ws.append(self.columns); self.rows = 1
+    def write(self, df):
+        if self.columns is None:
+            self.columns = [str(c) for c in df.columns]
+            self._new_sheet()
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self.rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self.ws.append(row); self.rows += 1
+    def close(self):
+        if self.ws is None:
+            self.wb.create_sheet(self.sheet)
+        self.wb.save(self.path)
+
+def open_sink(path, fmt):
+    if fmt == "csv": return _CsvSink(path)
+    if fmt == "parquet": return _ParquetSink(path)
+    if fmt == "xlsx": return _XlsxSink(path)
+    raise ValueError(f"Unknown output format: {fmt!r} (expected one of {FORMATS})")
+
+def score_file(path, out_dir, fmt="csv", chunk_size=10_000, low_max=2.5, med_max=3.5,
+               id_column=None, tables=TABLES, sheet=None, prefix="openness", instrument=EMBEDDED):
+    """Score a response file chunk by chunk; returns ``{table: output path}`` and row count."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {t: os.path.join(out_dir, f"{prefix}_{t}.{fmt}") for t in tables}
+    sinks = {t: open_sink(p, fmt) for t, p in paths.items()}
+    n_rows = 0
+    try:
+        for ids, scores in iter_responses(path, chunk_size, id_column, sheet, instrument):
+            out = chunk_tables(ids, scores, low_max, med_max, instrument)
+            for t, sink in sinks.items():
+                sink.write(out[t])
+            n_rows += len(ids)
+    finally:
+        for sink in sinks.values():
+            sink.close()
+    return paths, n_rows
@@ -0,0 +1,740 @@
+"""Polar bar / radar charts for dimension scores, Mode B matrix labels, and a bounded PNG cache.
+
+matplotlib is imported on first render (or by ``prewarm``), not at import time.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from .timing import span
+
+PRIMARY = "#1F4E5F"   # petroleum blue
+
+# ----- Chart utilities (compact & pretty) -----
+GREY_TXT  = "#9CA3AF"
+GRID_GREY = "#E5E7EB"
+
+def _multiline(s: str) -> str:
+    return "\n".join(s.replace("_", " ").split())
+
+COLOR_MAP = {"Low": "#DC6B67", "Medium": "#E6B85C", "High": "#6BBF8E", "N/A": "#9CA3AF"}
+CHART_DPI = 120
+CHART_TITLES = {"Polar Bar": "Openness Polar Bar", "Radar": "Openness Radar"}
+
+def _class_colors(classes):
+    return [COLOR_MAP.get(c, "#6B7280") for c in classes]
+
+def _wedges(a0, a1, r0, r1, k=12):
+    """``(m, 2k, 2)`` polar vertices of annular sectors (``r0`` may be 0 for plain wedges)."""
+    t = np.linspace(0.0, 1.0, k)
+    theta = a0[:, None] + (a1 - a0)[:, None] * t                     # (m, k)
+    outer = np.stack([theta, np.broadcast_to(np.asarray(r1, dtype=float)[:, None], theta.shape)], axis=-1)
+    inner = np.stack([theta[:, ::-1], np.broadcast_to(np.asarray(r0, dtype=float)[:, None], theta.shape)], axis=-1)
+    return np.concatenate([outer, inner], axis=1)
+
+def _draw_static(ax, labels, chart_type):
+    """Background, grid, ticks, dimension labels and title; returns ``(angles, label_texts)``."""
+    N = len(labels)
+    angles = np.linspace(0, 2*np.pi, N, endpoint=False)
+    ax.set_facecolor("white")
+
+    if chart_type == "Polar Bar":
+        from matplotlib.collections import PolyCollection
+        # shaded disc up to 3 (was 360 one-degree bars; same look, one artist)
+        ax.add_collection(PolyCollection(_wedges(np.array([0.0]), np.array([2*np.pi]), [0.0], [3.0], k=361),
+                                         facecolors=GREY_TXT, alpha=0.06, edgecolors="none", zorder=0))
+        ax.set_ylim(0, 5.0)
+    else:
+        ax.set_ylim(1, 5.0)
+    ax.yaxis.grid(color=GRID_GREY, alpha=0.45, linestyle="--")
+    ax.xaxis.grid(color=GRID_GREY, alpha=0.35)
+    ax.set_yticks([1,2,3,4,5])
+    ax.set_yticklabels(["1","2","3","4","5"], color=GREY_TXT, fontsize=9)
+
+    labels_ml = [_multiline(s) for s in labels]
+    ax.set_xticks(angles); ax.set_xticklabels([])
+    r_label = 4.70
+    texts = [ax.text(ang, r_label, lab, ha="center", va="center",
+                     fontsize=9, fontweight="bold", color=PRIMARY)
+             for ang, lab in zip(angles, labels_ml)]
+
+    if chart_type == "Radar":
+        ax.set_theta_offset(np.pi/2); ax.set_theta_direction(-1)
+    ax.set_title(CHART_TITLES[chart_type], va='bottom', fontsize=12,
+                 fontweight='bold', color=PRIMARY, pad=6)
+    return angles, texts
+
+def _draw_data(ax, angles, values, classes, chart_type):
+    """Data layer (bars, or radar line + fill); returns the artists."""
+    values = np.asarray(values, dtype=float)
+    if chart_type == "Polar Bar":
+        width = 2*np.pi/len(angles) * 0.80
+        bars = ax.bar(angles, values, width=width, bottom=0,
+                      color=_class_colors(classes), alpha=0.88, edgecolor="white", linewidth=1.0, zorder=2)
+        return list(bars.patches)
+    values_closed = np.concatenate([values, values[:1]])
+    angles_closed = np.concatenate([angles, angles[:1]])
+    line, = ax.plot(angles_closed, values_closed, linewidth=2, color=PRIMARY)
+    fill, = ax.fill(angles_closed, values_closed, alpha=0.12, color=PRIMARY)
+    return [line, fill]
+
+# ----- Confidence intervals (multi-respondent projects, see ``projects``) -----
+CI_COLUMNS = ("CI_low", "CI_high")
+INTERVAL_COLOR = "#111827"
+
+def chart_intervals(dimensions_df):
+    """``(lo, hi)`` arrays when the frame carries ``CI_low``/``CI_high``, else ``(None, None)``."""
+    if all(c in dimensions_df.columns for c in CI_COLUMNS):
+        return dimensions_df["CI_low"].to_numpy(dtype=float), dimensions_df["CI_high"].to_numpy(dtype=float)
+    return None, None
+
+def _interval_verts(angles, lo, hi, chart_type):
+    """Polar bar: one radial segment per dimension; radar: band quads between neighbouring spokes."""
+    if lo is None or hi is None:
+        return []
+    lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+    if chart_type == "Polar Bar":
+        ok = ~(np.isnan(lo) | np.isnan(hi))
+        return np.stack([np.column_stack([angles, lo]), np.column_stack([angles, hi])], axis=1)[ok]
+    a, l, h = np.append(angles, angles[0] + 2*np.pi), np.append(lo, lo[0]), np.append(hi, hi[0])
+    quads = np.stack([np.column_stack([a[:-1], l[:-1]]), np.column_stack([a[1:], l[1:]]),
+                      np.column_stack([a[1:], h[1:]]), np.column_stack([a[:-1], h[:-1]])], axis=1)
+    return quads[~np.isnan(quads[:, :, 1]).any(axis=1)]
+
+def _draw_intervals(ax, angles, lo, hi, chart_type):
+    """Interval artist (empty without intervals), so templates can update it like the data."""
+    from matplotlib.collections import LineCollection, PolyCollection
+    verts = _interval_verts(angles, lo, hi, chart_type)
+    if chart_type == "Polar Bar":
+        art = LineCollection(verts, colors=INTERVAL_COLOR, linewidths=2.0, alpha=0.75, capstyle="round", zorder=3)
+    else:
+        art = PolyCollection(verts, facecolors=PRIMARY, edgecolors="none", alpha=0.18, zorder=1)
+    ax.add_collection(art, autolim=False)
+    return art
+
+def new_figure(figsize, dpi=CHART_DPI, grid=None, **subplot_kw):
+    """``(fig, ax)`` on a private Agg canvas, outside pyplot's global figure registry.
+
+    Nothing else holds the figure, so it is freed with its last reference
+    (``fig_to_png`` also clears it); safe to use from several threads at once.
+    With ``grid=(rows, cols)`` the second item is a 2-D array of axes sharing x and y.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor="white")
+    FigureCanvasAgg(fig)
+    if grid is not None:
+        return fig, fig.subplots(*grid, squeeze=False, sharex=True, sharey=True, subplot_kw=subplot_kw or None)
+    return fig, fig.add_subplot(**subplot_kw)
+
+def _chart_figure(dimensions_df, size_px, chart_type):
+    size_in = size_px / CHART_DPI
+    fig, ax = new_figure((size_in, size_in), projection="polar")
+    angles, _ = _draw_static(ax, dimensions_df["Dimension"].tolist(), chart_type)
+    _draw_data(ax, angles, dimensions_df["MeanScore"].to_numpy(dtype=float),
+               dimensions_df["Classification"].tolist(), chart_type)
+    lo, hi = chart_intervals(dimensions_df)
+    if lo is not None:
+        _draw_intervals(ax, angles, lo, hi, chart_type)
+    fig.tight_layout(pad=0.4)
+    return fig
+
+def plot_polar_bar(dimensions_df, size_px=560):
+    return _chart_figure(dimensions_df, size_px, "Polar Bar")
+
+def plot_radar(dimensions_df, size_px=560):
+    return _chart_figure(dimensions_df, size_px, "Radar")
+
+# ----- Overlays: many assessments on one polar chart -----
+OVERLAY_COLORS = [PRIMARY, "#3BAA8F", "#E6B85C", "#DC6B67", "#7C6FB0", "#4C9BD6", "#B5651D", "#6B7280"]
+OVERLAY_MAX_SERIES = 8          # above this, plot_overlay summarizes as median + band
+OVERLAY_BAND = (0.25, 0.75)
+
+def overlay_values(long_df, series_col, value_col="MeanScore"):
+    """``(dimensions, series, values)`` from a long table with one row per series × dimension.
+
+    ``values`` is ``(n_series, n_dimensions)``, NaN where a series lacks a
+    dimension; both orders follow first appearance.
+    """
+    dims = list(dict.fromkeys(long_df["Dimension"]))
+    wide = long_df.pivot_table(index=series_col, columns="Dimension", values=value_col, aggfunc="first",
+                               sort=False, dropna=False)
+    return dims, wide.index.tolist(), wide.reindex(columns=dims).to_numpy(dtype=float)
+
+def plot_overlay(labels, values, series_labels=None, chart_type="Radar", size_px=560, summary=None,
+                 band=OVERLAY_BAND, show_series=True, title=None, low_max=2.5, med_max=3.5):
+    """Many assessments (rows of ``values``) on one radar or polar bar chart.
+
+    Up to ``OVERLAY_MAX_SERIES`` series are drawn individually with a legend
+    (radar outlines, or grouped bars per dimension); with more, or with
+    ``summary=True``, the chart shows the median and the ``band`` quantile
+    range, plus every series as a faint line when ``show_series``; median
+    polar bars are coloured by their class under ``low_max``/``med_max``.
+    Each layer is a single ``PolyCollection``/``LineCollection``, so hundreds
+    of series cost about as much as one.
+    """
+    import warnings
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.colors import to_rgba_array
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    from .scoring import CLASSES, classify_array
+
+    if chart_type not in CHART_TITLES:
+        raise ValueError(f"Unknown chart type: {chart_type!r} (expected one of {tuple(CHART_TITLES)})")
+    labels = list(labels)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_series, n = values.shape
+    if n != len(labels):
+        raise ValueError(f"Expected {len(labels)} values per series, got {n}.")
+    summary = n_series > OVERLAY_MAX_SERIES if summary is None else bool(summary)
+    radar = chart_type == "Radar"
+    r_min = 1.0 if radar else 0.0
+
+    size_in = size_px / CHART_DPI
+    fig, ax = new_figure((size_in, size_in), projection="polar")
+    angles, _ = _draw_static(ax, labels, chart_type)
+    if title:
+        ax.set_title(title, va="bottom", fontsize=12, fontweight="bold", color=PRIMARY, pad=6)
+    shown = np.clip(np.nan_to_num(values, nan=r_min), r_min, 5.0)
+    angles_c = np.append(angles, angles[0] + 2 * np.pi)
+    handles = []
+
+    if summary:
+        with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)        # all-NaN dimensions stay NaN
+            lo, med, hi = np.nanquantile(values, [band[0], 0.5, band[1]], axis=0)
+        lo, med, hi = (np.clip(np.nan_to_num(q, nan=r_min), r_min, 5.0) for q in (lo, med, hi))
+        band_label = f"P{int(band[0] * 100)}–P{int(band[1] * 100)}"
+        if show_series:
+            alpha = float(np.clip(8.0 / n_series, 0.03, 0.25))
+            if radar:
+                segs = np.stack([np.broadcast_to(angles_c, (n_series, n + 1)),
+                                 np.concatenate([shown, shown[:, :1]], axis=1)], axis=-1)
+            else:   # bar tops as short arcs
+                half = np.pi / n * 0.80
+                a = np.tile(angles, n_series)
+                segs = _wedges(a - half, a + half, shown.ravel(), shown.ravel(), k=8)[:, :8]
+            ax.add_collection(LineCollection(segs, colors=GREY_TXT, alpha=alpha, linewidths=0.6, zorder=2))
+        if radar:
+            closed = lambda q: np.append(q, q[0])
+            lo_c, hi_c, med_c = closed(lo), closed(hi), closed(med)
+            quads = np.stack([np.column_stack([angles_c[:-1], lo_c[:-1]]), np.column_stack([angles_c[1:], lo_c[1:]]),
+                              np.column_stack([angles_c[1:], hi_c[1:]]), np.column_stack([angles_c[:-1], hi_c[:-1]])],
+                             axis=1)
+            ax.add_collection(PolyCollection(quads, facecolors=PRIMARY, edgecolors="none", alpha=0.22, zorder=3))
+            ax.add_collection(LineCollection([np.column_stack([angles_c, med_c])], colors=PRIMARY, linewidths=2.2,
+                                             zorder=4))
+        else:
+            half = np.pi / n * 0.80
+            ax.add_collection(PolyCollection(_wedges(angles - half, angles + half, np.zeros(n), med),
+                                             facecolors=_class_colors(CLASSES[classify_array(med, low_max, med_max)]), alpha=0.55,
+                                             edgecolors="white", linewidths=1.0, zorder=3))
+            ax.add_collection(PolyCollection(_wedges(angles - half * 0.5, angles + half * 0.5, lo, hi),
+                                             facecolors=PRIMARY, edgecolors=PRIMARY, alpha=0.35, linewidths=0.8,
+                                             zorder=4))
+        handles += [Line2D([], [], color=PRIMARY, lw=2.2, label=f"Median (n={n_series})") if radar else
+                    Patch(facecolor=COLOR_MAP["Medium"], alpha=0.55, label=f"Median by class (n={n_series})"),
+                    Patch(facecolor=PRIMARY, alpha=0.3, label=f"{band_label} band")]
+    else:
+        colors = to_rgba_array([OVERLAY_COLORS[i % len(OVERLAY_COLORS)] for i in range(n_series)])
+        if radar:
+            verts = np.stack([np.broadcast_to(angles, (n_series, n)), shown], axis=-1)
+            faces = colors.copy(); faces[:, 3] = 0.08
+            ax.add_collection(PolyCollection(verts, facecolors=faces, edgecolors=colors, linewidths=1.8, zorder=3))
+        else:   # grouped bars: each dimension's sector split between the series
+            width = 2 * np.pi / n * 0.80
+            step = width / n_series
+            a0 = (angles[None, :] - width / 2 + step * np.arange(n_series)[:, None]).ravel()
+            ax.add_collection(PolyCollection(_wedges(a0, a0 + step, np.zeros(a0.size), shown.ravel(), k=6),
+                                             facecolors=np.repeat(colors, n, axis=0), alpha=0.88,
+                                             edgecolors="white", linewidths=0.5, zorder=3))
+        names = series_labels if series_labels is not None else [f"#{i + 1}" for i in range(n_series)]
+        handles += [Line2D([], [], color=c, lw=2.5, label=str(s))
+                    for c, s in zip(colors[:OVERLAY_MAX_SERIES], names[:OVERLAY_MAX_SERIES])]
+        if n_series > OVERLAY_MAX_SERIES:
+            handles.append(Line2D([], [], color="none", label=f"… {n_series - OVERLAY_MAX_SERIES} more"))
+
+    ax.set_ylim(r_min, 5.0)
+    ax.legend(handles=handles, loc="upper left", bbox_to_anchor=(1.02, 1.0), fontsize=8, frameon=False)
+    fig.tight_layout(pad=0.4)
+    return fig
+
+def render_overlay_png(labels, values, series_labels=None, chart_type="Radar", size_px=560, summary=None,
+                       band=OVERLAY_BAND, show_series=True, title=None, low_max=2.5, med_max=3.5) -> bytes:
+    return fig_to_png(plot_overlay(labels, values, series_labels, chart_type, size_px, summary, band, show_series, title,
+                                   low_max, med_max))
+
+# ----- Reusable templates: static layers rasterized once, data blitted on top -----
+TEMPLATE_PAD_IN = 0.15
+CHART_WIDTHS = (420, 900, 10)   # min, max, step of the app's chart-width slider
+# one template per chart type and slider width, so moving the slider never evicts (≈2–6 MB each, built on first use)
+TEMPLATE_CACHE_SIZE = len(CHART_TITLES) * ((CHART_WIDTHS[1] - CHART_WIDTHS[0]) // CHART_WIDTHS[2] + 1)
+
+class ChartTemplate:
+    """Pre-rendered chart frame for one (chart type, size, dimension set).
+
+    The background, grid, rings and labels are drawn once and kept as a raster.
+    ``render_png`` only updates the data artists (bar heights/colours or the
+    radar polygon), restores the raster, draws the data plus whatever must sit
+    above it (labels, spines, and for radar the grid), then crops to the same
+    tight bounding box ``savefig(bbox_inches="tight")`` would use.
+    """
+
+    def __init__(self, chart_type: str, labels, size_px: int = 560):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if chart_type not in CHART_TITLES:
+            raise ValueError(f"Unknown chart type: {chart_type!r} (expected one of {tuple(CHART_TITLES)})")
+        self.chart_type, self.labels, self.size_px = chart_type, tuple(labels), int(size_px)
+        size_in = self.size_px / CHART_DPI
+        self.fig = Figure(figsize=(size_in, size_in), dpi=CHART_DPI, facecolor="white")
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot(projection='polar')
+        self.angles, texts = _draw_static(self.ax, self.labels, chart_type)
+        n = len(self.labels)
+        self.data = _draw_data(self.ax, self.angles, np.full(n, 3.0), ["N/A"] * n, chart_type)
+        self.intervals = _draw_intervals(self.ax, self.angles, None, None, chart_type)
+        self.data.append(self.intervals)
+        self.fig.tight_layout(pad=0.4)
+
+        overlay = list(texts) + [s for s in self.ax.spines.values() if s.get_visible()]
+        if chart_type == "Radar":   # the fill sits below the grid
+            overlay += [self.ax.xaxis, self.ax.yaxis]
+        self.layers = sorted(self.data + overlay, key=lambda a: a.get_zorder())
+
+        for a in self.layers: a.set_visible(False)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for a in self.layers: a.set_visible(True)
+
+        tight = self.fig.get_tightbbox(self.canvas.get_renderer()).padded(TEMPLATE_PAD_IN)
+        height_px = self.fig.bbox.height
+        self.crop = (int(round(tight.x0 * CHART_DPI)), int(round(height_px - tight.y1 * CHART_DPI)),
+                     int(round(tight.x1 * CHART_DPI)), int(round(height_px - tight.y0 * CHART_DPI)))
+        self._lock = threading.Lock()
+
+    def _set_data(self, values, classes, lo=None, hi=None):
+        values = np.asarray(values, dtype=float)
+        if self.chart_type == "Polar Bar":
+            for rect, h, c in zip(self.data, values, _class_colors(classes)):
+                rect.set_height(h); rect.set_facecolor(c)
+        else:
+            line, fill = self.data[:2]
+            closed = np.column_stack([np.append(self.angles, self.angles[0]), np.append(values, values[0])])
+            line.set_data(closed[:, 0], closed[:, 1]); fill.set_xy(closed)
+        verts = _interval_verts(self.angles, lo, hi, self.chart_type)
+        if self.chart_type == "Polar Bar":
+            self.intervals.set_segments(verts)
+        else:
+            self.intervals.set_verts(verts)
+
+    def render_rgba(self, values, classes, lo=None, hi=None):
+        """Cropped RGBA array for one chart (``lo``/``hi``: optional confidence intervals)."""
+        with self._lock:
+            self._set_data(values, classes, lo, hi)
+            self.canvas.restore_region(self.background)
+            for a in self.layers:
+                self.fig.draw_artist(a)
+            rgba = np.asarray(self.canvas.buffer_rgba())
+            x0, y0, x1, y1 = self.crop
+            out = np.full((y1 - y0, x1 - x0, 4), 255, dtype=np.uint8)   # pad may exceed the canvas
+            sx0, sy0 = max(x0, 0), max(y0, 0)
+            sx1, sy1 = min(x1, rgba.shape[1]), min(y1, rgba.shape[0])
+            out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = rgba[sy0:sy1, sx0:sx1]
+            return out
+
+    def render_png(self, values, classes, lo=None, hi=None) -> bytes:
+        from PIL import Image
+        with span("figure"):
+            rgba = self.render_rgba(values, classes, lo, hi)
+        with span("savefig"):
+            buf = io.BytesIO()
+            Image.fromarray(rgba, "RGBA").save(buf, format="PNG")
+        return buf.getvalue()
+
+    def render_df(self, dimensions_df) -> bytes:
+        if tuple(dimensions_df["Dimension"].tolist()) != self.labels:
+            raise ValueError("dimensions_df does not match this template's dimension set.")
+        return self.render_png(dimensions_df["MeanScore"].to_numpy(dtype=float),
+                               dimensions_df["Classification"].tolist(), *chart_intervals(dimensions_df))
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_template(chart_type: str, labels: tuple, size_px: int = 560) -> ChartTemplate:
+    """Shared template per (chart type, dimension set, size)."""
+    return ChartTemplate(chart_type, labels, size_px)
+
+# ----- Matrix labels -----
+def annotate_clustered_points(ax, positions, r_points=18):
+    import matplotlib.patheffects as pe
+    groups = defaultdict(list)
+    for name, (x, y) in positions.items():
+        groups[(round(x, 3), round(y, 3))].append(name)
+    for (x, y), names in groups.items():
+        k = len(names)
+        if k == 1:
+            txt = ax.annotate(
+                names[0], xy=(x, y), xytext=(10, 10), textcoords='offset points',
+                arrowprops=dict(arrowstyle="-", lw=0.6, color="#6B7280"),
+                fontsize=9, color=PRIMARY
+            )
+            txt.set_path_effects([pe.Stroke(linewidth=3, foreground="white"), pe.Normal()])
+        else:
+            angles = np.linspace(0, 2*np.pi, k, endpoint=False)
+            for name, ang in zip(names, angles):
+                dx = r_points * np.cos(ang)
+                dy = r_points * np.sin(ang)
+                txt = ax.annotate(
+                    name, xy=(x, y), xytext=(dx, dy), textcoords='offset points',
+                    ha='center', va='center', fontsize=9, color=PRIMARY,
+                    arrowprops=dict(arrowstyle="-", lw=0.6, color="#6B7280",
+                                    shrinkA=2, shrinkB=2, connectionstyle="arc3,rad=0.1")
+                )
+                txt.set_path_effects([pe.Stroke(linewidth=3, foreground="white"), pe.Normal()])
+
+# ----- Mode B matrix (single assessment or whole portfolio) -----
+MATRIX_LIM = (0.8, 3.2)
+MATRIX_DENSITY_THRESHOLD = 400      # above this many points, draw a hexbin instead of markers
+BAND_COLORS = {**COLOR_MAP, "Closed": "#6B7280"}
+# label anchor offsets (px) tried in order: diagonals, sides, then the same further out
+LABEL_OFFSETS = np.array([(1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)], dtype=float)
+
+def draw_matrix_axes(ax, title="2-Axis Matrix: Openness vs. Regulation"):
+    """Grid, ticks and labels of the Openness × Regulation/Autonomy matrix."""
+    ax.set_facecolor("white")
+    for v in [1, 2, 3]:
+        ax.axvline(v, color=GRID_GREY, lw=1, zorder=0)
+        ax.axhline(v, color=GRID_GREY, lw=1, zorder=0)
+    ax.set_xlim(*MATRIX_LIM); ax.set_ylim(*MATRIX_LIM)
+    ax.set_xticks([1, 2, 3]); ax.set_yticks([1, 2, 3])
+    ax.set_xticklabels(["Low (1)", "Medium (2)", "High (3)"])
+    ax.set_yticklabels(["More Regulated (1)", "Mixed (2)", "More Autonomous (3)"])
+    ax.set_xlabel("Level of Openness")
+    ax.set_ylabel("Regulation vs. Autonomy")
+    ax.set_title(title, color=PRIMARY)
+    ax.grid(True, linestyle="--", alpha=0.35, zorder=0)
+
+def place_labels(points_px, sizes_px, bounds=None, gap_px=6.0, marker_px=5.0, rings=2):
+    """Greedy collision-free label placement on a uniform grid index.
+
+    ``points_px`` is ``(n, 2)`` display coordinates, ``sizes_px`` ``(n, 2)``
+    label width/height. Every point (as a small box) and every placed label is
+    hashed into grid cells at least as large as the biggest label, so each
+    candidate box is only tested against its own few cells: near-linear in
+    ``n``. Labels must also fit inside ``bounds`` ``(x0, y0, x1, y1)`` if
+    given. Returns ``(n, 2)`` label centres in display coordinates, NaN for
+    labels with no free slot.
+    """
+    pts = np.asarray(points_px, dtype=float)
+    sizes = np.asarray(sizes_px, dtype=float)
+    n = len(pts)
+    out = np.full((n, 2), np.nan)
+    if n == 0:
+        return out
+    cell = float(max(sizes.max(), 2 * marker_px, 1.0))
+    grid = defaultdict(list)
+    boxes = []
+
+    def cells(b):
+        for i in range(int(b[0] // cell), int(b[2] // cell) + 1):
+            for j in range(int(b[1] // cell), int(b[3] // cell) + 1):
+                yield i, j
+
+    def insert(b):
+        boxes.append(b)
+        for c in cells(b):
+            grid[c].append(len(boxes) - 1)
+
+    def free(b):
+        if bounds is not None and (b[0] < bounds[0] or b[1] < bounds[1] or b[2] > bounds[2] or b[3] > bounds[3]):
+            return False
+        for c in cells(b):
+            for k in grid.get(c, ()):
+                o = boxes[k]
+                if b[0] < o[2] and o[0] < b[2] and b[1] < o[3] and o[1] < b[3]:
+                    return False
+        return True
+
+    for x, y in pts:
+        insert((x - marker_px, y - marker_px, x + marker_px, y + marker_px))
+    for idx in range(n):
+        (x, y), (w, h) = pts[idx], sizes[idx]
+        for ring in range(1, rings + 1):
+            r = gap_px * ring
+            placed = False
+            for dx, dy in LABEL_OFFSETS:
+                cx = x + dx * (r + w / 2) if dx else x
+                cy = y + dy * (r + h / 2) if dy else y + (r + h / 2)
+                b = (cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2)
+                if free(b):
+                    insert(b); out[idx] = (cx, cy); placed = True
+                    break
+            if placed:
+                break
+    return out
+
+def plot_matrix(x, y, labels=None, bands=None, size_px=700, density_threshold=MATRIX_DENSITY_THRESHOLD,
+                title="2-Axis Matrix: Openness vs. Regulation", fontsize=8):
+    """Portfolio matrix: one scatter for all points, non-overlapping labels.
+
+    Above ``density_threshold`` points the markers become a hexbin density
+    and labels are left out.
+    """
+    from matplotlib.collections import LineCollection
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    ok = ~(np.isnan(x) | np.isnan(y))
+    size_in = size_px / CHART_DPI
+    fig, ax = new_figure((size_in, size_in * 6 / 7))
+    fig.subplots_adjust(left=0.22, right=0.97, bottom=0.12, top=0.92)
+    draw_matrix_axes(ax, title)
+
+    if ok.sum() > density_threshold:
+        hb = ax.hexbin(x[ok], y[ok], gridsize=24, extent=(*MATRIX_LIM, *MATRIX_LIM), mincnt=1,
+                       cmap="viridis_r", linewidths=0.2, zorder=2)
+        fig.colorbar(hb, ax=ax, fraction=0.046, pad=0.02).set_label("Points")
+        return fig
+
+    colors = [BAND_COLORS.get(b, "steelblue") for b in np.asarray(bands, dtype=object)[ok]] if bands is not None else "steelblue"
+    ax.scatter(x[ok], y[ok], c=colors, s=60 if ok.sum() > 50 else 140, alpha=0.85,
+               edgecolors="black", linewidths=0.5, zorder=3)
+    if labels is None:
+        return fig
+
+    labels = np.asarray(labels, dtype=object)[ok]
+    pts = ax.transData.transform(np.column_stack([x[ok], y[ok]]))
+    char_w, line_h = 0.6 * fontsize * CHART_DPI / 72, 1.3 * fontsize * CHART_DPI / 72
+    sizes = np.column_stack([[len(str(s)) * char_w for s in labels], np.full(len(labels), line_h)])
+    centres = place_labels(pts, sizes, bounds=ax.bbox.extents, marker_px=5.0 if ok.sum() > 50 else 8.0)
+    placed = ~np.isnan(centres[:, 0])
+    if placed.any():
+        inv = ax.transData.inverted()
+        cdata = inv.transform(centres[placed])
+        # leader from the point to the nearest edge of its label box
+        edge = np.clip(pts[placed], centres[placed] - sizes[placed] / 2, centres[placed] + sizes[placed] / 2)
+        segs = np.stack([inv.transform(pts[placed]), inv.transform(edge)], axis=1)
+        ax.add_collection(LineCollection(segs, colors="#6B7280", linewidths=0.5, zorder=2))
+        for (cx, cy), text in zip(cdata, labels[placed]):
+            ax.text(cx, cy, str(text), ha="center", va="center", fontsize=fontsize, color=PRIMARY, zorder=4)
+    if (~placed).any():
+        fig.text(0.97, 0.01, f"{int((~placed).sum())} label(s) hidden to avoid overlap",
+                 ha="right", va="bottom", fontsize=7, color=GREY_TXT)
+    return fig
+
+def plot_positions(positions, size_px=840, r_points=18):
+    """Single-assessment matrix: one marker per dimension, coinciding labels fanned out."""
+    size_in = size_px / CHART_DPI
+    fig, ax = new_figure((size_in, size_in * 6 / 7))
+    draw_matrix_axes(ax)
+    xy = np.array(list(positions.values()), dtype=float)
+    ax.scatter(xy[:, 0], xy[:, 1], color="steelblue", s=180, edgecolors="black", zorder=3)
+    with span("matrix.annotate"):
+        annotate_clustered_points(ax, positions, r_points=r_points)
+    return fig
+
+def render_positions_png(positions, size_px=840) -> bytes:
+    return fig_to_png(plot_positions(positions, size_px))
+
+def render_matrix_png(x, y, labels=None, bands=None, size_px=700, density_threshold=MATRIX_DENSITY_THRESHOLD,
+                      title="2-Axis Matrix: Openness vs. Regulation") -> bytes:
+    return fig_to_png(plot_matrix(x, y, labels, bands, size_px, density_threshold, title))
+
+# ----- Threshold sensitivity heatmaps -----
+SENSITIVITY_CMAP = "YlOrRd"
+
+def _cell_edges(v):
+    v = np.asarray(v, dtype=float)
+    if len(v) < 2:
+        return np.array([v[0] - 0.05, v[0] + 0.05]) if len(v) else np.array([0.0, 1.0])
+    mid = (v[:-1] + v[1:]) / 2
+    return np.concatenate([[2 * v[0] - mid[0]], mid, [2 * v[-1] - mid[-1]]])
+
+def plot_sensitivity(result, dimensions, size_px=960, share=True, total=True, title=None):
+    """Small-multiple heatmaps of ``sensitivity.sweep``: projects changing class per (low_max, med_max).
+
+    One panel per dimension, ``low_max`` up and ``med_max`` across, on one
+    shared color scale. ``share`` plots the percentage of scored projects
+    and, with ``total``, adds a first panel pooling all dimensions (on
+    raw counts the pooled panel would swamp the scale). Pairs with
+    ``low_max > med_max`` are blank and the baseline cutoffs are marked.
+    """
+    from matplotlib.ticker import MaxNLocator
+    changed = np.asarray(result["changed"], dtype=float)
+    n = np.asarray(result["n"], dtype=float)
+    labels = list(dimensions)
+    if total and share:
+        changed = np.concatenate([changed.sum(axis=0, keepdims=True), changed])
+        n = np.concatenate([[n.sum()], n])
+        labels = ["All dimensions"] + labels
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = 100.0 * changed / n[:, None, None] if share else changed
+    z = np.where(result["valid"][None], z, np.nan)
+    cols = min(3, len(labels)) or 1
+    rows = -(-len(labels) // cols)
+    size_in = size_px / CHART_DPI
+    height_in = size_in * rows / cols * 0.85 + 0.6
+    fig, axes = new_figure((size_in, height_in), grid=(rows, cols))
+    x_edges, y_edges = _cell_edges(result["med_values"]), _cell_edges(result["low_values"])
+    axes[0, 0].xaxis.set_major_locator(MaxNLocator(5)); axes[0, 0].yaxis.set_major_locator(MaxNLocator(5))
+    vmax = np.nanmax(z) if np.isfinite(z).any() else 1.0
+    mesh = None
+    for k, ax in enumerate(axes.flat):
+        if k >= len(labels):
+            ax.set_axis_off()
+            continue
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_invalid(z[k]), cmap=SENSITIVITY_CMAP,
+                             vmin=0, vmax=vmax or 1.0, shading="flat")
+        ax.plot([result["med_max"]], [result["low_max"]], marker="+", color=PRIMARY, markersize=9, mew=2)
+        ax.set_title(labels[k], fontsize=8, color=PRIMARY, fontweight="bold")
+        ax.tick_params(labelsize=7, colors=GREY_TXT, labelbottom=k + cols >= len(labels))
+        ax.set_facecolor(GRID_GREY)
+        if k % cols == 0:
+            ax.set_ylabel("Low if mean <", fontsize=7, color=GREY_TXT)
+        if k + cols >= len(labels):
+            ax.set_xlabel("Medium if mean ≤", fontsize=7, color=GREY_TXT)
+    bottom, top = 0.6 / height_in, 1 - 0.85 / height_in       # room for axis labels and titles, in inches
+    fig.subplots_adjust(left=0.08, right=0.88, bottom=bottom, top=top, hspace=0.55, wspace=0.3)
+    cax = fig.add_axes([0.91, bottom, 0.018, top - bottom])
+    fig.colorbar(mesh, cax=cax).set_label("% of projects changing class" if share else "Projects changing class",
+                                          fontsize=8)
+    cax.tick_params(labelsize=7)
+    fig.suptitle(title or f"Threshold sensitivity vs. baseline {result['low_max']:g} / {result['med_max']:g} (+)",
+                 fontsize=11, color=PRIMARY, fontweight="bold")
+    return fig
+
+def render_sensitivity_png(result, dimensions, size_px=960, share=True, total=True, title=None) -> bytes:
+    return fig_to_png(plot_sensitivity(result, dimensions, size_px, share, total, title))
+
+# ----- PNG rendering + content-addressed cache -----
+CHART_TYPES = tuple(CHART_TITLES)
+CHART_BACKENDS = ("template", "matplotlib", "svg")
+
+def fig_to_png(fig) -> bytes:
+    """Rasterize ``fig`` the way the app always has, then release it."""
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format="png", dpi=CHART_DPI, bbox_inches="tight", pad_inches=0.15)
+    finally:
+        if getattr(fig.canvas, "manager", None) is not None:   # made through pyplot
+            import matplotlib.pyplot as plt
+            plt.close(fig)
+        fig.clear()
+    return buf.getvalue()
+
+def chart_key(dimensions_df, chart_type: str, size_px: int, backend: str = "template") -> str:
+    """Stable hash of everything that affects the rendered chart."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{chart_type}|{int(size_px)}|{backend}|".encode())
+    for col in ("Dimension", "MeanScore", "Classification") + tuple(c for c in CI_COLUMNS if c in dimensions_df.columns):
+        h.update("\x1f".join(map(repr, dimensions_df[col].tolist())).encode())
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+class PngCache:
+    """Thread-safe LRU of PNG bytes bounded by total size, not entry count."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = int(max_bytes)
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            png = self._items.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png: bytes):
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = png
+            self._bytes += len(png)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear(); self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._items), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+PNG_CACHE = PngCache()
+
+def render_chart_png(dimensions_df, chart_type: str = "Polar Bar", size_px: int = 560,
+                     cache=PNG_CACHE, use_template: bool = True, backend: str = None) -> bytes:
+    """PNG bytes for a polar bar or radar chart, served from ``cache`` when possible.
+
+    ``backend`` is one of ``CHART_BACKENDS``: ``"template"`` blits onto a
+    shared ``ChartTemplate``, ``"matplotlib"`` builds and saves a full figure
+    as before, ``"svg"`` rasterizes the SVG scene with PIL (see ``svg``).
+    Left as ``None`` it follows ``use_template``.
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unknown chart type: {chart_type!r} (expected one of {CHART_TYPES})")
+    backend = backend or ("template" if use_template else "matplotlib")
+    if backend not in CHART_BACKENDS:
+        raise ValueError(f"Unknown chart backend: {backend!r} (expected one of {CHART_BACKENDS})")
+    key = chart_key(dimensions_df, chart_type, size_px, backend) if cache is not None else None
+    if cache is not None:
+        png = cache.get(key)
+        if png is not None:
+            return png
+    if backend == "svg":
+        from .svg import render_png
+        with span("figure"):
+            png = render_png(dimensions_df["Dimension"].tolist(), dimensions_df["MeanScore"].to_numpy(dtype=float),
+                             dimensions_df["Classification"].tolist(), chart_type, int(size_px),
+                             intervals=chart_intervals(dimensions_df))
+    elif backend == "template":
+        png = get_template(chart_type, tuple(dimensions_df["Dimension"].tolist()), int(size_px)).render_df(dimensions_df)
+    else:
+        plot = plot_polar_bar if chart_type == "Polar Bar" else plot_radar
+        with span("figure"):
+            fig = plot(dimensions_df, size_px=size_px)
+        with span("savefig"):
+            png = fig_to_png(fig)
+    if cache is not None:
+        cache.put(key, png)
+    return png
+
+def render_chart_svg(dimensions_df, chart_type: str = "Polar Bar", size_px: int = 560) -> str:
+    """SVG markup for a polar bar or radar chart (no matplotlib, ~1 ms)."""
+    from .svg import render_svg
+    with span("figure"):
+        return render_svg(dimensions_df["Dimension"].tolist(), dimensions_df["MeanScore"].to_numpy(dtype=float),
+                          dimensions_df["Classification"].tolist(), chart_type, int(size_px),
+                          intervals=chart_intervals(dimensions_df))
+
+# ----- Cold-start warm-up -----
+def prewarm(labels=None, size_px: int = 560):
+    """Import matplotlib, build/load its font cache and pre-build the default templates.
+
+    Cheap to call repeatedly; meant for a background thread at app start or a
+    container build step (``python -m openness warmup``).
+    """
+    from matplotlib import font_manager
+    from .scoring import DIMENSIONS
+    labels = tuple(labels or DIMENSIONS)
+    font_manager.findfont(font_manager.FontProperties(family="DejaVu Sans", weight="bold"))
+    for chart_type in CHART_TYPES:
+        tpl = get_template(chart_type, labels, int(size_px))
+        tpl.render_png(np.full(len(labels), 3.0), ["Medium"] * len(labels))
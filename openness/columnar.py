@@ -0,0 +1,291 @@
+"""Compact, memory-mapped response archives (``.opn``).
+
+An archive stores one ``uint8`` code per respondent × question, row by row,
+and the instrument once, in a JSON header:
+
+* Mode A: the answer itself (1–5); 0 = unanswered.
+* Mode B: the option's code + 1, in codebook order; 0 = unanswered.
+
+Layout: a 64-byte prefix (magic, header offset, header length), the code
+block, the id block, then the header. Ids are int64, or uint32 indices into a
+label list in the header when they are not integers. ``open_archive`` maps
+both blocks with ``np.memmap``: opening costs a header read, and chunks are
+row slices of the mapping that ``dimension_means`` and ``Codebook.score``
+read as stored. A Mode A response takes ``n_variables`` bytes, against about
+a hundred bytes per answer in the long float64 tables with repeated
+``Variable``/``Dimension``/``Question`` strings.
+"""
+import json
+import os
+import shutil
+import struct
+import tempfile
+from functools import cached_property
+
+import numpy as np
+
+MAGIC = b"OPNARCH1"
+FORMAT = 1
+SUFFIX = ".opn"
+ALIGN = 64
+PREFIX = struct.Struct("<8sQQ")   # magic, header offset, header length
+MODES = ("A", "B")
+CHUNK_SIZE = 100_000
+
+def is_archive(path) -> bool:
+    """True for a path ending in ``.opn`` (existing or not) or a file starting with ``MAGIC``."""
+    if str(path).lower().endswith(SUFFIX):
+        return True
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except (OSError, TypeError):
+        return False
+
+# =============================================================================
+# Instrument metadata (stored once per archive)
+# =============================================================================
+def _codebook_meta(codebook):
+    x_dim = np.where(codebook.x_indicator.any(axis=1), codebook.x_indicator.argmax(axis=1), -1)
+    return {"dimensions": list(codebook.dimensions), "columns": list(codebook.columns),
+            "options": [list(o) for o in codebook.options],
+            "values": [codebook.values[i, :len(o)].tolist() for i, o in enumerate(codebook.options)],
+            "x_dim": x_dim.tolist(), "y_column": codebook.y_column.tolist()}
+
+def _codebook_from_meta(d):
+    from .matrix import assemble_codebook
+    return assemble_codebook(d["dimensions"], d["columns"], d["options"], d["values"], d["x_dim"], d["y_column"])
+
+def _json_label(x):
+    return x.item() if isinstance(x, np.generic) else x
+
+# =============================================================================
+# Encoding
+# =============================================================================
+def encode_answers(scores):
+    """``uint8`` codes for a float answer matrix (NaN = unanswered, answers 1–5)."""
+    scores = np.asarray(scores, dtype=float)
+    codes = np.nan_to_num(scores, nan=0.0)
+    if ((codes != np.round(codes)) | (codes < 0) | (codes > 255)).any():
+        raise ValueError("Archives store whole-number answers; found a fractional or out-of-range score.")
+    return codes.astype(np.uint8)
+
+def encode_matrix(codebook, chunk):
+    """``uint8`` codes (option code + 1, 0 = unanswered) for a Mode B answer DataFrame."""
+    if isinstance(chunk, np.ndarray):   # already archived
+        return chunk
+    missing = [c for c in codebook.columns if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing answer columns: {', '.join(missing)}")
+    return (codebook.encode(chunk) + 1).astype(np.uint8)
+
+# =============================================================================
+# Writer
+# =============================================================================
+class ArchiveWriter:
+    """Append ``(ids, codes)`` chunks to a new archive; ``close()`` writes the header.
+
+    Codes go straight to the file and ids to a temporary file, so memory
+    stays at one chunk whatever the archive size.
+    """
+
+    def __init__(self, path, mode="A", instrument=None, codebook=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode!r} (expected one of {MODES})")
+        if mode == "A":
+            from .registry import EMBEDDED
+            instrument = instrument or EMBEDDED
+            self.meta, self.columns = {"instrument": instrument.to_dict()}, list(instrument.variables)
+        else:
+            from .matrix import CODEBOOK
+            codebook = codebook or CODEBOOK
+            self.meta, self.columns = {"codebook": _codebook_meta(codebook)}, list(codebook.columns)
+        self.path, self.mode = path, mode
+        self.fh = open(path, "wb")
+        self.fh.write(b"\0" * ALIGN)
+        self.id_file = tempfile.TemporaryFile()
+        self.n_rows, self.id_kind, self.labels = 0, None, {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.fh.close(); self.id_file.close()
+            os.remove(self.path)
+
+    def _label_codes(self, ids):
+        # labels are always strings: CSV chunks infer id dtypes independently, so one id can arrive as 1 and '1'
+        import pandas as pd
+        inverse, uniques = pd.factorize(np.asarray(ids, dtype=object), use_na_sentinel=False)
+        keys = [None if pd.isna(u) else str(_json_label(u)) for u in uniques]
+        lut = np.array([self.labels.setdefault(k, len(self.labels)) for k in keys], dtype=np.uint32)
+        return lut[inverse]
+
+    def _relabel(self):
+        """Switch the ids written so far from int64 to label indices."""
+        self.id_file.seek(0)
+        written = np.frombuffer(self.id_file.read(), dtype=np.int64)
+        self.id_file.seek(0); self.id_file.truncate()
+        self.id_file.write(self._label_codes(written).tobytes())
+        self.id_kind = "labels"
+
+    def append(self, ids, codes):
+        codes = np.ascontiguousarray(codes, dtype=np.uint8)
+        if codes.ndim != 2 or codes.shape[1] != len(self.columns):
+            raise ValueError(f"Expected (rows, {len(self.columns)}) codes, got {codes.shape}.")
+        ids = np.asarray(ids)
+        if len(ids) != len(codes):
+            raise ValueError(f"Got {len(ids)} ids for {len(codes)} rows.")
+        kind = "int64" if ids.dtype.kind in "iu" else "labels"
+        if self.id_kind is None:
+            self.id_kind = kind
+        elif kind != self.id_kind and kind == "labels":
+            self._relabel()
+        block = ids.astype(np.int64) if self.id_kind == "int64" else self._label_codes(ids)
+        self.fh.write(codes.tobytes())
+        self.id_file.write(block.tobytes())
+        self.n_rows += len(codes)
+
+    def close(self):
+        pad = -self.fh.tell() % ALIGN
+        self.fh.write(b"\0" * pad)
+        ids_offset = self.fh.tell()
+        self.id_file.seek(0)
+        shutil.copyfileobj(self.id_file, self.fh)
+        self.id_file.close()
+        labels = sorted(self.labels, key=self.labels.get) if self.id_kind == "labels" else None
+        header = json.dumps({
+            "format": FORMAT, "mode": self.mode, "n_rows": self.n_rows, "columns": self.columns,
+            "codes_offset": ALIGN, "ids": {"kind": self.id_kind or "int64", "offset": ids_offset, "labels": labels},
+            **self.meta,
+        }, default=str).encode("utf-8")
+        header_offset = self.fh.tell()
+        self.fh.write(header)
+        self.fh.seek(0)
+        self.fh.write(PREFIX.pack(MAGIC, header_offset, len(header)))
+        self.fh.close()
+        return self.path
+
+# =============================================================================
+# Reader
+# =============================================================================
+def _memmap(path, dtype, offset, shape):
+    if not shape[0]:   # np.memmap cannot map zero bytes
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+class ResponseArchive:
+    """Read-only archive: ``codes`` is a ``(n_rows, n_columns)`` ``uint8`` memory map."""
+
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            magic, offset, length = PREFIX.unpack(fh.read(PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path!r} is not a response archive.")
+            fh.seek(offset)
+            self.header = json.loads(fh.read(length).decode("utf-8"))
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"Unsupported archive format: {self.header.get('format')!r}")
+        h = self.header
+        self.path, self.mode, self.n_rows, self.columns = path, h["mode"], h["n_rows"], h["columns"]
+        self.codes = _memmap(path, np.uint8, h["codes_offset"], (self.n_rows, len(self.columns)))
+        ids = h["ids"]
+        self._ids = _memmap(path, np.int64 if ids["kind"] == "int64" else np.uint32, ids["offset"], (self.n_rows,))
+        self._labels = np.array(ids["labels"], dtype=object) if ids["kind"] == "labels" else None
+
+    def __len__(self):
+        return self.n_rows
+
+    @cached_property
+    def instrument(self):
+        from .registry import Instrument
+        return Instrument.from_dict(self.header["instrument"]) if self.mode == "A" else None
+
+    @cached_property
+    def codebook(self):
+        return _codebook_from_meta(self.header["codebook"]) if self.mode == "B" else None
+
+    def ids(self, start=0, stop=None):
+        block = self._ids[start:stop]
+        return self._labels[block] if self._labels is not None else np.asarray(block)
+
+    def iter_chunks(self, chunk_size=CHUNK_SIZE):
+        """Yield ``(ids, codes)``; ``codes`` are views of the memory map, not copies."""
+        for start in range(0, self.n_rows, chunk_size):
+            yield self.ids(start, start + chunk_size), self.codes[start:start + chunk_size]
+
+    def _require(self, mode):
+        if self.mode != mode:
+            raise ValueError(f"{self.path!r} holds Mode {self.mode} responses, not Mode {mode}.")
+
+    def iter_responses(self, chunk_size=CHUNK_SIZE, instrument=None):
+        """``batch.iter_responses`` chunks aligned with ``instrument``'s variables.
+
+        Same variable order: views as stored. Otherwise the columns are picked
+        per chunk (a copy); variables the archive lacks raise ``ValueError``.
+        """
+        self._require("A")
+        if instrument is None or list(instrument.variables) == self.columns:
+            yield from self.iter_chunks(chunk_size)
+            return
+        col = {v: j for j, v in enumerate(self.columns)}
+        missing = [v for v in instrument.variables if v not in col]
+        if missing:
+            raise ValueError(f"Missing variable columns: {', '.join(missing)}")
+        take = np.array([col[v] for v in instrument.variables], dtype=np.intp)
+        for ids, codes in self.iter_chunks(chunk_size):
+            yield ids, codes[:, take]
+
+    def check_codebook(self, codebook):
+        self._require("B")
+        if list(codebook.columns) != self.columns:
+            raise ValueError(f"{self.path!r} was archived with a different Mode B codebook.")
+
+    def dimension_means(self, decimals=3, chunk_size=CHUNK_SIZE, instrument=None):
+        """``(n_rows, n_dimensions)`` Mode A means, scored chunk by chunk from the map."""
+        from .scoring import dimension_means
+        inst = instrument or self.instrument
+        out = np.empty((self.n_rows, len(inst.dimensions)))
+        start = 0
+        for _ids, codes in self.iter_responses(chunk_size, inst):
+            out[start:start + len(codes)] = dimension_means(codes, inst.indicator, decimals)
+            start += len(codes)
+        return out
+
+    def matrix_positions(self, chunk_size=CHUNK_SIZE):
+        """``(x, y)``, both ``(n_rows, n_dimensions)``, for a Mode B archive."""
+        self._require("B")
+        cb = self.codebook
+        x = np.empty((self.n_rows, len(cb.dimensions)))
+        y = np.empty_like(x)
+        for start in range(0, self.n_rows, chunk_size):
+            _answers, x[start:start + chunk_size], y[start:start + chunk_size] = cb.score(self.codes[start:start + chunk_size])
+        return x, y
+
+def open_archive(path) -> ResponseArchive:
+    return ResponseArchive(path)
+
+# =============================================================================
+# Building archives from response files
+# =============================================================================
+def archive_responses(path, out_path, id_column=None, chunk_size=10_000, sheet=None, instrument=None):
+    """Archive a Mode A CSV/XLSX response file; returns ``(out_path, n_rows)``."""
+    from .batch import iter_responses
+    from .registry import EMBEDDED
+    instrument = instrument or EMBEDDED
+    with ArchiveWriter(out_path, "A", instrument=instrument) as writer:
+        for ids, scores in iter_responses(path, chunk_size, id_column, sheet, instrument):
+            writer.append(ids, encode_answers(scores))
+    return out_path, writer.n_rows
+
+def archive_matrix(path, out_path, id_column=None, chunk_size=10_000, sheet=None, codebook=None):
+    """Archive a Mode B CSV/XLSX answer file; returns ``(out_path, n_rows)``."""
+    from .matrix import CODEBOOK, iter_matrix_chunks
+    codebook = codebook or CODEBOOK
+    with ArchiveWriter(out_path, "B", codebook=codebook) as writer:
+        for ids, chunk in iter_matrix_chunks(path, chunk_size, id_column, sheet, codebook):
+            writer.append(ids, encode_matrix(codebook, chunk))
+    return out_path, writer.n_rows
@@ -0,0 +1,31 @@
+"""Download payloads, serialized only when a download is requested.
+
+CSV, XLSX and Parquet go through the same writers as the batch tools
+(``batch.open_sink``), so XLSX is written row-streamed in openpyxl's
+write-only mode and Parquet through a ``ParquetWriter``.
+"""
+import io
+
+EXPORT_FORMATS = {
+    "csv":     ("CSV", "text/csv"),
+    "xlsx":    ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+def to_bytes(df, fmt: str = "csv") -> bytes:
+    """Serialize one table in ``fmt`` (see ``EXPORT_FORMATS``)."""
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r} (expected one of {tuple(EXPORT_FORMATS)})")
+    from .batch import open_sink
+    buf = io.BytesIO()
+    sink = open_sink(buf, fmt)
+    try:
+        sink.write(df)
+    finally:
+        sink.close()
+    return buf.getvalue()
+
+def export_name(stem: str, fmt: str, day) -> str:
+    return f"openness_{stem}_{day}.{fmt}"
@@ -0,0 +1,35 @@
+"""Embedded APERTO instrument (Mode A items)."""
+
+# =============================================================================
+# APERTO grid (Mode A questionnaire, 1–5)
+# =============================================================================
+APERTO_ITEMS = [
+  {"Dimension of openness":"OPEN NETWORK","Variable":"ON1","Questions":"How is the partnership regarding new actors?","Scale_5_text":"The network is able to connect and integrate new actors into the collaboration.","Scale_1_text":"The partnership is concentrated around a fixed number of actors."},
+  {"Dimension of openness":"OPEN NETWORK","Variable":"ON2","Questions":"How would you characterize the network of stakeholders?","Scale_5_text":"The stakeholder network is decentralized: no single leader; freedom for action.","Scale_1_text":"The stakeholder network is centralized: a leader is clearly identified and defines actions."},
+  {"Dimension of openness":"OPEN NETWORK","Variable":"ON3","Questions":"How would you define the management of the innovation process?","Scale_5_text":"Self-management and self-organization.","Scale_1_text":"Controlled from outside."},
+  {"Dimension of openness":"OPEN NETWORK","Variable":"ON4","Questions":"How would you define the governance of the innovation partnership?","Scale_5_text":"Governance is clear, transparent, and effective for all partners.","Scale_1_text":"Governance is unclear with no formalized rules."},
+
+  {"Dimension of openness":"OPEN COMMUNICATION","Variable":"OC1","Questions":"How would you define information sharing in the partnership?","Scale_5_text":"All partners trust shared information; it is reliable and complete.","Scale_1_text":"Information is unreliable and partners cannot validate it."},
+  {"Dimension of openness":"OPEN COMMUNICATION","Variable":"OC2","Questions":"How would you define the partnership in terms of communication?","Scale_5_text":"Open communication: all partners freely access the information they need.","Scale_1_text":"Restricted communication: partners have limited access to necessary information."},
+  {"Dimension of openness":"OPEN COMMUNICATION","Variable":"OC3","Questions":"How would you define data and knowledge documentation?","Scale_5_text":"Shared documentation that is searchable, reusable, and versioned.","Scale_1_text":"No shared documentation or ad-hoc fragmented notes."},
+
+  {"Dimension of openness":"OPEN DESIGN","Variable":"OD1","Questions":"How would you define co-design practices?","Scale_5_text":"Multi-actor co-design with early and continuous user/partner feedback.","Scale_1_text":"Design decided by a small core team with limited consultation."},
+  {"Dimension of openness":"OPEN DESIGN","Variable":"OD2","Questions":"How open are the specifications and artifacts?","Scale_5_text":"Specifications/artifacts are open and reusable across partners.","Scale_1_text":"Specifications/artifacts are closed or only shared case-by-case."},
+
+  {"Dimension of openness":"OPEN SPACE","Variable":"OSp1","Questions":"How would you define working spaces and collaboration settings?","Scale_5_text":"Shared, inclusive, accessible spaces (physical/virtual) that foster collaboration.","Scale_1_text":"Fragmented or private spaces with limited partner access."},
+  {"Dimension of openness":"OPEN SPACE","Variable":"OSp2","Questions":"How would you define the availability of tools and infrastructure?","Scale_5_text":"Common toolsets/infrastructure with fair access policies.","Scale_1_text":"Tools/infrastructure are siloed; access is restricted or opaque."},
+
+  {"Dimension of openness":"OPEN USE","Variable":"OU1","Questions":"How would you define usage rights for outputs and resources?","Scale_5_text":"Permissive use by all partners (clear licenses, minimal barriers).","Scale_1_text":"Restrictive use; unclear licenses or heavy gatekeeping."},
+  {"Dimension of openness":"OPEN USE","Variable":"OU2","Questions":"How would you define reuse and adaptation of outputs?","Scale_5_text":"Outputs are designed for reuse, adaptation, and scaling.","Scale_1_text":"Outputs are difficult to reuse or adapt."},
+
+  {"Dimension of openness":"OPEN RESEARCH","Variable":"OR1","Questions":"How would you define participation in the research process?","Scale_5_text":"Broad, structured participation of stakeholders across stages.","Scale_1_text":"Narrow participation; decisions concentrated in a few actors."},
+  {"Dimension of openness":"OPEN RESEARCH","Variable":"OR2","Questions":"How would you define data practices in research?","Scale_5_text":"Data are FAIR (findable, accessible, interoperable, reusable).","Scale_1_text":"Data are closed, poorly documented, or hard to access."},
+  {"Dimension of openness":"OPEN RESEARCH","Variable":"OR3","Questions":"How would you define transparency and reproducibility?","Scale_5_text":"Transparent methods; shared code/materials for reproducibility.","Scale_1_text":"Opaque methods; materials/code unavailable."},
+
+  {"Dimension of openness":"OPEN SOCIETY","Variable":"OS1","Questions":"How would you define societal engagement?","Scale_5_text":"Active engagement with communities; inclusive benefits considered.","Scale_1_text":"Limited or no engagement with affected communities."},
+  {"Dimension of openness":"OPEN SOCIETY","Variable":"OS2","Questions":"How would you define alignment with public interest?","Scale_5_text":"Clear alignment; public value and ethics integrated into decisions.","Scale_1_text":"Public interest is not explicitly considered."},
+
+  {"Dimension of openness":"OPEN MIND","Variable":"OM1","Questions":"How would you define attitudes toward collaboration and learning?","Scale_5_text":"High trust, curiosity, reflexivity; willingness to learn and adapt.","Scale_1_text":"Low trust; resistance to change or external collaboration."},
+  {"Dimension of openness":"OPEN MIND","Variable":"OM2","Questions":"How would you define the culture of feedback?","Scale_5_text":"Constructive feedback loops are institutionalized.","Scale_1_text":"Feedback is sporadic, defensive, or discouraged."}
+]
+APERTO_COLS = ["Dimension of openness","Variable","Questions","Scale_5_text","Scale_1_text"]
@@ -0,0 +1,287 @@
+"""Mode B 2-axis matrix questionnaire: options, compiled lookups and batch scoring.
+
+Each question maps option text to a 1–3 value. ``compile_codebook`` turns
+those dicts into integer option codes and one ``(questions, options + 1)``
+value table whose last column is NaN, so a whole file of answers is scored
+with ``pd.Categorical`` coding, one fancy-indexing lookup and one matrix
+product per chunk instead of a dict lookup per radio button. pandas is
+only imported by the batch helpers.
+"""
+import os
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+
+# =============================================================================
+# Questionnaire (X = level of openness, per dimension)
+# =============================================================================
+Q_ENGAGEMENT = [
+    ("How many distinct sectors actively participated in the project network?", {
+        "5 or more sectors": 3, "4 sectors": 2.5, "3 sectors": 2, "2 sectors": 1.5, "1 or none": 1
+    }),
+    ("How many actors were actively involved in the project?", {
+        "More than 5 actors": 3, "4 actors": 2.5, "3 actors": 2, "2 actors": 1.5, "1 actor or none": 1
+    }),
+    ("How would you describe the project governance?", {
+        "Clear and effective governance": 3, "Mostly effective governance": 2.5,
+        "Moderate, with issues": 2, "Unclear or weak": 1.5, "No governance": 1
+    }),
+    ("How well were ideas listened to among actors?", {
+        "Consistent active listening": 3, "Good listening capacity": 2.5,
+        "Moderate": 2, "Limited": 1.5, "No listening": 1
+    }),
+    ("How did the project adapt to changes?", {
+        "High adaptability": 3, "Good adaptation": 2.5, "Moderate": 2, "Limited": 1.5, "None": 1
+    }),
+    ("How did the project respond to unexpected challenges?", {
+        "Immediate and effective response": 3, "Generally fast": 2.5,
+        "Moderate": 2, "Slow and not effective": 1.5, "No response": 1
+    }),
+]
+Q_APPLICATION = [
+    ("How accessible is the generated knowledge?", {
+        "Free and unrestricted": 3, "Mostly free": 2.5, "With significant restrictions": 2,
+        "Only with specific permissions": 1.5, "Closed": 1
+    }),
+    ("Is the use, modification or redistribution allowed and facilitated?", {
+        "No restrictions": 3, "Minor restrictions": 2.5, "Significant restrictions": 2,
+        "Use only, no modification": 1.5, "Not allowed": 1
+    }),
+    ("How did actors participate in the solution design?", {
+        "Participation in all stages": 3, "Frequent, structured participation": 2.5,
+        "Moderate with partial structure": 2, "Minimal with weak structure": 1.5, "No participation": 1
+    }),
+]
+Q_INFRA = [
+    ("What level of trust and transparency existed among partners?", {
+        "High trust and clear transparency": 3, "Generally good": 2.5,
+        "Moderate": 2, "Low trust or opaque": 1.5, "No trust/opaque": 1
+    }),
+    ("How would you describe shared resources, rules, and tools?", {
+        "Shared; explicit rules; common toolset": 3, "Mostly shared; some explicit rules": 2.5,
+        "Partially shared": 2, "Sparsely shared; weak rules": 1.5, "No shared resources/rules": 1
+    }),
+    ("How would you describe the coordination mechanisms?", {
+        "Formalized and effective": 3, "Mostly formalized": 2.5,
+        "Moderate": 2, "Sparsely formalized": 1.5, "No formal coordination": 1
+    }),
+]
+Q_RESEARCH = [
+    ("How structured was participation in the research process?", {
+        "Broad and structured": 3, "Structured but not constant": 2.5,
+        "Moderate": 2, "Limited": 1.5, "None": 1
+    }),
+    ("How were contributions recognized in the research process?", {
+        "Formal and explicit recognition": 3, "Present but not systematic": 2.5,
+        "Occasional": 2, "Minimal": 1.5, "No recognition": 1
+    }),
+    ("Was there a clear strategy for open research?", {
+        "Fully defined and implemented": 3, "Mostly defined": 2.5,
+        "Partially developed": 2, "Weak strategy": 1.5, "No strategy": 1
+    }),
+]
+
+# Y = regulation (1) vs. autonomy (3), one per dimension
+STRUCTURE_OPTIONS = {
+    "Rules and decisions were imposed by external or hierarchical actors": 1,
+    "It was a mix between external rules and self-coordination mechanisms": 2,
+    "The structure was generated autonomously by the involved actors": 3,
+}
+
+# (short name, section title, questions, app widget key prefix)
+MATRIX_DIMENSIONS = [
+    ("Engagement",  "1. Open Engagement",                  Q_ENGAGEMENT,  "B_collab"),
+    ("Application", "2. Open Application & Adaptation",    Q_APPLICATION, "B_app"),
+    ("Interaction", "3. Open Interaction Infrastructure",  Q_INFRA,       "B_infra"),
+    ("Research",    "4. Open Research",                    Q_RESEARCH,    "B_research"),
+]
+
+X_COL, Y_COL = "X_LevelOpenness(1-3)", "Y_Regulation→Autonomy(1-3)"
+BANDS = np.array(["Closed", "Low", "Medium", "High", "N/A"], dtype=object)
+BAND_EDGES = np.array([1.5, 2.0, 2.5])
+MATRIX_TABLES = ("matrix", "answers")
+
+def interpret_band(x: float):
+    if x >= 2.5: return "High"
+    elif x >= 2.0: return "Medium"
+    elif x >= 1.5: return "Low"
+    else: return "Closed"
+
+def band_array(x):
+    """``interpret_band`` over an array; NaN (nothing answered) gives "N/A"."""
+    x = np.asarray(x, dtype=float)
+    codes = np.searchsorted(BAND_EDGES, x, side="right")
+    return BANDS[np.where(np.isnan(x), len(BANDS) - 1, codes)]
+
+# =============================================================================
+# Compiled codebook
+# =============================================================================
+@dataclass(eq=False)
+class Codebook:
+    """Integer-coded view of the questionnaire.
+
+    ``columns`` are the answer columns expected in a file (``Engagement_Q1`` …
+    ``Engagement_Structure``, the same keys the app saves), ``options[i]``
+    the option labels of column ``i`` in code order and ``values[i, code]``
+    their score; ``values[i, -1]`` is NaN for unknown/missing answers.
+    """
+    dimensions: list
+    columns: list
+    options: list
+    values: np.ndarray                      # (n_columns, max_options + 1), NaN padded
+    x_indicator: np.ndarray                 # (n_columns, n_dimensions) 0/1, X questions only
+    y_column: np.ndarray                    # (n_dimensions,) column index of each Structure answer
+    lookup: list = field(default_factory=list)   # per column: option label or value -> code
+
+    def _code(self, i, answer):
+        if isinstance(answer, str):
+            answer = answer.strip()
+            if answer in self.lookup[i]:
+                return self.lookup[i][answer]
+        try:
+            return self.lookup[i].get(float(answer), -1)
+        except (TypeError, ValueError):
+            return -1
+
+    def encode(self, chunk):
+        """``(rows, n_columns)`` int codes; -1 for blank or unknown answers.
+
+        Text answers are matched to option labels, numeric answers (or their
+        string form, e.g. ``"2.5"``) to option values. Only the distinct
+        answers of a column are looked up; rows are mapped through
+        ``pd.factorize`` codes.
+        """
+        import pandas as pd
+        codes = np.empty((len(chunk), len(self.columns)), dtype=np.int16)
+        for i, col in enumerate(self.columns):
+            inverse, uniques = pd.factorize(chunk[col])
+            lut = np.array([self._code(i, u) for u in uniques] + [-1], dtype=np.int16)
+            codes[:, i] = lut[inverse]          # NaN -> -1 -> last entry
+        return codes
+
+    @cached_property
+    def stored_values(self):
+        """``values`` shifted one column right: index 0 is NaN, option ``k`` is at ``k + 1``.
+
+        The layout of archived ``uint8`` codes (see ``openness.columnar``).
+        """
+        return np.concatenate([self.values[:, -1:], self.values[:, :-1]], axis=1)
+
+    def score(self, codes):
+        """``(answers, x, y)``: per-question values, X means (2 decimals) and Y.
+
+        ``codes`` come from ``encode`` (-1 = unanswered) or, as ``uint8``,
+        straight from an archive (0 = unanswered); either indexes its value
+        table as is.
+        """
+        table = self.stored_values if codes.dtype == np.uint8 else self.values
+        answers = table[np.arange(len(self.columns)), codes]   # unanswered -> NaN column
+        answered = ~np.isnan(answers)
+        sums = np.where(answered, answers, 0.0) @ self.x_indicator
+        counts = answered.astype(float) @ self.x_indicator
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x = np.where(counts > 0, sums / counts, np.nan).round(2)
+        return answers, x, answers[:, self.y_column]
+
+def compile_codebook(dimensions=MATRIX_DIMENSIONS) -> Codebook:
+    names = [d[0] for d in dimensions]
+    columns, options, values, x_dim, y_column = [], [], [], [], []
+    for j, (name, _title, questions, _key) in enumerate(dimensions):
+        for i, (_q, opts) in enumerate(questions):
+            columns.append(f"{name}_Q{i+1}"); x_dim.append(j)
+            options.append(list(opts)); values.append([float(v) for v in opts.values()])
+        y_column.append(len(columns))
+        columns.append(f"{name}_Structure"); x_dim.append(-1)
+        options.append(list(STRUCTURE_OPTIONS)); values.append([float(v) for v in STRUCTURE_OPTIONS.values()])
+
+    return assemble_codebook(names, columns, options, values, x_dim, y_column)
+
+def assemble_codebook(names, columns, options, values, x_dim, y_column) -> Codebook:
+    """``Codebook`` from flat per-column lists (``x_dim`` is -1 for Structure columns)."""
+    table = np.full((len(columns), max(len(v) for v in values) + 1), np.nan)
+    indicator = np.zeros((len(columns), len(names)))
+    lookup = []
+    for i, v in enumerate(values):
+        table[i, :len(v)] = v
+        if x_dim[i] >= 0:
+            indicator[i, x_dim[i]] = 1.0
+        lookup.append({**{val: code for code, val in enumerate(v)}, **{o: code for code, o in enumerate(options[i])}})
+    return Codebook(names, columns, options, table, indicator, np.array(y_column), lookup)
+
+CODEBOOK = compile_codebook()
+
+# =============================================================================
+# Batch scoring
+# =============================================================================
+def chunk_tables(ids, chunk, codebook=CODEBOOK):
+    """Long ``matrix`` table (one row per respondent × dimension) and wide ``answers``.
+
+    ``chunk`` is a DataFrame of answers or a ``uint8`` code array from an archive.
+    """
+    import pandas as pd
+    if isinstance(chunk, np.ndarray):
+        codes = chunk
+    else:
+        missing = [c for c in codebook.columns if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing answer columns: {', '.join(missing)}")
+        codes = codebook.encode(chunk)
+    answers, x, y = codebook.score(codes)
+    n, n_dim = x.shape
+    matrix = pd.DataFrame({
+        "Respondent": np.repeat(ids, n_dim),
+        "Dimension": np.tile(np.array(codebook.dimensions, dtype=object), n),
+        X_COL: x.ravel(),
+        Y_COL: y.ravel(),
+        "Band": band_array(x.ravel()),
+    })
+    wide = pd.DataFrame(answers, columns=codebook.columns)
+    wide.insert(0, "Respondent", ids)
+    return {"matrix": matrix, "answers": wide}
+
+def iter_matrix_chunks(path, chunk_size=10_000, id_column=None, sheet=None, codebook=CODEBOOK):
+    """Yield ``(ids, chunk)``: answer DataFrames, or ``uint8`` code views for an archive.
+
+    Archives (``.opn``) carry their own ids, so ``id_column`` only applies to CSV/XLSX.
+    """
+    from .batch import iter_csv, iter_xlsx
+    from .columnar import is_archive, open_archive
+    if is_archive(path):
+        archive = open_archive(path)
+        archive.check_codebook(codebook)
+        yield from archive.iter_chunks(chunk_size)
+        return
+    usecols = set(codebook.columns) | ({id_column} if id_column else set())
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        chunks = iter_xlsx(path, chunk_size, usecols, sheet)
+    else:
+        chunks = iter_csv(path, chunk_size, lambda c: str(c).strip() in usecols)
+    offset = 0
+    for chunk in chunks:
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        if id_column and id_column not in chunk.columns:
+            raise ValueError(f"Id column {id_column!r} not found.")
+        ids = chunk[id_column].to_numpy() if id_column else np.arange(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield ids, chunk
+
+def score_matrix_file(path, out_dir, fmt="csv", chunk_size=10_000, id_column=None,
+                      tables=MATRIX_TABLES, sheet=None, prefix="openness", codebook=CODEBOOK):
+    """Score a Mode B answer file chunk by chunk; returns ``{table: output path}`` and row count."""
+    from .batch import open_sink
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {t: os.path.join(out_dir, f"{prefix}_{t}.{fmt}") for t in tables}
+    sinks = {t: open_sink(p, fmt) for t, p in paths.items()}
+    n_rows = 0
+    try:
+        for ids, chunk in iter_matrix_chunks(path, chunk_size, id_column, sheet, codebook):
+            out = chunk_tables(ids, chunk, codebook)
+            for t, sink in sinks.items():
+                sink.write(out[t])
+            n_rows += len(chunk)
+    finally:
+        for sink in sinks.values():
+            sink.close()
+    return paths, n_rows
@@ -0,0 +1,151 @@
+"""Memoized, dependency-tracked results pipeline for one Mode A assessment.
+
+Stages form a small graph: ``answers → scores → means → classes →
+dimensions_df → recommendations / cards / chart``. Every node carries a
+version that increases only when its value actually changes; a stage is
+recomputed only when the version of something it reads has moved, and a
+recomputed stage that produces an equal value keeps its version, so
+nothing downstream runs either (e.g. a threshold nudge that moves no
+dimension across a class boundary stops at ``classes``). A chart-width
+change therefore re-renders the chart only, and a threshold change never
+rebuilds ``variables_df``.
+
+Nothing here imports Streamlit: the app keeps one ``Pipeline`` per session
+and supplies the chart renderer.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .timing import span
+
+_MISSING = object()
+
+def same(a, b) -> bool:
+    """Value equality across the types stages pass around (DataFrames, arrays, scalars, dicts)."""
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if hasattr(a, "equals"):                       # pandas objects
+        return bool(a.equals(b))
+    if isinstance(a, np.ndarray):
+        if a.shape != b.shape:
+            return False
+        try:
+            return bool(np.array_equal(a, b, equal_nan=True))
+        except TypeError:                          # object arrays cannot compare NaN
+            return bool(np.array_equal(a, b))
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+@dataclass(eq=False)
+class Node:
+    name: str
+    deps: tuple = ()
+    fn: object = None                  # None for inputs
+    span: str = None                   # timing stage name (default: the node name)
+    value: object = _MISSING
+    version: int = 0
+    seen: tuple = None                 # dependency versions the value was computed from
+    runs: int = 0
+
+class Pipeline:
+    """Inputs and stages by name; ``get`` computes what is stale and memoizes the rest."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.computed = []             # stages recomputed since the last ``set_inputs``
+
+    def input(self, name):
+        self.nodes[name] = Node(name)
+        return self
+
+    def stage(self, name, deps, fn, span_name=None):
+        missing = [d for d in deps if d not in self.nodes]
+        if missing:
+            raise KeyError(f"Stage {name!r} depends on unknown node(s): {', '.join(missing)}")
+        self.nodes[name] = Node(name, tuple(deps), fn, span_name or name)
+        return self
+
+    def set(self, name, value):
+        node = self.nodes[name]
+        if node.fn is not None:
+            raise ValueError(f"{name!r} is a stage, not an input.")
+        if node.value is _MISSING or not same(node.value, value):
+            node.value, node.version = value, node.version + 1
+
+    def set_inputs(self, **values):
+        self.computed = []
+        for name, value in values.items():
+            self.set(name, value)
+
+    def get(self, name):
+        node = self.nodes[name]
+        if node.fn is None:
+            if node.value is _MISSING:
+                raise KeyError(f"Input {name!r} has not been set.")
+            return node.value
+        args = [self.get(d) for d in node.deps]
+        seen = tuple(self.nodes[d].version for d in node.deps)
+        if seen != node.seen:
+            with span(node.span):
+                value = node.fn(*args)
+            node.seen, node.runs = seen, node.runs + 1
+            self.computed.append(name)
+            if node.value is _MISSING or not same(node.value, value):
+                node.value, node.version = value, node.version + 1
+        return node.value
+
+    def version(self, name) -> int:
+        """Current version of ``name`` (0 before its first value), e.g. to tag derived downloads."""
+        return self.nodes[name].version
+
+    def stats(self):
+        """``{stage: times computed}`` over the pipeline's lifetime."""
+        return {n.name: n.runs for n in self.nodes.values() if n.fn is not None}
+
+# =============================================================================
+# Mode A results
+# =============================================================================
+MODE_A_INPUTS = ("instrument", "answers", "low_max", "med_max", "chart_type", "chart_px", "chart_backend")
+
+def mode_a_pipeline(render_chart=None) -> Pipeline:
+    """Stages of the Mode A results section.
+
+    ``render_chart(dimensions_df, chart_type, chart_px, backend)`` returns
+    the chart (PNG bytes, or SVG text for ``backend="svg"``); by default
+    ``charts.render_chart_png`` / ``render_chart_svg``.
+    """
+    from .recommendations import recommendations_frame
+    from .scoring import CLASSES, classify_array, dimension_means, dimensions_frame, variables_frame
+
+    if render_chart is None:
+        def render_chart(dimensions_df, chart_type, chart_px, backend):
+            from .charts import render_chart_png, render_chart_svg
+            if backend == "svg":
+                return render_chart_svg(dimensions_df, chart_type, size_px=chart_px)
+            return render_chart_png(dimensions_df, chart_type, chart_px, backend=backend)
+
+    p = Pipeline()
+    for name in MODE_A_INPUTS:
+        p.input(name)
+    p.stage("variables_df", ("instrument", "answers"),
+            lambda inst, answers: variables_frame(answers, inst.items), "dataframes")
+    p.stage("scores", ("instrument", "answers"),
+            lambda inst, answers: np.array([[answers.get(v, np.nan) for v in inst.variables]], dtype=float),
+            "dataframes")
+    p.stage("means", ("instrument", "scores"), lambda inst, scores: dimension_means(scores, inst.indicator), "scoring")
+    p.stage("classes", ("means", "low_max", "med_max"),
+            lambda means, lo, hi: CLASSES[classify_array(means, lo, hi)], "classification")
+    p.stage("dimensions_df", ("instrument", "means", "classes"),
+            lambda inst, means, classes: dimensions_frame(means[0], classes[0], inst.dimensions, inst.n_variables),
+            "dataframes")
+    p.stage("recommendations_df", ("instrument", "dimensions_df"),
+            lambda inst, df: recommendations_frame(df, inst.recommendations), "recommendations")
+    p.stage("cards", ("instrument", "recommendations_df"),
+            lambda inst, recs: "".join(inst.recommendations.cards(recs["Dimension"], recs["Classification"])), "cards")
+    p.stage("chart", ("dimensions_df", "chart_type", "chart_px", "chart_backend"), render_chart, "chart")
+    return p
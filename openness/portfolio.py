@@ -0,0 +1,160 @@
+"""Incremental portfolio aggregates over stored assessments.
+
+For every (mode, region, month, dimension) cell the store keeps running
+count / sum / sum of squares, class counts and a fixed-bin histogram sketch
+of the dimension means. Cells are updated in the same transaction that
+inserts a batch of assessments, so a dashboard query only merges the
+matching cells (a few hundred rows) instead of rescanning every response.
+
+Scores are bounded (1–5 in Mode A, 1–3 in Mode B), so a 0.01-wide
+histogram gives quantiles within one bin of the exact value and merges by
+plain addition.
+"""
+import json
+from collections import defaultdict
+
+import numpy as np
+
+SKETCH_LO, SKETCH_HI, SKETCH_BINS = 1.0, 5.0, 400
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+AGGREGATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS portfolio_aggregates (
+    mode       TEXT NOT NULL,
+    region     TEXT NOT NULL,             -- '' when not given
+    period     TEXT NOT NULL,             -- 'YYYY-MM' of created_at (UTC)
+    dimension  TEXT NOT NULL,
+    n          INTEGER NOT NULL,          -- assessments with a numeric mean
+    total      REAL NOT NULL,
+    total_sq   REAL NOT NULL,
+    classes    TEXT NOT NULL,             -- JSON {class: count}, all assessments
+    sketch     BLOB NOT NULL,             -- uint32[SKETCH_BINS] histogram of means
+    PRIMARY KEY (mode, region, period, dimension)
+);
+"""
+
+# =============================================================================
+# Histogram sketch
+# =============================================================================
+def sketch_new():
+    return np.zeros(SKETCH_BINS, dtype=np.uint32)
+
+def sketch_add(sketch, values):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    idx = np.clip(((values - SKETCH_LO) / (SKETCH_HI - SKETCH_LO) * SKETCH_BINS).astype(int), 0, SKETCH_BINS - 1)
+    np.add.at(sketch, idx, 1)
+    return sketch
+
+def sketch_quantiles(sketch, qs=QUANTILES):
+    """Quantiles from a histogram, interpolating linearly inside the bin."""
+    total = int(sketch.sum())
+    if total == 0:
+        return [np.nan] * len(qs)
+    cum = np.cumsum(sketch, dtype=np.int64)
+    width = (SKETCH_HI - SKETCH_LO) / SKETCH_BINS
+    out = []
+    for q in qs:
+        target = q * total
+        b = int(np.searchsorted(cum, target, side="left"))
+        b = min(b, SKETCH_BINS - 1)
+        below = cum[b - 1] if b else 0
+        frac = (target - below) / sketch[b] if sketch[b] else 0.0
+        out.append(SKETCH_LO + (b + frac) * width)
+    return out
+
+# =============================================================================
+# Incremental update (called by the store inside its insert transaction)
+# =============================================================================
+def period_of(created_at: str) -> str:
+    return str(created_at)[:7]
+
+def update_aggregates(conn, records):
+    """Fold a batch of store records into ``portfolio_aggregates``."""
+    cells = defaultdict(lambda: {"values": [], "classes": defaultdict(int)})
+    for rec in records:
+        region, period = rec.get("region") or "", period_of(rec["created_at"])
+        for dim, mean, cls, _y in rec["dimensions"]:
+            cell = cells[(rec["mode"], region, period, dim)]
+            if mean is not None and not np.isnan(mean):
+                cell["values"].append(mean)
+            cell["classes"][cls or "N/A"] += 1
+
+    for key, cell in cells.items():
+        row = conn.execute(
+            "SELECT n, total, total_sq, classes, sketch FROM portfolio_aggregates "
+            "WHERE mode=? AND region=? AND period=? AND dimension=?", key).fetchone()
+        if row:
+            n, total, total_sq = row[0], row[1], row[2]
+            classes, sketch = json.loads(row[3]), np.frombuffer(row[4], dtype=np.uint32).copy()
+        else:
+            n, total, total_sq, classes, sketch = 0, 0.0, 0.0, {}, sketch_new()
+        v = np.asarray(cell["values"], dtype=float)
+        n += len(v); total += float(v.sum()); total_sq += float((v * v).sum())
+        for c, k in cell["classes"].items():
+            classes[c] = classes.get(c, 0) + k
+        sketch_add(sketch, v)
+        conn.execute(
+            "INSERT OR REPLACE INTO portfolio_aggregates "
+            "(mode, region, period, dimension, n, total, total_sq, classes, sketch) VALUES (?,?,?,?,?,?,?,?,?)",
+            (*key, n, total, total_sq, json.dumps(classes), sketch.tobytes()))
+
+def rebuild_aggregates(conn):
+    """Recompute every cell from the stored assessments (one-off, e.g. for an older DB)."""
+    conn.execute("DELETE FROM portfolio_aggregates")
+    recs = {}
+    for aid, mode, created_at, region in conn.execute("SELECT id, mode, created_at, region FROM assessments"):
+        recs[aid] = {"mode": mode, "created_at": created_at, "region": region, "dimensions": []}
+    for aid, dim, mean, cls, y in conn.execute(
+            "SELECT assessment_id, dimension, mean_score, classification, y_score FROM dimension_scores"):
+        if aid in recs:
+            recs[aid]["dimensions"].append((dim, mean, cls, y))
+    update_aggregates(conn, recs.values())
+
+# =============================================================================
+# Dashboard query
+# =============================================================================
+def portfolio_summary(store, mode="A", region=None, since=None, until=None, qs=QUANTILES):
+    """Per-dimension mean, spread, quantiles and class distribution.
+
+    ``region=None`` means all regions; ``since``/``until`` are inclusive
+    'YYYY-MM' periods.
+    """
+    import pandas as pd
+    where, params = ["mode = ?"], [mode]
+    if region is not None: where.append("region = ?"); params.append(region)
+    if since: where.append("period >= ?"); params.append(str(since)[:7])
+    if until: where.append("period <= ?"); params.append(str(until)[:7])
+    rows = store.aggregate_rows(
+        "SELECT dimension, n, total, total_sq, classes, sketch FROM portfolio_aggregates "
+        f"WHERE {' AND '.join(where)} ORDER BY rowid", params)
+
+    merged = {}
+    for dim, n, total, total_sq, classes, sketch in rows:
+        m = merged.setdefault(dim, {"n": 0, "total": 0.0, "total_sq": 0.0, "classes": defaultdict(int), "sketch": sketch_new()})
+        m["n"] += n; m["total"] += total; m["total_sq"] += total_sq
+        for c, k in json.loads(classes).items():
+            m["classes"][c] += k
+        m["sketch"] += np.frombuffer(sketch, dtype=np.uint32)
+
+    out = []
+    for dim, m in merged.items():
+        n = m["n"]
+        mean = m["total"] / n if n else np.nan
+        var = max(m["total_sq"] / n - mean * mean, 0.0) if n else np.nan
+        n_all = sum(m["classes"].values())
+        row = {"Dimension": dim, "n": n, "MeanScore": round(mean, 3), "Std": round(float(np.sqrt(var)), 3)}
+        row.update({f"P{int(q * 100)}": round(v, 2) for q, v in zip(qs, sketch_quantiles(m["sketch"], qs))})
+        for c in ("Low", "Medium", "High", "N/A", "Closed"):
+            if c in m["classes"] or c in ("Low", "Medium", "High"):
+                row[f"{c} %"] = round(100.0 * m["classes"].get(c, 0) / n_all, 1) if n_all else 0.0
+        out.append(row)
+    return pd.DataFrame(out)
+
+def portfolio_filters(store, mode="A"):
+    """Regions and periods present in the aggregates, for dashboard selectors."""
+    regions = [r for (r,) in store.aggregate_rows(
+        "SELECT DISTINCT region FROM portfolio_aggregates WHERE mode = ? ORDER BY region", [mode])]
+    periods = [p for (p,) in store.aggregate_rows(
+        "SELECT DISTINCT period FROM portfolio_aggregates WHERE mode = ? ORDER BY period", [mode])]
+    return regions, periods
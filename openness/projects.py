@@ -0,0 +1,225 @@
+"""Multi-respondent projects: pooled dimension scores, bootstrap intervals and inter-rater spread.
+
+Each respondent is scored as usual (``dimension_means``); a project's score
+is the mean over its respondents. Respondents are kept as one ragged array,
+grouped by project, so per-project reductions are ``np.add.reduceat`` over
+row segments. A bootstrap resample is a vector of respondent draw counts:
+projects with the same number of respondents are resampled together with
+one ``bincount`` and reduced with one batched matrix product, in chunks of
+projects × resamples so memory stays bounded. The cost follows the total
+number of respondents, not the size of the largest project.
+"""
+import numpy as np
+
+from .registry import EMBEDDED
+from .scoring import CLASSES, classify_array, dimension_means
+
+N_RESAMPLES = 1000
+CI_LEVEL = 0.95
+SCALE_POINTS = 5
+UNIFORM_VAR = (SCALE_POINTS ** 2 - 1) / 12.0    # r_wg null: every answer equally likely
+MAX_CELLS = 8_000_000                            # resample cells per chunk (projects × resamples × respondents)
+PROJECT_COLUMNS = ["Project", "Dimension", "n_Respondents", "MeanScore", "CI_low", "CI_high",
+                   "SD", "Range", "Agreement", "Classification", "ClassStable"]
+
+# =============================================================================
+# Packing
+# =============================================================================
+def pack_projects(means, projects):
+    """``(names, values, counts)`` from per-respondent dimension means.
+
+    ``means`` is ``(n_respondents, n_dimensions)``, ``projects`` one label per
+    respondent. ``values`` holds the same rows grouped by project (projects
+    in first-appearance order, respondents in input order); project ``i``
+    owns the ``counts[i]`` rows after ``counts[:i].sum()``. A respondent
+    without a project is a ``ValueError``.
+    """
+    import pandas as pd
+    means = np.atleast_2d(np.asarray(means, dtype=float))
+    codes, names = pd.factorize(np.asarray(projects, dtype=object))
+    if (codes < 0).any():
+        missing = np.flatnonzero(codes < 0)
+        raise ValueError(f"{len(missing)} respondent(s) have no project (first: respondent {missing[0] + 1}).")
+    counts = np.bincount(codes, minlength=len(names))
+    return list(names), means[np.argsort(codes, kind="stable")], counts
+
+def project_labels(ids, column="Project", offset=0):
+    """Project ids as strings, so ``1`` and ``'1'`` from differently typed chunks are one project.
+
+    A missing id is a ``ValueError`` naming ``column`` and the row
+    (1-based, counting from ``offset``).
+    """
+    import pandas as pd
+    ids = np.asarray(ids, dtype=object)
+    missing = pd.isna(ids)
+    if missing.any():
+        raise ValueError(f"Project column {column!r} is empty in data row {offset + np.flatnonzero(missing)[0] + 1}.")
+    return ids.astype(str).astype(object)
+
+def _starts(counts):
+    return np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.intp)
+
+def _segment_sums(values, counts):
+    """Per-project ``(answered, sum)`` counts over the grouped rows, ``(n_projects, n_dimensions)``."""
+    answered = ~np.isnan(values)
+    if not len(counts):
+        empty = np.zeros((0, values.shape[1]))
+        return empty, empty
+    starts = _starts(counts)
+    return (np.add.reduceat(answered.astype(float), starts, axis=0),
+            np.add.reduceat(np.where(answered, values, 0.0), starts, axis=0))
+
+# =============================================================================
+# Statistics
+# =============================================================================
+def _sorted_quantiles(sorted_vals, n_valid, qs):
+    """Linear-interpolated quantiles along axis 1 of an array sorted with NaN last."""
+    out = []
+    for q in qs:
+        pos = q * np.maximum(n_valid - 1, 0)
+        i0 = np.floor(pos).astype(np.intp)
+        i1 = np.minimum(i0 + 1, np.maximum(n_valid - 1, 0))
+        v0 = np.take_along_axis(sorted_vals, i0[:, None, :], axis=1)[:, 0]
+        v1 = np.take_along_axis(sorted_vals, i1[:, None, :], axis=1)[:, 0]
+        out.append(np.where(n_valid > 0, v0 + (pos - i0) * (v1 - v0), np.nan))
+    return out
+
+def bootstrap_ci(values, counts, n_resamples=N_RESAMPLES, level=CI_LEVEL, seed=None, max_cells=MAX_CELLS):
+    """Percentile bootstrap interval of each project's mean over respondents.
+
+    ``values``/``counts`` as from ``pack_projects``. Returns ``(lo, hi)``,
+    both ``(n_projects, n_dimensions)``; NaN where fewer than two
+    respondents answered the dimension. A resample mean only counts
+    respondents who answered it.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    counts = np.asarray(counts, dtype=np.intp)
+    n_dim = values.shape[1]
+    rng = np.random.default_rng(seed)
+    B = int(n_resamples)
+    lo = np.full((len(counts), n_dim), np.nan)
+    hi = np.full((len(counts), n_dim), np.nan)
+    alpha = (1.0 - level) / 2
+    starts = _starts(counts)
+    for n in np.unique(counts[counts >= 2]):            # one bucket per respondent count
+        n = int(n)
+        bucket = np.flatnonzero(counts == n)
+        rows = values[starts[bucket][:, None] + np.arange(n)]   # (K, n, D)
+        width = max(n, n_dim)
+        step = max(1, int(max_cells) // (B * width))
+        for k0 in range(0, len(bucket), step):
+            x = rows[k0:k0 + step]
+            P = len(x)
+            answered = ~np.isnan(x)
+            x0, af = np.where(answered, x, 0.0), answered.astype(float)
+            boot = np.empty((P, B, n_dim))
+            b_step = max(1, int(max_cells) // (P * width))   # a single large project is split by resamples
+            for b0 in range(0, B, b_step):
+                Bc = min(b_step, B - b0)
+                # draw n respondents with replacement per (project, resample)
+                idx = (rng.random((P * Bc, n)) * n).astype(np.intp)
+                cell = np.arange(P * Bc)[:, None] * n + idx
+                w = np.bincount(cell.ravel(), minlength=P * Bc * n).reshape(P, Bc, n).astype(float)
+                sums, dens = w @ x0, w @ af                      # (P, Bc, D)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    boot[:, b0:b0 + Bc] = np.where(dens > 0, sums / dens, np.nan)
+            boot.sort(axis=1)                                   # NaN last
+            q_lo, q_hi = _sorted_quantiles(boot, (~np.isnan(boot)).sum(axis=1), (alpha, 1.0 - alpha))
+            multi = answered.sum(axis=1) >= 2                  # (P, D): an interval needs two answers
+            sel = bucket[k0:k0 + P]
+            lo[sel] = np.where(multi, q_lo, np.nan)
+            hi[sel] = np.where(multi, q_hi, np.nan)
+    return lo, hi
+
+def rater_spread(values, counts):
+    """``(sd, range, agreement)`` across each project's respondents, ``(n_projects, n_dimensions)``.
+
+    ``agreement`` is r_wg = 1 − s² / σ²_uniform (1 = all respondents agree,
+    0 = no more agreement than random answers), clipped to [0, 1]. All three
+    are NaN with fewer than two answering respondents.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    counts = np.asarray(counts, dtype=np.intp)
+    k, total = _segment_sums(values, counts)
+    if not len(counts):
+        return k, k, k
+    starts = _starts(counts)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    missing = np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / k
+        dev = np.where(missing, 0.0, (values - mean[owner]) ** 2)
+        var = np.add.reduceat(dev, starts, axis=0) / (k - 1)
+        sd = np.where(k >= 2, np.sqrt(var), np.nan)
+        filled_hi = np.maximum.reduceat(np.where(missing, -np.inf, values), starts, axis=0)
+        filled_lo = np.minimum.reduceat(np.where(missing, np.inf, values), starts, axis=0)
+        rng = np.where(k >= 2, filled_hi - filled_lo, np.nan)
+        agreement = np.where(k >= 2, np.clip(1.0 - var / UNIFORM_VAR, 0.0, 1.0), np.nan)
+    return sd, rng, agreement
+
+# =============================================================================
+# Tables
+# =============================================================================
+def score_projects(means, projects, dimensions=None, low_max=2.5, med_max=3.5, n_resamples=N_RESAMPLES,
+                   level=CI_LEVEL, seed=None, decimals=3):
+    """Long project table (``PROJECT_COLUMNS``), one row per project × dimension.
+
+    ``ClassStable`` is True when both interval ends fall in the same class as
+    the pooled mean.
+    """
+    import pandas as pd
+    names, values, counts = pack_projects(means, projects)
+    n_dim = values.shape[1]
+    dimensions = list(dimensions) if dimensions is not None else [f"D{j + 1}" for j in range(n_dim)]
+    k, total = _segment_sums(values, counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pooled = np.where(k > 0, total / k, np.nan)
+    k = k.astype(np.intp)
+    lo, hi = bootstrap_ci(values, counts, n_resamples, level, seed)
+    sd, rng, agreement = rater_spread(values, counts)
+    codes = classify_array(pooled.round(decimals), low_max, med_max)
+    stable = (classify_array(lo, low_max, med_max) == codes) & (classify_array(hi, low_max, med_max) == codes)
+    rnd = lambda a: a.round(decimals).ravel()
+    return pd.DataFrame({
+        "Project": np.repeat(np.array(names, dtype=object), n_dim),
+        "Dimension": np.tile(np.array(dimensions, dtype=object), len(names)),
+        "n_Respondents": k.ravel(),
+        "MeanScore": rnd(pooled), "CI_low": rnd(lo), "CI_high": rnd(hi),
+        "SD": rnd(sd), "Range": rnd(rng), "Agreement": rnd(agreement),
+        "Classification": CLASSES[codes.ravel()],
+        "ClassStable": np.where(np.isnan(lo) | np.isnan(hi), False, stable).ravel(),
+    }, columns=PROJECT_COLUMNS)
+
+def score_project_responses(scores, projects, low_max=2.5, med_max=3.5, instrument=EMBEDDED, **kwargs):
+    """``score_projects`` straight from a ``(respondents, variables)`` answer matrix."""
+    means = dimension_means(scores, instrument.indicator, decimals=None)
+    return score_projects(means, projects, instrument.dimensions, low_max, med_max, **kwargs)
+
+def score_projects_file(path, out_path, fmt=None, project_column="Project", low_max=2.5, med_max=3.5,
+                        n_resamples=N_RESAMPLES, level=CI_LEVEL, seed=None, chunk_size=10_000, sheet=None,
+                        instrument=EMBEDDED):
+    """Score a Mode A response file with a project column; returns ``(out_path, n_projects, n_respondents)``.
+
+    Responses are read in chunks and reduced to per-respondent dimension
+    means (a few floats per row) before the project bootstrap. Project ids
+    are compared as strings (``project_labels``); an empty project cell is a
+    ``ValueError``.
+    """
+    import os
+    from .batch import iter_responses, open_sink
+    fmt = (fmt or os.path.splitext(str(out_path))[1].lstrip(".") or "csv").lower()
+    means, projects, n = [], [], 0
+    for ids, scores in iter_responses(path, chunk_size, id_column=project_column, sheet=sheet, instrument=instrument):
+        means.append(dimension_means(scores, instrument.indicator, decimals=None))
+        projects.append(project_labels(ids, project_column, n))
+        n += len(ids)
+    if not means:
+        raise ValueError(f"No responses in {path!r}.")
+    table = score_projects(np.concatenate(means), np.concatenate(projects), instrument.dimensions, low_max, med_max,
+                           n_resamples, level, seed)
+    sink = open_sink(out_path, fmt)
+    try:
+        sink.write(table)
+    finally:
+        sink.close()
+    return out_path, table["Project"].nunique(), sum(len(p) for p in projects)
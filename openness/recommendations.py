@@ -0,0 +1,185 @@
+"""Recommendation texts per dimension and openness level."""
+import html
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+# =============================================================================
+# RECOMMENDATIONS (per dimension & level)
+# =============================================================================
+RECS = {
+    "OPEN NETWORK": {
+        "Low":   "Map missing stakeholders beyond recurrent partners; publish open onboarding (MoUs, light-weight entry rules) and rotate facilitation to avoid centralization.",
+        "Medium":"Consolidate shared governance: mixed committee (university–industry–gov–community), clear decision logs, and periodic inclusion surveys.",
+        "High":  "Replicate your partner-selection methodology in new territories; publish playbook and capture lessons learned per cycle."
+    },
+    "OPEN RESEARCH": {
+        "Low":   "Run applied-research pilots with producers/extensionists before scaling; co-define success metrics and minimum documentation (protocol + data sheet).",
+        "Medium":"Formalize transfer capabilities: reproducible notebooks, data dictionaries, and short briefs for non-technical audiences.",
+        "High":  "Open a pipeline for spin-offs and shared IP; align with international partners and create a fund for open replication studies."
+    },
+    "OPEN ACCESS": {
+        "Low":   "Translate technical outputs into accessible formats (how-to guides, infographics) and assign an owner for each public artifact.",
+        "Medium":"Deploy an open repository with versioning and usage analytics; offer short trainings on data use and citation.",
+        "High":  "Institutionalize default-open policies with exceptions and create a public observatory with regular updates."
+    },
+    "OPEN DESIGN": {
+        "Low":   "Make early co-design sessions mandatory with key user groups; add a simple usability checklist to each iteration.",
+        "Medium":"Standardize participatory protocols for pilots and validations (who, when, feedback loop, change log).",
+        "High":  "Implement continuous multi-actor feedback with scheduled redesign sprints and traceability from insight → spec change."
+    },
+    "OPEN SOCIETY": {
+        "Low":   "Activate systematic engagement with affected communities; include equity criteria in milestones and feedback capture.",
+        "Medium":"Anchor participatory governance in local/regional regulation; publish roles, rights and escalation paths.",
+        "High":  "Build autonomous territorial ecosystems with institutional and financial sustainability (local funds + anchor orgs)."
+    },
+    "OPEN MIND": {
+        "Low":   "Invest in trust-building and listening spaces; run retrospectives emphasizing learning and shared responsibility.",
+        "Medium":"Offer mindset workshops (lab → entrepreneurship); pair researchers with field practitioners for short rotations.",
+        "High":  "Consolidate a hybrid culture science–enterprise–community with peer mentoring and recognition for boundary spanners."
+    },
+    "OPEN SPACE": {
+        "Low":   "Enable accessible physical/virtual collaboration spaces; define minimal facilitation and inclusive access rules.",
+        "Medium":"Secure shared infrastructure (labs, makerspaces) with booking transparency and governance of maintenance.",
+        "High":  "Design multi-functional venues mixing innovation, cultural identity and entrepreneurship with open programming."
+    },
+    "OPEN COMMUNICATION": {
+        "Low":   "Create basic feedback channels and a single source of truth; define information owners and validation steps.",
+        "Medium":"Guarantee traceability of decisions (minutes + rationale); maintain a searchable knowledge base with versioning.",
+        "High":  "Operate open dashboards with near real-time metrics; automate notifications and API access for partners."
+    },
+    "OPEN USE": {
+        "Low":   "Define minimum shared-use licenses for methods and outputs; clarify what can be reused and by whom.",
+        "Medium":"Modularize: separate patentable from open components to maximize flexibility and adoption.",
+        "High":  "Promote open-source / open hardware where feasible and provide replication kits for other territories."
+    }
+}
+FALLBACK_LOW    = "Strengthen foundational collaboration mechanisms; set minimum open standards."
+FALLBACK_MEDIUM = "Standardize what already works (playbooks, templates) and extend it to more partners."
+FALLBACK_HIGH   = "Protect and scale what works: codify practices, mentor new teams, and measure outcomes at larger scope."
+
+def get_recommendation(dim: str, cls: str, recs=None) -> str:
+    dim = str(dim).strip()
+    cls = str(cls).strip().title()  # "low" -> "Low"
+    recs_dim = (RECS if recs is None else recs).get(dim, {})
+    if cls in recs_dim:
+        return recs_dim[cls]
+    if cls == "Low": return FALLBACK_LOW
+    if cls == "Medium": return FALLBACK_MEDIUM
+    if cls == "High": return FALLBACK_HIGH
+    return "No recommendation available."
+
+CLASS_ORDER = {"Low":0, "Medium":1, "High":2, "N/A":3}
+REC_CLASSES = ("Low", "Medium", "High", "N/A")   # column order of RecTable; "N/A" stands for any other class
+CARD_CSS = ("card-low", "card-medium", "card-high", "card-high")
+CARD_HTML = '<div class="card {css}"><div class="block-title">{title}</div><div>{text}</div></div>'
+
+# =============================================================================
+# Compiled lookup: (dimension × class) texts and card HTML, fallbacks included
+# =============================================================================
+@dataclass(eq=False)
+class RecTable:
+    """``get_recommendation`` for every known dimension × class, as arrays.
+
+    ``texts[i, c]`` is the text for ``dimensions[i]`` and ``REC_CLASSES[c]``;
+    the extra last row holds the fallbacks any other dimension gets. Lookups
+    normalise only the distinct values of a column (``pd.factorize``) and
+    then index ``texts`` once for all rows.
+    """
+    dimensions: list
+    texts: np.ndarray                       # (n_dimensions + 1, 4) object
+    index: dict = field(default_factory=dict)
+
+    def rows(self, dims):
+        import pandas as pd
+        inverse, uniques = pd.factorize(np.asarray(dims, dtype=object), use_na_sentinel=False)
+        lut = np.array([self.index.get(str(d).strip(), len(self.dimensions)) for d in uniques], dtype=np.intp)
+        return lut[inverse]
+
+    @staticmethod
+    def class_codes(classes):
+        import pandas as pd
+        inverse, uniques = pd.factorize(np.asarray(classes, dtype=object), use_na_sentinel=False)
+        lut = np.array([CLASS_ORDER.get(str(c).strip().title(), 3) for c in uniques], dtype=np.intp)
+        return lut[inverse]
+
+    def lookup(self, dims, classes):
+        """Recommendation text per row, as ``get_recommendation`` would give."""
+        return self.texts[self.rows(dims), self.class_codes(classes)]
+
+    @cached_property
+    def card_table(self):
+        """Card HTML per known dimension × class (``None`` on the fallback row: its title varies)."""
+        cards = np.empty(self.texts.shape, dtype=object)
+        for i, dim in enumerate(self.dimensions):
+            for c, cls in enumerate(REC_CLASSES):
+                cards[i, c] = _card(dim, cls, c, self.texts[i, c])
+        return cards
+
+    def cards(self, dims, classes):
+        """Card HTML per row; cached per (dimension, class), formatted only for unknown dimensions or classes.
+
+        An unrecognised class gets the "N/A" text and style, but its title
+        shows the value as given, so bad input stays visible.
+        """
+        import pandas as pd
+        dims = np.asarray(dims, dtype=object)
+        inverse, uniques = pd.factorize(np.asarray(classes, dtype=object), use_na_sentinel=False)
+        shown = ["N/A" if pd.isna(c) else str(c).strip() for c in uniques]
+        codes = np.array([CLASS_ORDER.get(c.title(), 3) for c in shown], dtype=np.intp)
+        unknown = np.array([code == 3 and c != "N/A" for c, code in zip(shown, codes)], dtype=bool)
+        rows, codes = self.rows(dims), codes[inverse]
+        out = self.card_table[rows, codes]
+        for k in np.flatnonzero((rows == len(self.dimensions)) | unknown[inverse]):
+            cls = shown[inverse[k]] if unknown[inverse[k]] else REC_CLASSES[codes[k]]
+            out[k] = _card(str(dims[k]).strip(), cls, codes[k], self.texts[rows[k], codes[k]])
+        return out
+
+def _card(dim, cls, code, text):
+    return CARD_HTML.format(css=CARD_CSS[code], title=html.escape(f"{dim} — {cls}"), text=html.escape(text))
+
+def compile_recs(recs=None, dimensions=()) -> RecTable:
+    """``RecTable`` for ``dimensions`` plus every dimension ``recs`` (default ``RECS``) covers."""
+    recs = RECS if recs is None else recs
+    dims = list(dict.fromkeys([str(d).strip() for d in dimensions] + [str(d).strip() for d in recs]))
+    texts = np.array([[get_recommendation(d, c, recs) for c in REC_CLASSES] for d in dims + [None]], dtype=object)
+    return RecTable(dims, texts, {d: i for i, d in enumerate(dims)})
+
+def rec_table_for(recs=None) -> RecTable:
+    """Compiled table for a recommendations dict, built once per distinct contents.
+
+    Keyed by the dict's contents, not its identity, so an edited or a new
+    dict never gets a table compiled from another one.
+    """
+    recs = RECS if recs is None else recs
+    return _compile_frozen(tuple((d, tuple(dict(v).items())) for d, v in recs.items()))
+
+@lru_cache(maxsize=32)
+def _compile_frozen(frozen):
+    return compile_recs({d: dict(v) for d, v in frozen})
+
+def recommendations_frame(dimensions_df, recs=None, sort=True):
+    """Recommendation per dimension, most urgent (Low) first, as shown in the app.
+
+    Works on any number of rows (e.g. a whole portfolio's long dimension
+    table): texts come from one ``RecTable`` lookup, and the sort is a stable
+    sort on class alone, so rows of one class keep their order. ``sort=False``
+    keeps the input order. ``recs`` is a recommendations dict (default
+    ``RECS``) or an already compiled ``RecTable``; a ``Recommendation``
+    column already in ``dimensions_df`` (joined once for a whole portfolio)
+    is used as is.
+    """
+    import pandas as pd
+    dims = dimensions_df["Dimension"].to_numpy(dtype=object)
+    classes = dimensions_df["Classification"].to_numpy(dtype=object)
+    if "Recommendation" in dimensions_df.columns:
+        texts = dimensions_df["Recommendation"].to_numpy(dtype=object)
+    else:
+        texts = (recs if isinstance(recs, RecTable) else rec_table_for(recs)).lookup(dims, classes)
+    out = pd.DataFrame({"Dimension": dims, "Classification": classes, "Recommendation": texts},
+                       columns=["Dimension", "Classification", "Recommendation"])
+    if not sort:
+        return out
+    order = pd.Series(classes, dtype=object).map(CLASS_ORDER).fillna(len(CLASS_ORDER)).to_numpy()
+    return out.iloc[np.argsort(order, kind="stable")]
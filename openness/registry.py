@@ -0,0 +1,268 @@
+"""Instrument registry: APERTO grids compiled from xlsx, with a sidecar cache.
+
+A grid workbook is parsed once with openpyxl and compiled into an
+``Instrument`` (items, variable -> dimension index array, dimension order,
+recommendation lookup). The compiled form is written next to the workbook as
+``<file>.instrument.json`` (``<file>.<sheet>.instrument.json`` for a named
+sheet) together with the workbook's SHA-256, so later startups skip openpyxl
+entirely unless the file has changed.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import zipfile
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+
+from .instrument import APERTO_ITEMS, APERTO_COLS
+from .recommendations import RECS, compile_recs
+from .scoring import preserve_order
+
+CACHE_SUFFIX = ".instrument.json"
+CACHE_FORMAT = 1
+EMBEDDED_NAME = "APERTO (embedded)"
+RECS_SHEETS = ("Recommendations", "RECS")
+
+# =============================================================================
+# Compiled instrument
+# =============================================================================
+@dataclass(eq=False)
+class Instrument:
+    name: str
+    items: list                      # dicts keyed by APERTO_COLS
+    recs: dict = field(default_factory=dict)
+    source: str = None
+    sha256: str = None
+
+    @cached_property
+    def variables(self):
+        return [it["Variable"] for it in self.items]
+
+    @cached_property
+    def dimensions(self):
+        return preserve_order(it["Dimension of openness"] for it in self.items)
+
+    @cached_property
+    def var_dim(self):
+        """Dimension index of each variable (int array aligned with ``variables``)."""
+        col = {d: j for j, d in enumerate(self.dimensions)}
+        return np.array([col[it["Dimension of openness"]] for it in self.items], dtype=np.intp)
+
+    @cached_property
+    def indicator(self):
+        ind = np.zeros((len(self.items), len(self.dimensions)), dtype=float)
+        ind[np.arange(len(self.items)), self.var_dim] = 1.0
+        return ind
+
+    @cached_property
+    def n_variables(self):
+        return np.bincount(self.var_dim, minlength=len(self.dimensions))
+
+    @cached_property
+    def recommendations(self):
+        """Compiled ``RecTable`` of this instrument's dimensions and recommendations."""
+        return compile_recs(self.recs, self.dimensions)
+
+    @cached_property
+    def rec_table(self):
+        """``(n_dimensions, len(scoring.CLASSES))`` recommendation texts, fallbacks included."""
+        return self.recommendations.texts[self.recommendations.rows(self.dimensions)]
+
+    @cached_property
+    def frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.items, columns=APERTO_COLS)
+
+    def to_dict(self):
+        return {"format": CACHE_FORMAT, "name": self.name, "source": self.source, "sha256": self.sha256,
+                "items": self.items, "recs": self.recs,
+                "dimensions": self.dimensions, "var_dim": self.var_dim.tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        inst = cls(name=d["name"], items=d["items"], recs=d.get("recs") or {},
+                   source=d.get("source"), sha256=d.get("sha256"))
+        if "dimensions" in d and "var_dim" in d:   # precompiled index, no re-derivation
+            inst.__dict__["dimensions"] = list(d["dimensions"])
+            inst.__dict__["var_dim"] = np.asarray(d["var_dim"], dtype=np.intp)
+        return inst
+
+EMBEDDED = Instrument(name=EMBEDDED_NAME, items=[dict(it) for it in APERTO_ITEMS], recs=RECS)
+
+# =============================================================================
+# xlsx parsing
+# =============================================================================
+def _clean(x) -> str:
+    return " ".join(str(x).split()) if x is not None else ""
+
+def _var_code(label: str) -> str:
+    m = re.match(r"\s*([A-Za-z]+\d+)", label)
+    return m.group(1) if m else label.split()[0]
+
+def _find_header(rows):
+    for i, row in enumerate(rows):
+        cells = [_clean(c).lower() for c in row]
+        if "dimension of openness" in cells:
+            idx = {"dim": cells.index("dimension of openness")}
+            for j, c in enumerate(cells):
+                if c.startswith("variable"): idx["var"] = j
+                elif c.startswith("question"): idx["q"] = j
+                elif c == "5": idx["s5"] = j
+                elif c == "1": idx["s1"] = j
+            missing = {"var", "q", "s5", "s1"} - idx.keys()
+            if missing:
+                raise ValueError(f"Grid header is missing columns: {sorted(missing)}")
+            return i, idx
+    raise ValueError("No 'Dimension of openness' header row found in grid.")
+
+def _parse_recs(ws):
+    rows = ws.iter_rows(values_only=True)
+    header = [_clean(c).lower() for c in next(rows, ())]
+    try:
+        j_dim = header.index("dimension")
+    except ValueError:
+        j_dim = 0
+    cls_cols = {c: header.index(c.lower()) for c in ("Low", "Medium", "High") if c.lower() in header}
+    recs = {}
+    for row in rows:
+        dim = _clean(row[j_dim]) if j_dim < len(row) else ""
+        if dim:
+            recs[dim] = {c: _clean(row[j]) for c, j in cls_cols.items() if j < len(row) and _clean(row[j])}
+    return recs
+
+def parse_grid_xlsx(path, sheet=None, name=None, base_recs=RECS):
+    """Parse an APERTO grid workbook into an ``Instrument``.
+
+    The dimension column is forward-filled; a question row without its own
+    variable code belongs to the previous variable and gets a ``_2``, ``_3``…
+    suffix. An optional ``Recommendations`` sheet (Dimension, Low, Medium,
+    High) overrides ``base_recs`` per dimension.
+    """
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = list(ws.iter_rows(values_only=True))
+        h, idx = _find_header(rows)
+        items, dim, var, k = [], None, None, 0
+        for row in rows[h + 1:]:
+            cell = lambda key: _clean(row[idx[key]]) if idx[key] < len(row) else ""
+            if cell("dim"): dim = cell("dim")
+            q = cell("q")
+            if not q or not dim: continue
+            if cell("var"):
+                var, k = _var_code(cell("var")), 1
+                code = var
+            elif var:
+                k += 1; code = f"{var}_{k}"
+            else:
+                continue
+            items.append({"Dimension of openness": dim, "Variable": code, "Questions": q,
+                          "Scale_5_text": cell("s5"), "Scale_1_text": cell("s1")})
+        recs = {d: dict(v) for d, v in base_recs.items()}
+        for s in RECS_SHEETS:
+            if s in wb.sheetnames:
+                for d, v in _parse_recs(wb[s]).items():
+                    recs.setdefault(d, {}).update(v)
+    finally:
+        wb.close()
+    codes = [it["Variable"] for it in items]
+    dupes = sorted({c for c in codes if codes.count(c) > 1})
+    if dupes:
+        raise ValueError(f"Duplicate variable codes in grid: {', '.join(dupes)}")
+    if not items:
+        raise ValueError(f"No items found in grid {path!r}.")
+    stem = os.path.splitext(os.path.basename(str(path)))[0]
+    return Instrument(name=name or stem, items=items, recs=recs, source=os.path.abspath(str(path)))
+
+# =============================================================================
+# Sidecar cache
+# =============================================================================
+def file_sha256(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def cache_path(path, sheet=None) -> str:
+    if sheet:
+        return f"{path}.{re.sub(r'[^A-Za-z0-9._-]+', '_', str(sheet))}{CACHE_SUFFIX}"
+    return str(path) + CACHE_SUFFIX
+
+def load_instrument(path, use_cache=True, sheet=None):
+    """Compiled instrument for ``path`` (and ``sheet``); parses only when the sidecar is missing or stale."""
+    digest = file_sha256(path)
+    sidecar = cache_path(path, sheet)
+    if use_cache:
+        try:
+            with open(sidecar, encoding="utf-8") as fh:
+                d = json.load(fh)
+            if d.get("format") == CACHE_FORMAT and d.get("sha256") == digest and d.get("sheet") == sheet:
+                return Instrument.from_dict(d)
+        except (OSError, ValueError, KeyError):
+            pass
+    inst = parse_grid_xlsx(path, sheet=sheet)
+    inst.sha256 = digest
+    if use_cache:
+        try:
+            tmp = sidecar + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({**inst.to_dict(), "sheet": sheet}, fh, ensure_ascii=False)
+            os.replace(tmp, sidecar)
+        except OSError:
+            pass   # read-only install: just skip the cache
+    return inst
+
+# =============================================================================
+# Registry
+# =============================================================================
+class InstrumentRegistry:
+    """Named instruments (embedded grid + any number of xlsx grids)."""
+
+    def __init__(self):
+        self._instruments = {}
+        self.skipped = {}          # path -> reason, from the last ``scan``
+        self._lock = threading.Lock()
+
+    def register(self, inst):
+        with self._lock:
+            self._instruments[inst.name] = inst
+        return inst
+
+    def load(self, path, use_cache=True):
+        return self.register(load_instrument(path, use_cache=use_cache))
+
+    def scan(self, directory, pattern="*.xlsx", use_cache=True):
+        """Register every grid workbook in ``directory``; names and reasons of skipped files go to ``skipped``.
+
+        Only files that are not readable grids are skipped (bad workbook,
+        missing header or columns); any other error propagates.
+        """
+        from openpyxl.utils.exceptions import InvalidFileException
+        names = []
+        self.skipped = {}
+        for path in sorted(glob.glob(os.path.join(str(directory), pattern))):
+            if os.path.basename(path).startswith("~$"):   # Office lock files
+                continue
+            try:
+                names.append(self.load(path, use_cache).name)
+            except (ValueError, KeyError, OSError, zipfile.BadZipFile, InvalidFileException) as exc:
+                self.skipped[path] = f"{type(exc).__name__}: {exc}"
+        return names
+
+    def get(self, name=None):
+        with self._lock:
+            return self._instruments[name or EMBEDDED_NAME]
+
+    def names(self):
+        with self._lock:
+            return list(self._instruments)
+
+REGISTRY = InstrumentRegistry()
+REGISTRY.register(EMBEDDED)
@@ -0,0 +1,76 @@
+"""Optional bounded render pool shared by concurrent app sessions.
+
+Charts are drawn on object-oriented ``Figure``/Agg canvases (see
+``charts.new_figure``), so sessions never share pyplot's global figure
+registry. The pool bounds how many charts are rendered, and therefore how
+many figures are alive, at once: callers beyond ``max_pending`` wait for a
+slot instead of each building their own figure.
+
+``OPENNESS_RENDER_POOL`` turns it on in the app: ``thread:4`` (figures in
+worker threads, spans still recorded) or ``process:2`` (separate
+interpreters; arguments and results are pickled). Unset, charts render
+inline in the session's own thread.
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .charts import PNG_CACHE, chart_key, render_chart_png
+
+POOL_KINDS = ("thread", "process")
+
+def _init_process_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+class RenderPool:
+    """``workers`` renderers with at most ``max_pending`` calls admitted (running or queued)."""
+
+    def __init__(self, workers: int = 2, kind: str = "thread", max_pending: int = None):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unknown render pool kind: {kind!r} (expected one of {POOL_KINDS})")
+        self.kind, self.workers = kind, max(1, int(workers))
+        if kind == "thread":
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="openness-render")
+        else:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_process_worker)
+        self.max_pending = int(max_pending or 2 * self.workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def run(self, fn, *args, pool_timeout=None, **kwargs):
+        """Call ``fn(*args, **kwargs)`` on a worker and wait up to ``pool_timeout`` seconds for its result.
+
+        Every other keyword, ``timeout`` included, goes to ``fn``.
+        """
+        with self._slots:
+            if self.kind == "thread":   # carry the caller's context (active RerunTimer) along
+                fut = self._executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+            else:
+                fut = self._executor.submit(fn, *args, **kwargs)
+            return fut.result(pool_timeout)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+def pool_from_env(spec=None):
+    """``RenderPool`` for ``"kind:workers"`` (default ``$OPENNESS_RENDER_POOL``), or ``None`` when unset."""
+    spec = (os.environ.get("OPENNESS_RENDER_POOL", "") if spec is None else spec).strip().lower()
+    if not spec or spec in ("0", "off", "none"):
+        return None
+    kind, _, workers = spec.partition(":")
+    return RenderPool(int(workers or 2), kind)
+
+def run_render(pool, fn, *args, **kwargs):
+    """``fn(*args, **kwargs)`` on ``pool``, or inline without one."""
+    return pool.run(fn, *args, **kwargs) if pool is not None else fn(*args, **kwargs)
+
+def render_chart(pool, dimensions_df, chart_type="Polar Bar", size_px=560, backend="template", cache=PNG_CACHE):
+    """``charts.render_chart_png`` through ``pool``; the PNG cache stays in this process."""
+    key = chart_key(dimensions_df, chart_type, size_px, backend) if cache is not None else None
+    png = cache.get(key) if cache is not None else None
+    if png is None:
+        png = run_render(pool, render_chart_png, dimensions_df, chart_type, size_px, cache=None, backend=backend)
+        if cache is not None:
+            cache.put(key, png)
+    return png
@@ -0,0 +1,233 @@
+"""Bulk per-project reports (chart + recommendations) rendered across a process pool.
+
+Input is a long dimension-scores table — one row per project × dimension with
+``Dimension``, ``MeanScore`` and ``Classification``, as written by
+``python -m openness score`` — and output is a ZIP (PNG + CSV per project) or
+a multi-page PDF (a page per project, continued when recommendations overflow).
+"""
+import io
+import os
+import re
+import textwrap
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+from .charts import CI_COLUMNS
+from .recommendations import recommendations_frame
+
+REPORT_FORMATS = ("zip", "pdf")
+PAGE_SIZE_IN = (8.27, 11.69)   # A4 portrait
+PAGE_DPI = 100
+PDF_BATCH = 25                 # pages held in memory between PDF appends
+WINDOW_PER_WORKER = 2          # task batches in flight per worker; bounds finished-but-unwritten results
+
+# =============================================================================
+# Input
+# =============================================================================
+def read_dimension_scores(path):
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext in (".xlsx", ".xlsm"):
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+def iter_projects(dimensions_long, id_column="Respondent"):
+    """Yield ``(project_id, dimensions_df)`` in first-appearance order.
+
+    Recommendations are joined onto the whole table once (one ``RecTable``
+    lookup), so workers only slice and sort each project's rows.
+    """
+    if id_column not in dimensions_long.columns:
+        raise ValueError(f"Project id column {id_column!r} not found.")
+    cols = ["Dimension", "MeanScore", "Classification"]
+    missing = [c for c in cols if c not in dimensions_long.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    if all(c in dimensions_long.columns for c in CI_COLUMNS):   # e.g. from 'score-projects': draw intervals
+        cols += list(CI_COLUMNS)
+    if "Recommendation" not in dimensions_long.columns:
+        dimensions_long = dimensions_long.assign(
+            Recommendation=recommendations_frame(dimensions_long, sort=False)["Recommendation"].to_numpy())
+    cols.append("Recommendation")
+    for pid, grp in dimensions_long.groupby(id_column, sort=False):
+        yield pid, grp[cols].reset_index(drop=True)
+
+def _safe_name(pid) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(pid)).strip("_") or "project"
+
+def _unique_name(name, seen) -> str:
+    """``name``, or the first unused ``name_2``, ``name_3``… (a real project may already be called ``X_2``)."""
+    k, out = 1, name
+    while out in seen:
+        k += 1
+        out = f"{name}_{k}"
+    return out
+
+# =============================================================================
+# Worker side (runs in child processes; each keeps its own chart templates)
+# =============================================================================
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+def _render_zip_entry(task):
+    from .charts import render_chart_png, render_chart_svg
+    pid, dimensions_df, chart_type, size_px, backend = task
+    if backend == "svg":   # vector file in the archive
+        chart = render_chart_svg(dimensions_df, chart_type, size_px).encode("utf-8")
+    else:
+        chart = render_chart_png(dimensions_df, chart_type, size_px, cache=None, backend=backend)
+    recs = recommendations_frame(dimensions_df).to_csv(index=False).encode("utf-8")
+    return pid, chart, recs
+
+@lru_cache(maxsize=None)
+def _font(size: int, bold: bool = False):
+    """DejaVu Sans from matplotlib's bundled fonts, so pages match the charts."""
+    from PIL import ImageFont
+    from matplotlib import font_manager
+    path = font_manager.findfont(font_manager.FontProperties(family="DejaVu Sans", weight="bold" if bold else "normal"))
+    return ImageFont.truetype(path, size)
+
+def _run_batch(worker, tasks):
+    return [worker(t) for t in tasks]
+
+def _render_pdf_page(task):
+    """A4 pages (title, chart, recommendations) as PNG bytes, composed with PIL.
+
+    Recommendations that do not fit under the chart continue on further pages.
+    """
+    from PIL import Image, ImageDraw
+    from .charts import PRIMARY, render_chart_png
+
+    pid, dimensions_df, chart_type, size_px, backend = task
+    png = render_chart_png(dimensions_df, chart_type, size_px, cache=None, backend=backend)
+    chart = Image.open(io.BytesIO(png)).convert("RGB")
+    recs = recommendations_frame(dimensions_df)
+
+    W, H = (int(d * PAGE_DPI) for d in PAGE_SIZE_IN)
+    margin = int(0.5 * PAGE_DPI)
+    pages = []
+
+    def new_page(title):
+        page = Image.new("RGB", (W, H), "white")
+        pages.append(page)
+        draw = ImageDraw.Draw(page)
+        draw.text((margin, margin), title, font=_font(20, True), fill=PRIMARY)
+        return page, draw
+
+    page, draw = new_page(f"Openness Assessment — {pid}")
+
+    max_chart = int(0.50 * H)
+    if chart.width > W - 2 * margin or chart.height > max_chart:
+        chart.thumbnail((W - 2 * margin, max_chart))
+    top = margin + 40
+    page.paste(chart, ((W - chart.width) // 2, top))
+
+    y = top + chart.height + 16
+    head, body = _font(12, True), _font(11)
+    bottom = H - margin
+    for dim, cls, text in zip(recs["Dimension"], recs["Classification"], recs["Recommendation"]):
+        lines = textwrap.wrap(str(text), 105)
+        if y + 17 + 15 * min(len(lines), 1) > bottom:      # keep a heading with its first line
+            page, draw = new_page(f"Openness Assessment — {pid} (continued)")
+            y = top
+        draw.text((margin, y), f"{dim} — {cls}", font=head, fill=PRIMARY)
+        y += 17
+        for line in lines:
+            if y + 15 > bottom:
+                page, draw = new_page(f"Openness Assessment — {pid} (continued)")
+                y = top
+            draw.text((margin, y), line, font=body, fill="#111827")
+            y += 15
+        y += 8
+
+    out = []
+    for page in pages:
+        buf = io.BytesIO()
+        page.save(buf, format="PNG", compress_level=1)
+        out.append(buf.getvalue())
+    return pid, out
+
+# =============================================================================
+# Driver
+# =============================================================================
+def build_reports(projects, out_path, fmt=None, chart_type="Polar Bar", size_px=560,
+                  workers=None, chunksize=4, backend="template"):
+    """Render every ``(project_id, dimensions_df)`` into ``out_path``; returns the project count.
+
+    ``fmt`` defaults to the output file extension (``.zip`` or ``.pdf``).
+    ``backend`` is a ``charts.CHART_BACKENDS`` name; with ``"svg"`` ZIP
+    archives hold ``.svg`` charts and PDF pages use the PIL raster.
+    """
+    fmt = (fmt or os.path.splitext(str(out_path))[1].lstrip(".")).lower()
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt!r} (expected one of {REPORT_FORMATS})")
+    tasks = ((pid, df, chart_type, int(size_px), backend) for pid, df in projects)
+    worker = _render_zip_entry if fmt == "zip" else _render_pdf_page
+    n = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = _bounded_map(pool, worker, tasks, chunksize, WINDOW_PER_WORKER * (workers or os.cpu_count() or 1))
+        if fmt == "zip":
+            stem = chart_type.lower().replace(" ", "_")
+            with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                seen = set()
+                ext = "svg" if backend == "svg" else "png"
+                for pid, chart, recs in results:
+                    name = _unique_name(_safe_name(pid), seen)
+                    seen.add(name)
+                    zf.writestr(f"{name}/openness_{stem}.{ext}", chart,
+                                compress_type=zipfile.ZIP_DEFLATED if ext == "svg" else zipfile.ZIP_STORED)
+                    zf.writestr(f"{name}/openness_recommendations.csv", recs)
+                    n += 1
+        else:
+            def pages():
+                nonlocal n
+                for _, project_pages in results:
+                    n += 1
+                    yield from project_pages
+            _write_pdf(out_path, pages())
+    return n
+
+def _bounded_map(pool, worker, tasks, chunksize, window):
+    """``pool.map`` in order, but with at most ``window`` batches of ``chunksize`` tasks submitted at once.
+
+    ``Executor.map`` submits every task up front, so results finished ahead
+    of the writer pile up in memory; here a batch is submitted only as an
+    earlier one is consumed.
+    """
+    pending = deque()
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= chunksize:
+            pending.append(pool.submit(_run_batch, worker, batch))
+            batch = []
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+    if batch:
+        pending.append(pool.submit(_run_batch, worker, batch))
+    while pending:
+        yield from pending.popleft().result()
+
+def _write_pdf(out_path, pages):
+    from PIL import Image
+    batch, first = [], True
+
+    def flush():
+        nonlocal first
+        imgs = [Image.open(io.BytesIO(p)).convert("RGB") for p in batch]
+        imgs[0].save(out_path, format="PDF", resolution=PAGE_DPI, save_all=True,
+                     append_images=imgs[1:], append=not first)
+        first = False; batch.clear()
+
+    for page in pages:
+        batch.append(page)
+        if len(batch) >= PDF_BATCH:
+            flush()
+    if batch:
+        flush()
@@ -0,0 +1,119 @@
+"""Headless Mode A scoring: respondents × variables -> dimension means + classes.
+
+Nothing here imports Streamlit, so the same code path serves the app (one
+respondent) and batch jobs (many respondents in one NumPy pass). pandas is
+only imported by the table helpers, so importing this module stays cheap.
+"""
+import numpy as np
+
+from .instrument import APERTO_ITEMS
+
+CLASSES = np.array(["Low", "Medium", "High", "N/A"], dtype=object)
+NA_CODE = 3
+
+# =============================================================================
+# Utilities (shared)
+# =============================================================================
+def classify_openness(x: float, low_max: float, med_max: float) -> str:
+    if np.isnan(x): return "N/A"
+    if x < low_max:       return "Low"
+    elif x <= med_max:    return "Medium"
+    else:                 return "High"
+
+def preserve_order(seq):
+    return list(dict.fromkeys(seq))
+
+# =============================================================================
+# Indicator matrix (variable -> dimension), built once per item list
+# =============================================================================
+def build_indicator(items=APERTO_ITEMS):
+    """Return ``(variables, dimensions, indicator)`` for an item list.
+
+    ``indicator`` is a ``(n_variables, n_dimensions)`` 0/1 float matrix; column
+    order follows first appearance of each dimension, as in the app.
+    """
+    variables  = [str(it["Variable"]).strip() for it in items]
+    var_dims   = [str(it["Dimension of openness"]).strip() for it in items]
+    dimensions = preserve_order(var_dims)
+    col = {d: j for j, d in enumerate(dimensions)}
+    indicator = np.zeros((len(variables), len(dimensions)), dtype=float)
+    indicator[np.arange(len(variables)), [col[d] for d in var_dims]] = 1.0
+    return variables, dimensions, indicator
+
+VARIABLES, DIMENSIONS, INDICATOR = build_indicator()
+N_VARIABLES = INDICATOR.sum(axis=0).astype(int)   # items per dimension
+
+# =============================================================================
+# Vectorized scoring
+# =============================================================================
+def classify_array(means, low_max: float, med_max: float):
+    """Integer class codes (index into ``CLASSES``) for an array of means."""
+    means = np.asarray(means, dtype=float)
+    codes = np.where(means < low_max, 0, np.where(means <= med_max, 1, 2))
+    return np.where(np.isnan(means), NA_CODE, codes).astype(np.int8)
+
+ANSWER_LUT = np.arange(256, dtype=float)   # archived uint8 code -> answer
+ANSWER_LUT[0] = np.nan
+
+def answer_scores(scores):
+    """Float answers (NaN = unanswered) from floats or archived ``uint8`` codes (0 = unanswered)."""
+    scores = np.asarray(scores)
+    return ANSWER_LUT[scores] if scores.dtype == np.uint8 else scores.astype(float, copy=False)
+
+def dimension_means(scores, indicator=INDICATOR, decimals=3):
+    """Per-dimension means for a ``(n_respondents, n_variables)`` score matrix.
+
+    Unanswered items (NaN) are left out of the mean; a dimension with no
+    answered item is NaN. Means are rounded like the app's ``MeanScore``.
+    ``uint8`` answer codes (0 = unanswered, e.g. a slice of an archive's
+    memory map) need no NaN mask: an unanswered 0 adds nothing to the sums.
+    The matrix products still upcast the codes to float internally.
+    """
+    scores = np.atleast_2d(np.asarray(scores))
+    if scores.shape[1] != indicator.shape[0]:
+        raise ValueError(f"Expected {indicator.shape[0]} variable columns, got {scores.shape[1]}.")
+    if scores.dtype == np.uint8:
+        answered = scores > 0
+        values = scores
+    else:
+        scores = scores.astype(float, copy=False)
+        answered = ~np.isnan(scores)
+        values = np.where(answered, scores, 0.0)
+    sums   = values @ indicator
+    counts = answered.astype(float) @ indicator
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return means.round(decimals) if decimals is not None else means
+
+def score_responses(scores, low_max: float = 2.5, med_max: float = 3.5, indicator=INDICATOR):
+    """Score every respondent at once.
+
+    Returns ``(means, classes)``: float means and ``CLASSES`` labels, both of
+    shape ``(n_respondents, n_dimensions)``.
+    """
+    means = dimension_means(scores, indicator)
+    return means, CLASSES[classify_array(means, low_max, med_max)]
+
+# =============================================================================
+# Tabular views (same columns as the app's downloads)
+# =============================================================================
+def variables_frame(variable_scores, items=APERTO_ITEMS):
+    """Variable-level table for one respondent (``{variable: score}``)."""
+    import pandas as pd
+    data = pd.DataFrame(items)
+    return pd.DataFrame({
+        "Variable": data["Variable"],
+        "Dimension": data["Dimension of openness"],
+        "Question": data["Questions"],
+        "Score": data["Variable"].map(variable_scores).astype(float),
+    })
+
+def dimensions_frame(means, classes, dimensions=DIMENSIONS, n_variables=N_VARIABLES):
+    """Dimension-level table for one respondent (1-D ``means``/``classes``)."""
+    import pandas as pd
+    return pd.DataFrame({
+        "Dimension": list(dimensions),
+        "MeanScore": np.asarray(means, dtype=float),
+        "n_Variables": np.asarray(n_variables, dtype=int),
+        "Classification": np.asarray(classes, dtype=object),
+    })
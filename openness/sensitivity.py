@@ -0,0 +1,126 @@
+"""Threshold sensitivity: how classes move over a grid of (low_max, med_max) cutoffs.
+
+A mean ``x`` is Low below ``low_max``, High above ``med_max`` and Medium in
+between (``classify_openness``). Against sorted grids of cutoffs, one
+``searchsorted`` gives, per mean, how many ``low_max`` values it clears
+(``a``) and how many ``med_max`` values it exceeds (``b``); its class at grid
+cell ``(i, j)`` is then ``[i < a] + [j < b]``. Counting means by
+``(dimension, baseline class, a, b)`` with one ``bincount`` and taking 2-D
+suffix sums gives every cell's class counts at once: the cost is one pass
+over the portfolio plus one pass over the grid, whatever their sizes.
+"""
+import numpy as np
+
+from .scoring import CLASSES, classify_array
+
+LOW_RANGE = (1.5, 3.5, 0.1)    # start, stop (inclusive), step
+MED_RANGE = (2.5, 4.5, 0.1)
+SENSITIVITY_COLUMNS = ["Dimension", "LowMax", "MedMax", "n", "Changed", "Changed %", "Low", "Medium", "High"]
+
+def threshold_values(start, stop, step):
+    """Inclusive ``start..stop`` grid, rounded so 0.1 steps stay on 0.1 values."""
+    n = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return np.round(start + step * np.arange(max(n, 0)), 6)
+
+def sweep(means, low_values, med_values, low_max=2.5, med_max=3.5):
+    """Class counts for every ``(low_values[i], med_values[j])`` pair.
+
+    ``means`` is ``(n_projects, n_dimensions)`` (NaN = no score). Returns a
+    dict of arrays:
+
+    * ``counts`` ``(n_dimensions, 3, n_low, n_med)``: Low/Medium/High projects
+    * ``changed`` ``(n_dimensions, n_low, n_med)``: projects whose class
+      differs from the baseline ``(low_max, med_max)``
+    * ``n`` ``(n_dimensions,)``: projects with a score
+    * ``valid`` ``(n_low, n_med)``: pairs with ``low_max <= med_max``;
+      ``counts``/``changed`` are meaningless elsewhere
+    """
+    x = np.atleast_2d(np.asarray(means, dtype=float))
+    low = np.sort(np.asarray(low_values, dtype=float))
+    med = np.sort(np.asarray(med_values, dtype=float))
+    n_dim, n_low, n_med = x.shape[1], len(low), len(med)
+    scored = ~np.isnan(x)
+    a = np.searchsorted(low, x, side="right")    # x >= low[i]  <=>  i < a
+    b = np.searchsorted(med, x, side="left")     # x >  med[j]  <=>  j < b
+    base = classify_array(x, low_max, med_max)
+    dim = np.broadcast_to(np.arange(n_dim), x.shape)
+    cell = ((dim * 3 + base) * (n_low + 1) + a) * (n_med + 1) + b
+    hist = np.bincount(cell[scored], minlength=n_dim * 3 * (n_low + 1) * (n_med + 1))
+    hist = hist.reshape(n_dim, 3, n_low + 1, n_med + 1)
+    # ge[..., p, q] = #(a >= p and b >= q)
+    ge = hist[..., ::-1, ::-1].cumsum(axis=-2).cumsum(axis=-1)[..., ::-1, ::-1]
+    both = ge[..., 1:, 1:]                       # a > i and b > j
+    above_low = ge[..., 1:, :1]                  # a > i
+    above_med = ge[..., :1, 1:]                  # b > j
+    total = ge[..., :1, :1]
+    by_base = np.stack([total - above_low - above_med + both,        # Low
+                        above_low + above_med - 2 * both,            # Medium
+                        both], axis=2)                               # High: (dims, base, new, low, med)
+    stayed = by_base[:, np.arange(3), np.arange(3)].sum(axis=1)
+    n = scored.sum(axis=0)
+    return {"counts": by_base.sum(axis=1), "changed": n[:, None, None] - stayed, "n": n,
+            "valid": low[:, None] <= med[None, :], "low_values": low, "med_values": med,
+            "low_max": float(low_max), "med_max": float(med_max)}
+
+def sensitivity_frame(result, dimensions=None):
+    """Long table (``SENSITIVITY_COLUMNS``): one row per dimension × valid threshold pair."""
+    import pandas as pd
+    counts, changed, n, valid = result["counts"], result["changed"], result["n"], result["valid"]
+    n_dim = len(n)
+    dimensions = list(dimensions) if dimensions is not None else [f"D{j + 1}" for j in range(n_dim)]
+    li, mj = np.nonzero(valid)
+    k = len(li)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = np.where(n[:, None] > 0, 100.0 * changed[:, li, mj] / n[:, None], np.nan)
+    return pd.DataFrame({
+        "Dimension": np.repeat(np.array(dimensions, dtype=object), k),
+        "LowMax": np.tile(result["low_values"][li], n_dim),
+        "MedMax": np.tile(result["med_values"][mj], n_dim),
+        "n": np.repeat(n, k),
+        "Changed": changed[:, li, mj].ravel(),
+        "Changed %": share.round(1).ravel(),
+        **{c: counts[:, j, li, mj].ravel() for j, c in enumerate(CLASSES[:3])},
+    }, columns=SENSITIVITY_COLUMNS)
+
+def sensitivity_summary(result, dimensions=None):
+    """Per dimension: projects scored, and the most projects any valid pair reclassifies."""
+    import pandas as pd
+    changed = np.where(result["valid"], result["changed"], -1).reshape(len(result["n"]), -1)
+    worst = changed.argmax(axis=1)
+    li, mj = np.unravel_index(worst, result["valid"].shape)
+    n_dim = len(result["n"])
+    return pd.DataFrame({
+        "Dimension": list(dimensions) if dimensions is not None else [f"D{j + 1}" for j in range(n_dim)],
+        "n": result["n"],
+        "Max changed": changed.max(axis=1).clip(min=0),
+        "at LowMax": result["low_values"][li],
+        "at MedMax": result["med_values"][mj],
+    })
+
+def sensitivity_file(path, out_path, id_column="Respondent", low_range=LOW_RANGE, med_range=MED_RANGE,
+                     low_max=2.5, med_max=3.5, heatmap=None, size_px=960):
+    """Sweep a long dimension-score table (e.g. from ``score``); returns ``(out_path, n_projects)``.
+
+    Each project's rows are pivoted to one mean per dimension; ``heatmap``
+    optionally names a PNG for ``charts.render_sensitivity_png``.
+    """
+    import os
+    from .batch import open_sink
+    from .charts import overlay_values
+    from .reports import read_dimension_scores
+    table = read_dimension_scores(path)
+    if id_column not in table.columns:
+        raise ValueError(f"Project id column {id_column!r} not found.")
+    dims, projects, means = overlay_values(table, id_column)
+    result = sweep(means, threshold_values(*low_range), threshold_values(*med_range), low_max, med_max)
+    fmt = (os.path.splitext(str(out_path))[1].lstrip(".") or "csv").lower()
+    sink = open_sink(out_path, fmt)
+    try:
+        sink.write(sensitivity_frame(result, dims))
+    finally:
+        sink.close()
+    if heatmap:
+        from .charts import render_sensitivity_png
+        with open(heatmap, "wb") as fh:
+            fh.write(render_sensitivity_png(result, dims, size_px=size_px))
+    return out_path, len(projects)
@@ -0,0 +1,357 @@
+"""Local HTTP scoring service: asyncio and the standard library only.
+
+    python -m openness serve --port 8765
+
+``POST /score/a`` takes ``{"answers": {"ON1": 4, ...}}`` (Likert 1–5, null or
+absent = unanswered) plus optional ``low``, ``med``, ``instrument``,
+``chart`` ("Polar Bar"/"Radar"), ``chart_format`` ("png"/"svg"), ``renderer``
+and ``size``. ``POST /score/b`` takes the Mode B answer columns
+(``Engagement_Q1`` … ``Research_Structure``, option text or value) plus an
+optional ``chart: true``. Either body may also be a JSON list of such
+objects. ``GET /health`` returns counters.
+
+Requests that arrive within ``batch_wait_ms`` of each other are scored
+together in one NumPy pass (``MicroBatcher``). PNG charts are rendered in a
+process pool, so matplotlib never blocks the event loop and charts render
+in parallel across cores; repeated charts are served from a ``PngCache``.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from .charts import CHART_BACKENDS, CHART_TYPES, PngCache
+from .matrix import CODEBOOK, X_COL, Y_COL, band_array
+from .registry import REGISTRY
+from .scoring import CLASSES, classify_array, dimension_means
+
+MAX_BODY = 1 << 20            # bytes per request body
+MAX_HEADER = 16 * 1024
+CHART_FORMATS = ("png", "svg")
+
+# =============================================================================
+# Micro-batching
+# =============================================================================
+class MicroBatcher:
+    """Collect submitted items for up to ``max_wait_s`` (or ``max_batch`` items) and score them in one call.
+
+    ``score_batch(items)`` runs on the event loop and returns one result per
+    item, in order.
+    """
+
+    def __init__(self, score_batch, max_batch: int = 256, max_wait_s: float = 0.002):
+        self.score_batch = score_batch
+        self.max_batch, self.max_wait_s = int(max_batch), float(max_wait_s)
+        self._pending, self._timer = [], None
+        self.batches = self.items = 0
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((item, fut))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_s, self.flush)
+        return fut
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1; self.items += len(batch)
+        try:
+            results = self.score_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), res in zip(batch, results):
+            if not fut.done():
+                fut.set_result(res)
+
+# =============================================================================
+# Request parsing (per request, before batching) and batch scoring
+# =============================================================================
+def _number(v, name, lo, hi):
+    if v is None:
+        return np.nan
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        raise ValueError(f"{name}: expected a number {lo}–{hi} or null, got {v!r}")
+    if not lo <= v <= hi:
+        raise ValueError(f"{name}: {v} is outside {lo}–{hi}")
+    return float(v)
+
+def _chart_options(req, default_type):
+    chart = req.get("chart")
+    if not chart:
+        return None
+    chart_type = default_type if chart is True else chart
+    fmt = req.get("chart_format", "png")
+    renderer = req.get("renderer", "template")
+    if default_type is not None and chart_type not in CHART_TYPES:
+        raise ValueError(f"Unknown chart type: {chart_type!r} (expected one of {CHART_TYPES})")
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unknown chart format: {fmt!r} (expected one of {CHART_FORMATS})")
+    if renderer not in CHART_BACKENDS:
+        raise ValueError(f"Unknown chart renderer: {renderer!r} (expected one of {CHART_BACKENDS})")
+    size = int(req.get("size", 560))
+    if not 200 <= size <= 2000:
+        raise ValueError(f"size: {size} is outside 200–2000")
+    return {"type": chart_type, "format": fmt, "renderer": renderer, "size": size}
+
+def parse_a(req):
+    """``(instrument, row, low, med, chart)`` for one Mode A request."""
+    if not isinstance(req, dict) or not isinstance(req.get("answers"), dict):
+        raise ValueError("Expected an object with an 'answers' object.")
+    try:
+        inst = REGISTRY.get(req.get("instrument"))
+    except KeyError:
+        raise ValueError(f"Unknown instrument: {req.get('instrument')!r}") from None
+    col = {v: j for j, v in enumerate(inst.variables)}
+    unknown = sorted(set(req["answers"]) - col.keys())
+    if unknown:
+        raise ValueError(f"Unknown variables: {', '.join(map(str, unknown[:10]))}")
+    row = np.full(len(col), np.nan)
+    for var, v in req["answers"].items():
+        row[col[var]] = _number(v, var, 1, 5)
+    low = _number(req.get("low", 2.5), "low", 1, 5)
+    med = _number(req.get("med", 3.5), "med", 1, 5)
+    if not low <= med:
+        raise ValueError("low must not exceed med.")
+    return inst, row, low, med, _chart_options(req, "Polar Bar")
+
+def score_a(items):
+    """Score parsed Mode A requests, one NumPy pass per instrument."""
+    out = [None] * len(items)
+    by_inst = {}
+    for i, (inst, *_rest) in enumerate(items):
+        by_inst.setdefault(id(inst), []).append(i)
+    for idx in by_inst.values():
+        inst = items[idx[0]][0]
+        rows = np.stack([items[i][1] for i in idx])
+        low = np.array([items[i][2] for i in idx])[:, None]
+        med = np.array([items[i][3] for i in idx])[:, None]
+        means = dimension_means(rows, inst.indicator)
+        codes = classify_array(means, low, med)
+        recs = inst.rec_table[np.arange(len(inst.dimensions)), codes]
+        classes = CLASSES[codes]
+        for k, i in enumerate(idx):
+            out[i] = {"instrument": inst.name, "dimensions": [
+                {"Dimension": d, "MeanScore": None if np.isnan(m) else float(m), "n_Variables": int(n),
+                 "Classification": c, "Recommendation": r}
+                for d, m, n, c, r in zip(inst.dimensions, means[k], inst.n_variables, classes[k], recs[k])]}
+    return out
+
+def parse_b(req, codebook=CODEBOOK):
+    """``(codes, chart)`` for one Mode B request; unmatched answers count as unanswered."""
+    if not isinstance(req, dict) or not isinstance(req.get("answers"), dict):
+        raise ValueError("Expected an object with an 'answers' object.")
+    col = {c: i for i, c in enumerate(codebook.columns)}
+    unknown = sorted(set(req["answers"]) - col.keys())
+    if unknown:
+        raise ValueError(f"Unknown answer columns: {', '.join(map(str, unknown[:10]))}")
+    codes = np.full(len(col), -1, dtype=np.int16)
+    for name, answer in req["answers"].items():
+        if answer is not None:
+            codes[col[name]] = codebook._code(col[name], answer)
+    chart = _chart_options(req, None)
+    if chart and chart["format"] != "png":
+        raise ValueError("Mode B charts are PNG only.")
+    return codes, chart
+
+def score_b(items, codebook=CODEBOOK):
+    _answers, x, y = codebook.score(np.stack([codes for codes, _chart in items]))
+    bands = band_array(x)
+    return [{"dimensions": [
+        {"Dimension": d, X_COL: None if np.isnan(xv) else float(xv), Y_COL: None if np.isnan(yv) else float(yv),
+         "Band": b}
+        for d, xv, yv, b in zip(codebook.dimensions, x[k], y[k], bands[k])]} for k in range(len(items))]
+
+# =============================================================================
+# Chart workers (child processes)
+# =============================================================================
+def _init_chart_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+    from .charts import prewarm
+    prewarm()
+
+def render_chart(task) -> bytes:
+    """PNG bytes for one scored request; runs in a pool worker."""
+    import pandas as pd
+    from .charts import render_chart_png, render_matrix_png
+    mode, chart, dims, a, b, c = task
+    if mode == "A":
+        df = pd.DataFrame({"Dimension": dims, "MeanScore": np.asarray(a, dtype=float), "Classification": c})
+        return render_chart_png(df, chart["type"], chart["size"], cache=None, backend=chart["renderer"])
+    return render_matrix_png(a, b, labels=dims, bands=c, size_px=chart["size"])
+
+def _chart_task(mode, chart, result):
+    dims = [d["Dimension"] for d in result["dimensions"]]
+    if mode == "A":
+        values = [np.nan if d["MeanScore"] is None else d["MeanScore"] for d in result["dimensions"]]
+        return mode, chart, dims, values, None, [d["Classification"] for d in result["dimensions"]]
+    xs = [np.nan if d[X_COL] is None else d[X_COL] for d in result["dimensions"]]
+    ys = [np.nan if d[Y_COL] is None else d[Y_COL] for d in result["dimensions"]]
+    return mode, chart, dims, xs, ys, [d["Band"] for d in result["dimensions"]]
+
+# =============================================================================
+# Service
+# =============================================================================
+class ScoringService:
+    """Routes, batchers, the chart pool and counters for one server."""
+
+    def __init__(self, workers=None, max_batch=256, batch_wait_ms=2.0, cache_bytes=64 * 1024 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.batchers = {"A": MicroBatcher(score_a, max_batch, batch_wait_ms / 1e3),
+                         "B": MicroBatcher(score_b, max_batch, batch_wait_ms / 1e3)}
+        self.cache = PngCache(cache_bytes)
+        self.pool = None
+        self._chart_slots = None
+        self.started = time.time()
+        self.requests = self.errors = self.charts = 0
+
+    def start(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_chart_worker)
+        # bound charts in flight so a burst queues here, not as pickled tasks in the pool
+        self._chart_slots = asyncio.Semaphore(4 * self.workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def _chart(self, mode, chart, result):
+        task = _chart_task(mode, chart, result)
+        if chart["format"] == "svg":
+            from .svg import render_svg
+            return {"format": "svg", "data": render_svg(task[2], task[3], task[5], chart["type"], chart["size"])}
+        key = hashlib.blake2b(repr(task).encode(), digest_size=16).hexdigest()
+        png = self.cache.get(key)
+        if png is None:
+            async with self._chart_slots:
+                png = await asyncio.get_running_loop().run_in_executor(self.pool, render_chart, task)
+            self.cache.put(key, png)
+            self.charts += 1
+        return {"format": "png", "encoding": "base64", "data": base64.b64encode(png).decode("ascii")}
+
+    async def score_one(self, mode, req):
+        parsed = parse_a(req) if mode == "A" else parse_b(req)
+        result = dict(await self.batchers[mode].submit(parsed), mode=mode)
+        chart = parsed[-1]
+        if chart:
+            result["chart"] = await self._chart(mode, chart, result)
+        return result
+
+    async def dispatch(self, method, path, body):
+        """``(status, payload)`` for one request."""
+        route = path.split("?", 1)[0].rstrip("/")
+        if route == "/health":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET."}
+            return HTTPStatus.OK, self.health()
+        mode = {"/score/a": "A", "/score/b": "B"}.get(route.lower())
+        if mode is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"No route {route!r}."}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST."}
+        try:
+            req = json.loads(body or b"null")
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"}
+        try:
+            if isinstance(req, list):
+                return HTTPStatus.OK, list(await asyncio.gather(*(self.score_one(mode, r) for r in req)))
+            return HTTPStatus.OK, await self.score_one(mode, req)
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+    def health(self):
+        b = self.batchers
+        return {"status": "ok", "uptime_s": round(time.time() - self.started, 1), "workers": self.workers,
+                "requests": self.requests, "errors": self.errors, "charts_rendered": self.charts,
+                "batches": {m: {"batches": x.batches, "items": x.items,
+                                "mean_size": round(x.items / x.batches, 2) if x.batches else 0.0}
+                            for m, x in b.items()},
+                "chart_cache": self.cache.stats()}
+
+    # ----- HTTP/1.1 over asyncio streams (keep-alive, Content-Length bodies) -----
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "Headers too large."}, False))
+                    break
+                try:
+                    method, path, version, headers = _parse_head(head)
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    writer.write(_response(HTTPStatus.BAD_REQUEST, {"error": "Malformed request."}, False))
+                    break
+                if length > MAX_BODY:
+                    writer.write(_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                           {"error": f"Body exceeds {MAX_BODY} bytes."}, False))
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self.requests += 1
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except Exception as e:   # keep serving; report instead of dropping the connection
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+                if status >= 400:
+                    self.errors += 1
+                keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep))
+                await writer.drain()
+                if not keep:
+                    break
+        finally:
+            writer.close()
+
+def _parse_head(head: bytes):
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            k, _, v = line.partition(":")
+            headers[k.strip().lower()] = v.strip()
+    return method.upper(), path, version.strip(), headers
+
+def _response(status, payload, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+    status = HTTPStatus(status)
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+async def serve(host="127.0.0.1", port=8765, workers=None, max_batch=256, batch_wait_ms=2.0, ready=None):
+    """Run the service until cancelled. ``ready(server)`` is called once it is listening."""
+    service = ScoringService(workers, max_batch, batch_wait_ms)
+    service.start()
+    try:
+        server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER, backlog=1024)
+        async with server:
+            if ready is not None:
+                ready(server)
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -0,0 +1,254 @@
+"""Persistent assessment store (SQLite) with a small shared connection pool.
+
+Every Mode A / Mode B assessment is appended with its raw variable scores,
+dimension means, classes, thresholds, instrument version and timestamp.
+Writes are buffered and committed in batches (one transaction per batch);
+any read flushes pending writes first, so readers always see them. The same
+transaction folds the batch into the portfolio aggregates (see ``portfolio``).
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .portfolio import AGGREGATE_SCHEMA, rebuild_aggregates, update_aggregates
+
+DEFAULT_DB = os.environ.get("OPENNESS_DB", "openness_assessments.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id             INTEGER PRIMARY KEY,
+    project        TEXT NOT NULL,
+    mode           TEXT NOT NULL,          -- 'A' questionnaire 1–5, 'B' 2-axis matrix 1–3
+    created_at     TEXT NOT NULL,          -- ISO-8601 UTC
+    region         TEXT,
+    respondent     TEXT,
+    instrument     TEXT,
+    instrument_sha TEXT,
+    low_max        REAL,
+    med_max        REAL
+);
+CREATE TABLE IF NOT EXISTS variable_scores (
+    assessment_id  INTEGER NOT NULL REFERENCES assessments(id) ON DELETE CASCADE,
+    variable       TEXT NOT NULL,
+    score          REAL
+);
+CREATE TABLE IF NOT EXISTS dimension_scores (
+    assessment_id  INTEGER NOT NULL REFERENCES assessments(id) ON DELETE CASCADE,
+    dimension      TEXT NOT NULL,
+    mean_score     REAL,
+    classification TEXT,
+    y_score        REAL                    -- Mode B regulation → autonomy axis
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_project_date ON assessments(project, created_at);
+CREATE INDEX IF NOT EXISTS idx_assessments_date ON assessments(created_at);
+CREATE INDEX IF NOT EXISTS idx_variable_scores_assessment ON variable_scores(assessment_id);
+CREATE INDEX IF NOT EXISTS idx_dimension_scores_assessment ON dimension_scores(assessment_id);
+"""
+
+# =============================================================================
+# Connection pool
+# =============================================================================
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared across threads/sessions."""
+
+    def __init__(self, path=DEFAULT_DB, size: int = 4, timeout: float = 10.0):
+        self.path, self.size, self.timeout = str(path), int(size), timeout
+        self._pool = queue.LifoQueue(maxsize=self.size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._created < self.size
+                if grow:
+                    self._created += 1
+            if grow:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    with self._lock:   # give the slot back, or failed connects would exhaust the pool
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+# =============================================================================
+# Store
+# =============================================================================
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+class AssessmentStore:
+    """Append-only assessment history with batched writes.
+
+    ``add`` buffers a record; the buffer is committed once it holds
+    ``batch_size`` records or its oldest record is ``max_delay`` seconds old,
+    on ``flush()``, before any read, and at interpreter exit. A read waits
+    for a flush running in another thread to commit; a failed flush puts its
+    records back in the buffer.
+    """
+
+    def __init__(self, path=DEFAULT_DB, pool_size: int = 4, batch_size: int = 50, max_delay: float = 2.0):
+        self.pool = ConnectionPool(path, pool_size)
+        self.batch_size, self.max_delay = int(batch_size), float(max_delay)
+        self._buffer, self._oldest = [], None
+        self._buf_lock = threading.Lock()
+        self._flush_lock = threading.Lock()    # held from taking the buffer until its commit
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA + AGGREGATE_SCHEMA)
+            with conn:
+                if (conn.execute("SELECT 1 FROM assessments LIMIT 1").fetchone()
+                        and not conn.execute("SELECT 1 FROM portfolio_aggregates LIMIT 1").fetchone()):
+                    rebuild_aggregates(conn)   # DB written before aggregates existed
+        atexit.register(self.close)
+
+    # ----- writes -----
+    def add(self, project, mode, variables, dimensions, *, low_max=None, med_max=None,
+            instrument=None, instrument_sha=None, region=None, respondent=None, created_at=None):
+        """Buffer one assessment.
+
+        ``variables`` maps variable code -> score; ``dimensions`` is a list of
+        dicts with ``Dimension``, ``MeanScore``, ``Classification`` and, for
+        Mode B, ``Y``.
+        """
+        rec = {
+            "project": str(project), "mode": str(mode), "created_at": created_at or _now_iso(),
+            "region": region or None, "respondent": respondent or None,
+            "instrument": instrument, "instrument_sha": instrument_sha,
+            "low_max": low_max, "med_max": med_max,
+            "variables": [(str(k), None if v is None else float(v)) for k, v in dict(variables).items()],
+            "dimensions": [(str(d["Dimension"]), _float(d.get("MeanScore")), d.get("Classification"), _float(d.get("Y")))
+                           for d in dimensions],
+        }
+        with self._buf_lock:
+            self._buffer.append(rec)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = len(self._buffer) >= self.batch_size or time.monotonic() - self._oldest >= self.max_delay
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Commit buffered assessments in one transaction; returns how many."""
+        with self._flush_lock:
+            with self._buf_lock:
+                batch, oldest = self._buffer, self._oldest
+                self._buffer, self._oldest = [], None
+            if not batch:
+                return 0
+            try:
+                self._write(batch)
+            except BaseException:
+                with self._buf_lock:   # keep the records (and their age) for the next flush
+                    self._buffer[:0] = batch
+                    self._oldest = oldest if self._oldest is None else min(oldest, self._oldest)
+                raise
+        return len(batch)
+
+    def _write(self, batch):
+        with self.pool.connection() as conn:
+            with conn:
+                for rec in batch:
+                    cur = conn.execute(
+                        "INSERT INTO assessments (project, mode, created_at, region, respondent, instrument, "
+                        "instrument_sha, low_max, med_max) VALUES (?,?,?,?,?,?,?,?,?)",
+                        (rec["project"], rec["mode"], rec["created_at"], rec["region"], rec["respondent"],
+                         rec["instrument"], rec["instrument_sha"], rec["low_max"], rec["med_max"]))
+                    rec["id"] = aid = cur.lastrowid
+                    conn.executemany("INSERT INTO variable_scores VALUES (?,?,?)",
+                                     [(aid, v, s) for v, s in rec["variables"]])
+                    conn.executemany("INSERT INTO dimension_scores VALUES (?,?,?,?,?)",
+                                     [(aid, *d) for d in rec["dimensions"]])
+                update_aggregates(conn, batch)
+
+    # ----- reads -----
+    def _query(self, sql, params=()):
+        import pandas as pd
+        self.flush()
+        with self.pool.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def aggregate_rows(self, sql, params=()):
+        """Raw rows from a query over the (small) aggregate tables."""
+        self.flush()
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def projects(self):
+        return self._query("SELECT project, COUNT(*) AS n_assessments, MAX(created_at) AS last_at "
+                           "FROM assessments GROUP BY project ORDER BY last_at DESC")
+
+    def history(self, project, mode=None, since=None, until=None, limit=None):
+        """Dimension scores of a project's assessments, newest first (index-backed)."""
+        where, params = ["project = ?"], [str(project)]
+        if mode:  where.append("mode = ?");        params.append(mode)
+        if since: where.append("created_at >= ?"); params.append(str(since))
+        if until: where.append("created_at < ?");  params.append(str(until))
+        ids = f"SELECT id FROM assessments WHERE {' AND '.join(where)} ORDER BY created_at DESC, id DESC"
+        if limit:
+            ids += " LIMIT ?"; params.append(int(limit))
+        return self._query(
+            "SELECT a.id AS assessment_id, a.created_at, a.mode, a.region, a.respondent, a.instrument, "
+            "a.low_max, a.med_max, d.dimension AS Dimension, d.mean_score AS MeanScore, "
+            "d.classification AS Classification, d.y_score AS Y "
+            f"FROM assessments a JOIN dimension_scores d ON d.assessment_id = a.id WHERE a.id IN ({ids}) "
+            "ORDER BY a.created_at DESC, a.id DESC, d.rowid", params)
+
+    def latest(self, mode, region=None):
+        """Dimension scores of every project's most recently saved assessment in ``mode``.
+
+        ``region=None`` means all regions; ``""`` selects assessments without one.
+        """
+        where, params = ["mode = ?"], [mode]
+        if region == "":        where.append("region IS NULL")
+        elif region is not None: where.append("region = ?"); params.append(region)
+        return self._query(
+            "SELECT a.project AS Project, a.region AS Region, a.created_at, a.low_max, a.med_max, "
+            "d.dimension AS Dimension, d.mean_score AS MeanScore, d.classification AS Classification, d.y_score AS Y "
+            "FROM assessments a JOIN dimension_scores d ON d.assessment_id = a.id "
+            f"WHERE a.id IN (SELECT MAX(id) FROM assessments WHERE {' AND '.join(where)} GROUP BY project) "
+            "ORDER BY a.project, d.rowid", params)
+
+    def variables(self, assessment_id):
+        return self._query("SELECT variable AS Variable, score AS Score FROM variable_scores "
+                           "WHERE assessment_id = ? ORDER BY rowid", (int(assessment_id),))
+
+    def close(self):
+        atexit.unregister(self.close)   # a closed store needs no exit flush, and is not kept alive by the hook
+        try:
+            self.flush()
+        finally:
+            self.pool.close()
+
+def _float(x):
+    try:
+        return None if x is None else float(x)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,226 @@
+"""Dependency-free polar bar / radar renderer: SVG text, optionally rasterized with PIL.
+
+Both charts are a handful of shapes (wedges or one polygon, five rings, spokes
+and labels), so they are laid out once as a small scene and either written as
+SVG or drawn with ``PIL.ImageDraw``. Colours, labels and the polar layout
+follow the matplotlib charts in ``charts``; no matplotlib import is needed.
+"""
+import importlib.util
+import io
+import math
+import os
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from .charts import CHART_DPI, CHART_TITLES, COLOR_MAP, GREY_TXT, GRID_GREY, INTERVAL_COLOR, PRIMARY, _multiline
+
+FONT_FAMILY = "DejaVu Sans, Verdana, Arial, sans-serif"
+R_MAX = 5.0
+RLABEL_DEG = 22.5       # matplotlib's default radial tick label angle
+
+def _pt(points: float) -> float:
+    """Font size in px at the charts' DPI."""
+    return points * CHART_DPI / 72.0
+
+# =============================================================================
+# Scene: shapes in pixel coordinates (y down)
+# =============================================================================
+def chart_scene(labels, values, classes, chart_type="Polar Bar", size_px=560, intervals=(None, None)):
+    """``(width, height, shapes)`` for one chart; ``intervals`` is an optional ``(lo, hi)`` pair of arrays.
+
+    Shapes are tuples: ``("circle", cx, cy, r, fill, fill_opacity, stroke, stroke_width, dashed)``,
+    ``("wedge", cx, cy, r, a0, a1, fill, opacity)``, ``("polygon", points, fill, fill_opacity,
+    stroke, stroke_width)``, ``("line", x0, y0, x1, y1, stroke, opacity, width)`` and
+    ``("text", x, y, lines, size, bold, color)`` (centred); polygons may have no stroke.
+    Angles are radians, counter-clockwise from 3 o'clock as on screen.
+    """
+    if chart_type not in CHART_TITLES:
+        raise ValueError(f"Unknown chart type: {chart_type!r} (expected one of {tuple(CHART_TITLES)})")
+    w = h = int(size_px)
+    title_px = _pt(12)
+    cx, cy = w / 2, h / 2 + title_px * 0.6
+    R = min(w / 2, h / 2 - title_px * 0.6) * 0.86
+    n = len(labels)
+    radar = chart_type == "Radar"
+    r_min = 1.0 if radar else 0.0
+
+    def theta(i):   # radar: clockwise from 12 o'clock; polar bar: counter-clockwise from 3 o'clock
+        a = 2 * math.pi * i / n
+        return math.pi / 2 - a if radar else a
+
+    def xy(a, r):
+        rr = (r - r_min) / (R_MAX - r_min) * R
+        return cx + rr * math.cos(a), cy - rr * math.sin(a)
+
+    shapes = []
+    if not radar:
+        shapes.append(("circle", cx, cy, 3.0 / R_MAX * R, GREY_TXT, 0.06, None, 0, False))
+    for ring in range(int(r_min) + 1, int(R_MAX)):
+        shapes.append(("circle", cx, cy, (ring - r_min) / (R_MAX - r_min) * R, None, 0, GRID_GREY, 0.9, True))
+    for i in range(n):
+        x1, y1 = xy(theta(i), R_MAX)
+        shapes.append(("line", cx, cy, x1, y1, GRID_GREY, 0.35 if not radar else 0.6, 0.9))
+
+    vals = [min(max(float(v), r_min), R_MAX) if v == v else r_min for v in values]   # NaN -> empty
+    lo, hi = intervals if intervals is not None else (None, None)
+    has_ci = lo is not None and hi is not None
+    if radar:
+        if has_ci:   # band between neighbouring spokes, under the line
+            for i in range(n):
+                j = (i + 1) % n
+                if lo[i] == lo[i] and hi[i] == hi[i] and lo[j] == lo[j] and hi[j] == hi[j]:
+                    quad = [xy(theta(i), lo[i]), xy(theta(j), lo[j]), xy(theta(j), hi[j]), xy(theta(i), hi[i])]
+                    shapes.append(("polygon", quad, PRIMARY, 0.18, None, 0))
+        pts = [xy(theta(i), v) for i, v in enumerate(vals)]
+        shapes.append(("polygon", pts, PRIMARY, 0.12, PRIMARY, 2.0 * CHART_DPI / 72))
+    else:
+        half = math.pi / n * 0.80
+        for i, (v, c) in enumerate(zip(vals, classes)):
+            shapes.append(("wedge", cx, cy, v / R_MAX * R, theta(i) - half, theta(i) + half,
+                           COLOR_MAP.get(c, "#6B7280"), 0.88))
+        if has_ci:
+            for i in range(n):
+                if lo[i] == lo[i] and hi[i] == hi[i]:
+                    shapes.append(("line", *xy(theta(i), lo[i]), *xy(theta(i), hi[i]), INTERVAL_COLOR, 0.75,
+                                   2.0 * CHART_DPI / 72))
+
+    shapes.append(("circle", cx, cy, R, None, 0, "#000000", 1.0, False))   # outer spine
+    a_lab = math.radians(90 - RLABEL_DEG) if radar else math.radians(RLABEL_DEG)
+    for ring in range(int(r_min) + 1, int(R_MAX) + 1):
+        x, y = xy(a_lab, ring)
+        shapes.append(("text", x, y, [str(ring)], _pt(9), False, GREY_TXT))
+    for i, lab in enumerate(labels):
+        x, y = xy(theta(i), 4.70)
+        shapes.append(("text", x, y, _multiline(str(lab)).split("\n"), _pt(9), True, PRIMARY))
+    shapes.append(("text", w / 2, title_px * 0.9, [CHART_TITLES[chart_type]], _pt(12), True, PRIMARY))
+    return w, h, shapes
+
+# =============================================================================
+# SVG backend
+# =============================================================================
+def _f(v):
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+def scene_to_svg(width, height, shapes) -> str:
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+           f'viewBox="0 0 {width} {height}" font-family="{FONT_FAMILY}">',
+           f'<rect width="{width}" height="{height}" fill="white"/>']
+    for s in shapes:
+        kind = s[0]
+        if kind == "circle":
+            _, cx, cy, r, fill, fop, stroke, sw, dashed = s
+            attrs = f'fill="{fill}" fill-opacity="{fop}"' if fill else 'fill="none"'
+            if stroke:
+                attrs += f' stroke="{stroke}" stroke-width="{_f(sw)}"' + (' stroke-dasharray="4 3"' if dashed else "")
+            out.append(f'<circle cx="{_f(cx)}" cy="{_f(cy)}" r="{_f(r)}" {attrs}/>')
+        elif kind == "line":
+            _, x0, y0, x1, y1, stroke, op, sw = s
+            out.append(f'<line x1="{_f(x0)}" y1="{_f(y0)}" x2="{_f(x1)}" y2="{_f(y1)}" '
+                       f'stroke="{stroke}" stroke-opacity="{op}" stroke-width="{_f(sw)}"/>')
+        elif kind == "wedge":
+            _, cx, cy, r, a0, a1, fill, op = s
+            if r <= 0:
+                continue
+            p0 = (cx + r * math.cos(a0), cy - r * math.sin(a0))
+            p1 = (cx + r * math.cos(a1), cy - r * math.sin(a1))
+            large = 1 if a1 - a0 > math.pi else 0
+            out.append(f'<path d="M{_f(cx)},{_f(cy)} L{_f(p0[0])},{_f(p0[1])} '
+                       f'A{_f(r)},{_f(r)} 0 {large} 0 {_f(p1[0])},{_f(p1[1])} Z" '
+                       f'fill="{fill}" fill-opacity="{op}" stroke="white" stroke-width="1"/>')
+        elif kind == "polygon":
+            _, pts, fill, fop, stroke, sw = s
+            d = " ".join(f"{_f(x)},{_f(y)}" for x, y in pts)
+            line = f' stroke="{stroke}" stroke-width="{_f(sw)}" stroke-linejoin="round"' if stroke else ""
+            out.append(f'<polygon points="{d}" fill="{fill}" fill-opacity="{fop}"{line}/>')
+        elif kind == "text":
+            _, x, y, lines, size, bold, color = s
+            weight = ' font-weight="bold"' if bold else ""
+            y0 = y - (len(lines) - 1) * size * 1.2 / 2
+            spans = "".join(f'<tspan x="{_f(x)}" y="{_f(y0 + k * size * 1.2)}">{escape(t)}</tspan>'
+                            for k, t in enumerate(lines))
+            out.append(f'<text text-anchor="middle" dominant-baseline="central" font-size="{_f(size)}"'
+                       f'{weight} fill="{color}">{spans}</text>')
+    out.append("</svg>")
+    return "\n".join(out)
+
+def render_svg(labels, values, classes, chart_type="Polar Bar", size_px=560, intervals=(None, None)) -> str:
+    """SVG document for one chart."""
+    return scene_to_svg(*chart_scene(labels, values, classes, chart_type, size_px, intervals))
+
+# =============================================================================
+# Raster backend (PIL, supersampled for anti-aliasing)
+# =============================================================================
+@lru_cache(maxsize=None)
+def _font_file(bold: bool):
+    """DejaVu Sans shipped with matplotlib, located without importing matplotlib."""
+    spec = importlib.util.find_spec("matplotlib")
+    if spec and spec.origin:
+        path = os.path.join(os.path.dirname(spec.origin), "mpl-data", "fonts", "ttf",
+                            "DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf")
+        if os.path.exists(path):
+            return path
+    return None
+
+@lru_cache(maxsize=64)
+def _font(size: int, bold: bool):
+    from PIL import ImageFont
+    path = _font_file(bold)
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+def _rgba(color, opacity=1.0):
+    from PIL import ImageColor
+    r, g, b = ImageColor.getrgb(color)[:3]
+    return (r, g, b, int(round(255 * opacity)))
+
+def scene_to_png(width, height, shapes, supersample: int = 2) -> bytes:
+    from PIL import Image, ImageDraw
+    k = int(supersample)
+    img = Image.new("RGB", (width * k, height * k), "white")
+    draw = ImageDraw.Draw(img, "RGBA")
+    for s in shapes:
+        kind = s[0]
+        if kind == "circle":
+            _, cx, cy, r, fill, fop, stroke, sw, dashed = s
+            box = [(cx - r) * k, (cy - r) * k, (cx + r) * k, (cy + r) * k]
+            if fill:
+                draw.ellipse(box, fill=_rgba(fill, fop))
+            if stroke and not dashed:
+                draw.ellipse(box, outline=_rgba(stroke), width=max(1, round(sw * k)))
+            elif stroke:   # ~4px dash, 3px gap, drawn as short chords
+                n_dash = max(8, int(2 * math.pi * r / 7))
+                for j in range(n_dash):
+                    a0, a1 = 2 * math.pi * j / n_dash, 2 * math.pi * (j + 4 / 7) / n_dash
+                    draw.line([(cx + r * math.cos(a0)) * k, (cy + r * math.sin(a0)) * k,
+                               (cx + r * math.cos(a1)) * k, (cy + r * math.sin(a1)) * k],
+                              fill=_rgba(stroke), width=max(1, round(sw * k)))
+        elif kind == "line":
+            _, x0, y0, x1, y1, stroke, op, sw = s
+            draw.line([x0 * k, y0 * k, x1 * k, y1 * k], fill=_rgba(stroke, op), width=max(1, round(sw * k)))
+        elif kind == "wedge":
+            _, cx, cy, r, a0, a1, fill, op = s
+            if r <= 0:
+                continue
+            box = [(cx - r) * k, (cy - r) * k, (cx + r) * k, (cy + r) * k]
+            # PIL angles run clockwise on screen
+            draw.pieslice(box, -math.degrees(a1), -math.degrees(a0), fill=_rgba(fill, op),
+                          outline=(255, 255, 255, 255), width=k)
+        elif kind == "polygon":
+            _, pts, fill, fop, stroke, sw = s
+            scaled = [(x * k, y * k) for x, y in pts]
+            draw.polygon(scaled, fill=_rgba(fill, fop))
+            if stroke:
+                draw.line(scaled + scaled[:1], fill=_rgba(stroke), width=max(1, round(sw * k)), joint="curve")
+        elif kind == "text":
+            _, x, y, lines, size, bold, color = s
+            draw.multiline_text((x * k, y * k), "\n".join(lines), font=_font(round(size * k), bold),
+                                fill=_rgba(color), anchor="mm", align="center", spacing=size * k * 0.2)
+    if k > 1:
+        img = img.reduce(k)     # box filter: the supersampling average
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=3)
+    return buf.getvalue()
+
+def render_png(labels, values, classes, chart_type="Polar Bar", size_px=560, supersample: int = 2,
+               intervals=(None, None)) -> bytes:
+    """PNG bytes for one chart, drawn with PIL (no matplotlib)."""
+    return scene_to_png(*chart_scene(labels, values, classes, chart_type, size_px, intervals), supersample=supersample)
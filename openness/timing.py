@@ -0,0 +1,100 @@
+"""Per-rerun stage timings (opt-in debug instrumentation).
+
+A ``RerunTimer`` collects ``(stage, seconds)`` spans for one script run and
+keeps the last ``history`` runs for a rolling breakdown. Library code calls
+the module-level ``span(stage)``, which records into the timer activated for
+the current thread/context and costs a no-op context manager otherwise.
+
+Enabled in the app by ``OPENNESS_DEBUG_TIMINGS=1``; set
+``OPENNESS_TIMINGS_FILE`` to also append every finished run as JSON lines.
+"""
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+ENABLED = os.environ.get("OPENNESS_DEBUG_TIMINGS", "").strip().lower() in ("1", "true", "yes", "on")
+TIMINGS_FILE = os.environ.get("OPENNESS_TIMINGS_FILE") or None
+
+_ACTIVE = ContextVar("openness_timer", default=None)
+_NULL = nullcontext()
+UNATTRIBUTED = "(unattributed)"
+
+def span(stage: str):
+    """Time a block into the active timer, if any."""
+    timer = _ACTIVE.get()
+    return timer.span(stage) if timer is not None else _NULL
+
+class RerunTimer:
+    """Spans of the current run plus a rolling window of finished runs."""
+
+    def __init__(self, history: int = 50, log_path=TIMINGS_FILE):
+        self.runs = deque(maxlen=int(history))
+        self.log_path = log_path
+        self.current, self._t0, self._n = None, None, 0
+
+    def start(self, label: str = ""):
+        self._n += 1
+        self.current = {"run": self._n, "label": label,
+                        "started_at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), "spans": []}
+        self._t0 = time.perf_counter()
+        _ACTIVE.set(self)
+        return self
+
+    @contextmanager
+    def span(self, stage: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                self.current["spans"].append((stage, t - self._t0, time.perf_counter() - t))
+
+    def finish(self):
+        """Close the run (also on early returns) and deactivate the timer."""
+        if self.current is None:
+            return None
+        run, self.current = self.current, None
+        run["total_s"] = time.perf_counter() - self._t0
+        _ACTIVE.set(None)
+        self.runs.append(run)
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as fh:
+                fh.write(_run_lines(run))
+        return run
+
+    def breakdown(self):
+        """Per-stage rolling stats in ms over the kept runs, slowest first."""
+        import pandas as pd
+        per_stage, total = {}, 0.0
+        for run in self.runs:
+            total += run["total_s"]
+            for stage, _offset, dt in run["spans"]:
+                per_stage.setdefault(stage, []).append(dt)
+            # widgets, layout and anything else outside a span
+            per_stage.setdefault(UNATTRIBUTED, []).append(run["total_s"] - sum(dt for _s, _o, dt in run["spans"]))
+        last = {}
+        if self.runs:
+            for stage, _offset, dt in self.runs[-1]["spans"]:
+                last[stage] = last.get(stage, 0.0) + dt
+            last[UNATTRIBUTED] = self.runs[-1]["total_s"] - sum(last.values())
+        rows = [{"Stage": stage, "calls": len(v), "last_ms": round(last.get(stage, 0.0) * 1e3, 2),
+                 "mean_ms": round(sum(v) / len(v) * 1e3, 2), "max_ms": round(max(v) * 1e3, 2),
+                 "share_%": round(100.0 * sum(v) / total, 1) if total else 0.0}
+                for stage, v in per_stage.items()]
+        df = pd.DataFrame(rows, columns=["Stage", "calls", "last_ms", "mean_ms", "max_ms", "share_%"])
+        return df.sort_values("share_%", ascending=False, ignore_index=True)
+
+    def to_jsonl(self) -> str:
+        """All kept spans, one JSON object per line."""
+        return "".join(_run_lines(run) for run in self.runs)
+
+def _run_lines(run):
+    base = {"run": run["run"], "label": run["label"], "started_at": run["started_at"]}
+    lines = [json.dumps({**base, "stage": stage, "offset_ms": round(off * 1e3, 3), "ms": round(dt * 1e3, 3)})
+             for stage, off, dt in run["spans"]]
+    lines.append(json.dumps({**base, "stage": "total", "offset_ms": 0.0, "ms": round(run["total_s"] * 1e3, 3)}))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from openness.columnar import archive_responses, open_archive
+from openness.projects import score_projects_file
+from openness.registry import EMBEDDED
+
+
+def _responses(path, projects, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(1, 6, (len(projects), len(EMBEDDED.variables)))
+    frame = pd.DataFrame(scores, columns=EMBEDDED.variables)
+    frame.insert(0, "Project", projects)
+    frame.to_csv(path, index=False)
+
+
+def test_archive_ids_match_csv_across_chunk_dtypes(tmp_path):
+    # the first chunk reads Project as int, the second as str: both must land on the same label
+    csv = tmp_path / "r.csv"
+    _responses(csv, [1] * 7 + [1] * 3 + ["p2"] * 4)
+    opn = tmp_path / "r.opn"
+    archive_responses(csv, opn, id_column="Project", chunk_size=7)
+
+    ids = open_archive(opn).ids()
+    assert list(ids) == ["1"] * 10 + ["p2"] * 4
+
+    # whole file in one chunk, and chunks smaller than project 1 on both the CSV and the archive path
+    expected = pd.read_csv(score_projects_file(csv, tmp_path / "whole.csv", seed=0)[0])
+    assert expected.groupby("Project")["n_Respondents"].max().to_dict() == {"1": 10, "p2": 4}
+    for chunk_size in (3, 7):
+        from_csv = pd.read_csv(score_projects_file(csv, tmp_path / "csv.csv", seed=0, chunk_size=chunk_size)[0])
+        from_opn = pd.read_csv(score_projects_file(opn, tmp_path / "opn.csv", seed=0, chunk_size=chunk_size)[0])
+        pd.testing.assert_frame_equal(from_csv, expected)
+        pd.testing.assert_frame_equal(from_opn, expected)
+
+
+def test_archive_keeps_integer_ids(tmp_path):
+    csv = tmp_path / "r.csv"
+    _responses(csv, [10, 11, 12, 13, 14])
+    opn = tmp_path / "r.opn"
+    archive_responses(csv, opn, id_column="Project", chunk_size=2)
+    assert open_archive(opn).ids().tolist() == [10, 11, 12, 13, 14]
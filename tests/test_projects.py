@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from openness.projects import pack_projects, score_projects_file
+from openness.registry import EMBEDDED
+
+
+def _responses(path, projects, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.integers(1, 6, (len(projects), len(EMBEDDED.variables))), columns=EMBEDDED.variables)
+    frame.insert(0, "Project", projects)
+    frame.to_csv(path, index=False)
+
+
+def test_empty_project_cell_names_column_and_row(tmp_path):
+    csv = tmp_path / "r.csv"
+    _responses(csv, ["a", "a", None, "b"])
+    with pytest.raises(ValueError, match=r"'Project' is empty in data row 3"):
+        score_projects_file(csv, tmp_path / "out.csv", seed=0, chunk_size=2)
+
+
+def test_pack_projects_rejects_missing_ids():
+    with pytest.raises(ValueError, match="no project"):
+        pack_projects(np.ones((3, 2)), ["a", None, "a"])
+
+
+def test_csv_chunks_do_not_split_a_project(tmp_path):
+    # chunk 1 reads Project as int, chunk 2 as str
+    csv = tmp_path / "r.csv"
+    _responses(csv, [1] * 10 + ["p2"] * 4)
+    whole = pd.read_csv(score_projects_file(csv, tmp_path / "whole.csv", seed=0)[0])
+    chunked = pd.read_csv(score_projects_file(csv, tmp_path / "chunked.csv", seed=0, chunk_size=7)[0])
+    assert chunked.groupby("Project")["n_Respondents"].max().to_dict() == {"1": 10, "p2": 4}
+    pd.testing.assert_frame_equal(chunked, whole)